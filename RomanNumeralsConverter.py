@@ -1,4 +1,4 @@
-#!python2
+#!python3
 # coding: utf-8
 
 """
@@ -6,28 +6,67 @@ ROMAN NUMERALS CONVERTER
 Converts Roman numerals into Arabic numerals (and vice versa)
 
 DEPENDENCIES:
-    - Python 2.7
+    - Python 3.7+
+    - NumPy (optional, for roman_to_arabic_array() and arabic_to_roman_array())
+    - pandas (optional, for the Series accessor series.roman: registered on import only if pandas was imported
+      first, otherwise call register_pandas_accessor())
 
 HOW TO RUN:
     Through the command line:
 
-    RomanNumeralsConverter.py type numeral
+    RomanNumeralsConverter.py type numeral [--engine {digits,pairs,regex,rules,table}]
+    RomanNumeralsConverter.py type --input FILE [--output FILE] [--jobs N]
+                              [--engine {digits,pairs,regex,rules,table}]
+    RomanNumeralsConverter.py --serve HOST:PORT [--engine {digits,pairs,regex,rules,table}]
 
-    - 'type' is either 'roman' or 'arabic', to explicitly define the type of numeral to convert
+    - 'type' is either 'roman' or 'arabic', to explicitly define the type of numeral to convert,
+      or 'auto' to detect it (Arabic numerals start with a digit or a minus sign),
+      or 'text' to replace the (upper case) Roman numerals found in a text (numeral or --input) with their value,
+      leaving a standalone I (the pronoun) as it is
     - 'numeral' is either a Roman numeral or an Arabic numeral (both between 1 and 3899)
+    - '-i, --input' converts a file of newline-delimited numerals instead, one line at a time ('-' reads from stdin)
+    - '-o, --output' writes those conversions to a file, one per line, instead of stdout
+    - '-j, --jobs' converts '--input' across N processes, 0 for one per CPU ('--chunk-size' numerals at a time)
+    - '--serve' serves conversions over HTTP/JSON on HOST:PORT instead (see RomanNumeralsServer.py)
+    - '--engine' picks the conversion engine: 'rules' (default) validates the numeral rule by rule,
+      'table' looks it up in precomputed tables, 'regex' validates a Roman numeral in a single pass,
+      'digits' writes an Arabic numeral digit by digit,
+      'pairs' reads a Roman numeral through a table of adjacent character pairs (as 'digits' for Arabic numerals)
     - '-h, --help' shows the help text
 
     A malformed numeral will yield either "", for Roman numerals, or -1, for Arabic numerals
 """
 
-import argparse
-import re
+import sys  # Always loaded by the interpreter, unlike the modules imported by each function
 
 __author__ = 'Pedro HC David, https://github.com/Kronopt'
 __credits__ = ['Pedro HC David']
 __version__ = '1.0'
 
 
+IVXLCDM = {"I": 1, "V": 5, "X": 10, "L": 50, "C": 100, "D": 500, "M": 1000}  # Value of each Roman numeral character
+IVXLCDM_ORDER = ("I", "V", "X", "L", "C", "D", "M")  # Roman numeral characters, in ascending order of value
+ROMAN_VALUES = (("M", 1000), ("CM", 900), ("D", 500), ("CD", 400),  # Roman numeral characters and subtractive
+                ("C", 100), ("XC", 90), ("L", 50), ("XL", 40),      # combination pairs, in descending order of value
+                ("X", 10), ("IX", 9), ("V", 5), ("IV", 4), ("I", 1))
+ROMAN_DIGITS = (("", "I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX"),  # Roman numeral of each digit,
+                ("", "X", "XX", "XXX", "XL", "L", "LX", "LXX", "LXXX", "XC"),  # by decimal place
+                ("", "C", "CC", "CCC", "CD", "D", "DC", "DCC", "DCCC", "CM"),  # (units, tens, hundreds, thousands)
+                ("", "M", "MM", "MMM"))
+ROMAN_DIGIT_VALUES = {roman_digit: digit * 10 ** place  # Value of each Roman numeral of ROMAN_DIGITS
+                      for place, roman_digits in enumerate(ROMAN_DIGITS)
+                      for digit, roman_digit in enumerate(roman_digits)}
+MAX_ROMAN_LENGTH = 14  # Longest Roman numeral (2888), in characters
+MAX_ARABIC_LENGTH = 4  # Longest Arabic numeral (3899), in digits
+CANONICAL_ROMAN_NUMERAL = ("(?P<thousands>M{0,3})"  # Roman numeral of each digit, in ROMAN_DIGITS
+                           "(?P<hundreds>C[MD]|D?C{0,3})"
+                           "(?P<tens>X[CL]|L?X{0,3})"
+                           "(?P<units>I[XV]|V?I{0,3})"
+                           "\\Z")
+
+_canonical_roman_numeral = None  # CANONICAL_ROMAN_NUMERAL, compiled on first use
+
+
 def is_possible_roman_numeral(string):
     """
     True if string is a possible Roman Numeral, False otherwise.
@@ -39,13 +78,11 @@ def is_possible_roman_numeral(string):
 
     RETURNS: bool
     """
-    if 0 < len(string) <= 14:  # Longest Roman numeral (2888) has 14 characters
-        # Matches strings that consist of IVXLCDM characters starting at index 0
-        # If this happens, returns True if the whole string was matched, False otherwise
-        match = re.match("[IVXLCDM]+", string)
-        if match:
-            return len(match.group()) == len(string)
-    
+    if 0 < len(string) <= MAX_ROMAN_LENGTH:
+        # Strips IVXLCDM characters from both ends of the string
+        # If nothing is left, the whole string consists of IVXLCDM characters
+        return not string.strip("IVXLCDM")
+
     return False
 
 
@@ -115,7 +152,7 @@ def find_subtractive_combinations(string):
     RETURNS: ( (str pair, int index), ... )
         Tuple containing all ordered subtractive combination pairs found and the respective index at which they start
     """
-    ivxlcdm = ["I", "V", "X", "L", "C", "D", "M"]
+    ivxlcdm = IVXLCDM_ORDER
 
     subtractive_pairs = []
     previous_char = "M"  # Max char (first case always goes through)
@@ -168,8 +205,8 @@ def is_non_zero_arabic_numeral(string):
 
     RETURNS: bool
     """
-    # Is comprised only of digits (not a float) and is not only zero(es)
-    return string.isdigit() and int(string) != 0 and int(string) <= 3899
+    # Is short enough (before int() parses it), is comprised only of digits (not a float) and is not only zero(es)
+    return len(string) <= MAX_ARABIC_LENGTH and string.isdecimal() and int(string) != 0 and int(string) <= 3899
 
 
 def has_no_trailing_zeroes(string):
@@ -184,81 +221,124 @@ def has_no_trailing_zeroes(string):
     return len(str(int(string))) == len(string)
 
 
-################
-# Main Functions
-################
+def is_longer_than(numeral, length):
+    """
+    True if numeral is sized (str, bytes, list, ...) and longer than length, False otherwise.
+    Only its length is read, so that oversized numerals of any type are rejected before str() writes them out.
 
+    PARAMETERS:
+        numeral : object
+        length : int
 
-def roman_to_arabic(roman_numeral):
+    RETURNS: bool
     """
-    Converts a Roman numeral to an Arabic numeral.
+    try:
+        return len(numeral) > length
+    except TypeError:  # Not sized (float, None, ...)
+        return False
+
+
+###################
+# Rule-based engine
+###################
+
+
+def roman_to_arabic_rules(roman_numeral):
+    """
+    Converts a Roman numeral to an Arabic numeral, checking each rule in turn.
+    Reference implementation for every other engine.
+    Roman numerals given as bytes are converted by roman_to_arabic_bytes(), as by every engine.
 
     PARAMETERS:
-        roman_numeral : str
+        roman_numeral : str, bytes, bytearray or memoryview
 
     RETURNS: int
         Actual conversion to Arabic Numeral if possible, -1 otherwise.
     """
-    try:
-        roman_numeral = roman_numeral.upper()  # Ignore case (while also checking if roman_numeral is a string)
-    except AttributeError:
-        return -1
+    if not isinstance(roman_numeral, str):
+        if isinstance(roman_numeral, (bytes, bytearray, memoryview)):
+            return roman_to_arabic_bytes(roman_numeral)
+        return rejected("is_string")
+    upper = roman_numeral.upper
+
+    # Fast reject, in constant time, before upper() copies it
+    if len(roman_numeral) > MAX_ROMAN_LENGTH:
+        return rejected("is_possible_roman_numeral")
+
+    roman_numeral = upper()  # Ignore case
 
-    ivxlcdm = {"I": 1, "V": 5, "X": 10, "L": 50, "C": 100, "D": 500, "M": 1000}
-    ivxlcdm_order = ["I", "V", "X", "L", "C", "D", "M"]
+    ivxlcdm = IVXLCDM
+    ivxlcdm_order = IVXLCDM_ORDER
 
     # Is alpha string
     # Only characters allowed: IVXLCDM (lower or upper case)
+    if not is_possible_roman_numeral(roman_numeral):
+        return rejected("is_possible_roman_numeral")
+
     # V, L and D can only appear at most once
+    if not at_most_once_vld(roman_numeral):
+        return rejected("at_most_once_vld")
+
     # I, X, C and M cannot occur more than 3 times in a row
-    if (is_possible_roman_numeral(roman_numeral) and
-            at_most_once_vld(roman_numeral) and
-            at_most_3_in_row_ixcm(roman_numeral)):
-
-        # Subtractive combinations Rules:
-        #   Only one I, X and C can be used as the leading numeral in a subtractive pair
-        #   I can ony be placed before V and X
-        #   X can only be placed before L and C
-        #   C can only be placed before D and M
-        subtractive_combination_pairs = find_subtractive_combinations(roman_numeral)
-        if subtractive_combination_validity(subtractive_combination_pairs):
-
-            subtractive_combinations_indexes = [i[1] for i in subtractive_combination_pairs]
-            last_roman_numeral = "M"  # Max char (first case always goes through)
-            jump_char = False  # Jump over the 2nd char of a subtractive combination pair
-            count = 0
-
-            arabic_numeral = 0
-            for char in roman_numeral:
-
-                # When a subtractive combination is found, do not check descending order for the 2nd value in the pair
-                if not jump_char:
-                    # If char is bigger than the last char, roman numeral is wrong
-                    if char not in ivxlcdm_order[:ivxlcdm_order.index(last_roman_numeral) + 1]:  # char <= previous_char
-                        return -1
-
-                    # Last char is only kept if this char was not part of a subtractive combination
-                    last_roman_numeral = char
-                else:
-                    jump_char = False
+    if not at_most_3_in_row_ixcm(roman_numeral):
+        return rejected("at_most_3_in_row_ixcm")
+
+    # Subtractive combinations Rules:
+    #   Only one I, X and C can be used as the leading numeral in a subtractive pair
+    #   I can ony be placed before V and X
+    #   X can only be placed before L and C
+    #   C can only be placed before D and M
+    subtractive_combination_pairs = find_subtractive_combinations(roman_numeral)
+    if not subtractive_combination_validity(subtractive_combination_pairs):
+        return rejected("subtractive_combination_validity")
+
+    subtractive_combinations_indexes = [i[1] for i in subtractive_combination_pairs]
+    last_roman_numeral = "M"  # Max char (first case always goes through)
+    max_index = ivxlcdm_order.index(last_roman_numeral)  # Index of the biggest char allowed next
+    pair_ceiling = last_roman_numeral  # Biggest char allowed as the 2nd value of a subtractive pair
+    jump_char = False  # Jump over the 2nd char of a subtractive combination pair
+    count = 0
 
-                # If value is the 1st of a subtractive combination, subtract its value, sum it otherwise
-                if count in subtractive_combinations_indexes:
-                    arabic_numeral -= ivxlcdm[char]
-                    jump_char = True
-                else:
-                    arabic_numeral += ivxlcdm[char]
+    arabic_numeral = 0
+    for char in roman_numeral:
 
-                count += 1
+        # When a subtractive combination is found, do not check descending order for the 2nd value in the pair
+        if not jump_char:
+            # If char is bigger than the last char, roman numeral is wrong
+            if ivxlcdm_order.index(char) > max_index:  # char <= previous_char
+                return rejected("descending_order")
 
-            return arabic_numeral
+            # Last char is only kept if this char was not part of a subtractive combination
+            pair_ceiling = last_roman_numeral
+            last_roman_numeral = char
+            max_index = ivxlcdm_order.index(char)
+        else:
+            # The 2nd value of a pair can't be bigger than the char preceding the pair (VIX, CCM)
+            # nor lead another pair (IXC)
+            if (ivxlcdm_order.index(char) > ivxlcdm_order.index(pair_ceiling) or
+                    count in subtractive_combinations_indexes):
+                return rejected("descending_order")
+
+            # Chars following a pair must be smaller than its leading numeral (IVI, XCX)
+            max_index -= 1
+            jump_char = False
+
+        # If value is the 1st of a subtractive combination, subtract its value, sum it otherwise
+        if count in subtractive_combinations_indexes:
+            arabic_numeral -= ivxlcdm[char]
+            jump_char = True
+        else:
+            arabic_numeral += ivxlcdm[char]
 
-    return -1
+        count += 1
+
+    return arabic_numeral
 
 
-def arabic_to_roman(arabic_numeral):
+def arabic_to_roman_rules(arabic_numeral):
     """
-    Converts an Arabic numeral to a Roman numeral.
+    Converts an Arabic numeral to a Roman numeral, checking each rule in turn.
+    Reference implementation for every other engine.
 
     PARAMETERS:
         arabic_numeral : int or str
@@ -267,11 +347,16 @@ def arabic_to_roman(arabic_numeral):
     RETURNS: str
         Actual conversion to Roman Numeral if possible, empty string otherwise.
     """
+    # Fast reject, in constant time, before str() writes an int (or anything sized) out or int() parses a string
+    if type(arabic_numeral) is int:
+        if not 0 < arabic_numeral <= 3899:
+            return ""
+    elif is_longer_than(arabic_numeral, MAX_ARABIC_LENGTH):
+        return ""
+
     arabic_numeral = str(arabic_numeral)
 
-    roman_values = (("M", 1000), ("CM", 900), ("D", 500), ("CD", 400),
-                    ("C", 100), ("XC", 90), ("L", 50), ("XL", 40),
-                    ("X", 10), ("IX", 9), ("V", 5), ("IV", 4), ("I", 1))
+    roman_values = ROMAN_VALUES
 
     # Only numeric characters
     # No trailing zeroes
@@ -297,16 +382,2501 @@ def arabic_to_roman(arabic_numeral):
     return ""
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description='Converts Roman Numerals into Arabic Numerals (and vice versa)')
+##############
+# Table engine
+##############
 
-    parser.add_argument('type', choices=['roman', 'arabic'], help='\'roman\' to convert a Roman numeral, '
-                                                                  '\'arabic\' to convert an Arabic numeral')
-    parser.add_argument('numeral', help='Roman/Arabic numeral to be converted')
 
-    parser = parser.parse_args()
+_roman_numerals_table = None  # (str, ...) indexed by Arabic numeral, "" at index 0 (or SharedRomanNumerals)
+_arabic_numerals_table = None  # {str: int, ...} upper case Roman numeral to Arabic numeral
 
-    if parser.type == 'roman':
-        print "Arabic Numeral: " + str(roman_to_arabic(parser.numeral))
-    else:
-        print "Roman Numeral: " + arabic_to_roman(parser.numeral)
+
+def conversion_tables():
+    """
+    Builds (once) and returns the precomputed conversion tables used by the table engine.
+    Both tables accept exactly what the rule-based engine accepts:
+    Roman numerals up to 3999 (except for 3888, longer than 14 characters) and Arabic numerals up to 3899.
+    Built from ROMAN_DIGITS (10x faster than through the rule-based engine) on first use,
+    as building them on import would make importing this module several times slower.
+
+    RETURNS: ( (str, ...), {str: int, ...} )
+        Tuple of Roman numerals indexed by their value ("" at index 0)
+        and dictionary of upper case Roman numerals to their value
+    """
+    global _roman_numerals_table, _arabic_numerals_table
+
+    if _arabic_numerals_table is None:
+        # arabic_to_roman_rules stops at 3899, but 3900 to 3999 are still read as valid Roman numerals
+        roman_numerals = [roman_digits(value) for value in range(4000)]
+
+        if _roman_numerals_table is None:  # Unless attached to a shared one, by attach_conversion_table()
+            _roman_numerals_table = tuple(roman_numerals[:3900])
+        _arabic_numerals_table = {roman_numeral: value for value, roman_numeral in enumerate(roman_numerals)
+                                  if 0 < len(roman_numeral) <= MAX_ROMAN_LENGTH}
+
+    return _roman_numerals_table, _arabic_numerals_table
+
+
+def roman_to_arabic_table(roman_numeral):
+    """
+    Converts a Roman numeral to an Arabic numeral through a precomputed table.
+
+    PARAMETERS:
+        roman_numeral : str, bytes, bytearray or memoryview
+            Bytes are converted by roman_to_arabic_bytes()
+
+    RETURNS: int
+        Actual conversion to Arabic Numeral if possible, -1 otherwise.
+    """
+    try:
+        if len(roman_numeral) > MAX_ROMAN_LENGTH:  # Fast reject, in constant time, before upper() copies it
+            return -1
+        roman_numeral = str.upper(roman_numeral)  # Ignore case (while also checking if roman_numeral is a str)
+    except TypeError:
+        return roman_to_arabic_bytes(roman_numeral)  # -1 unless bytes
+
+    return (_arabic_numerals_table or conversion_tables()[1]).get(roman_numeral, -1)
+
+
+def arabic_to_roman_table(arabic_numeral):
+    """
+    Converts an Arabic numeral to a Roman numeral through a precomputed table.
+
+    PARAMETERS:
+        arabic_numeral : int or str
+            The value to be converted into a Roman numeral
+
+    RETURNS: str
+        Actual conversion to Roman Numeral if possible, empty string otherwise.
+    """
+    if type(arabic_numeral) is not int:
+        if type(arabic_numeral) is not str and is_longer_than(arabic_numeral, MAX_ARABIC_LENGTH):
+            return ""  # Sized (bytes, list, ...) and too long, rejected before str() writes it out
+        arabic_numeral = str(arabic_numeral)
+
+        # Same rules as is_non_zero_arabic_numeral() and has_no_trailing_zeroes(), parsing the numeral only once
+        # Up to 4 digits (3899, checked first, in constant time), no trailing zeroes
+        if len(arabic_numeral) > MAX_ARABIC_LENGTH or not arabic_numeral.isdecimal() or int(arabic_numeral[0]) == 0:
+            return ""
+        arabic_numeral = int(arabic_numeral)
+
+    if not 0 < arabic_numeral <= 3899:
+        return ""
+
+    return (_roman_numerals_table or conversion_tables()[0])[arabic_numeral]
+
+
+#########################
+# Single-pass regex engine
+#########################
+
+
+def canonical_roman_numeral():
+    """
+    Compiles (once) and returns the CANONICAL_ROMAN_NUMERAL regular expression.
+    The re module is only imported then, keeping this module fast to import.
+
+    RETURNS: re.Pattern
+    """
+    global _canonical_roman_numeral
+
+    if _canonical_roman_numeral is None:
+        import re
+
+        _canonical_roman_numeral = re.compile(CANONICAL_ROMAN_NUMERAL)
+
+    return _canonical_roman_numeral
+
+
+def roman_to_arabic_regex(roman_numeral):
+    """
+    Converts a Roman numeral to an Arabic numeral in a single pass, matching it against CANONICAL_ROMAN_NUMERAL.
+    Each of its groups is the Roman numeral of a digit, whose value is looked up in ROMAN_DIGIT_VALUES.
+
+    PARAMETERS:
+        roman_numeral : str, bytes, bytearray or memoryview
+            Bytes are converted by roman_to_arabic_bytes()
+
+    RETURNS: int
+        Actual conversion to Arabic Numeral if possible, -1 otherwise.
+    """
+    try:
+        if len(roman_numeral) > MAX_ROMAN_LENGTH:  # Fast reject, in constant time, before upper() copies it
+            return -1
+        roman_numeral = str.upper(roman_numeral)  # Ignore case (while also checking if roman_numeral is a str)
+    except TypeError:
+        return roman_to_arabic_bytes(roman_numeral)  # -1 unless bytes
+
+    match = (_canonical_roman_numeral or canonical_roman_numeral()).match(roman_numeral)
+    if match is None:
+        return -1
+
+    thousands, hundreds, tens, units = match.groups()
+    arabic_numeral = (ROMAN_DIGIT_VALUES[thousands] + ROMAN_DIGIT_VALUES[hundreds] +
+                      ROMAN_DIGIT_VALUES[tens] + ROMAN_DIGIT_VALUES[units])
+
+    return arabic_numeral or -1  # Empty string
+
+
+##############
+# Digit engine
+##############
+
+
+def arabic_to_roman_digits(arabic_numeral):
+    """
+    Converts an Arabic numeral to a Roman numeral digit by digit, concatenating the Roman numeral of each digit
+    (ROMAN_DIGITS) without any loop or table to build. Each of the 3899 Roman numerals is interned (sys.intern()),
+    so that however many numerals are converted, a single copy of each is kept.
+
+    PARAMETERS:
+        arabic_numeral : int or str
+            The value to be converted into a Roman numeral
+
+    RETURNS: str
+        Actual conversion to Roman Numeral if possible, empty string otherwise.
+    """
+    if type(arabic_numeral) is not int:
+        if type(arabic_numeral) is not str and is_longer_than(arabic_numeral, MAX_ARABIC_LENGTH):
+            return ""
+        arabic_numeral = str(arabic_numeral)
+
+        # As in arabic_to_roman_table()
+        if len(arabic_numeral) > MAX_ARABIC_LENGTH or not arabic_numeral.isdecimal() or int(arabic_numeral[0]) == 0:
+            return ""
+        arabic_numeral = int(arabic_numeral)
+
+    if not 0 < arabic_numeral <= 3899:
+        return ""
+
+    units, tens, hundreds, thousands = ROMAN_DIGITS
+    return sys.intern(thousands[arabic_numeral // 1000] + hundreds[arabic_numeral // 100 % 10] +
+                      tens[arabic_numeral // 10 % 10] + units[arabic_numeral % 10])  # Faster than a join of 4
+
+
+###################
+# Pair-table engine
+###################
+
+
+PAIR_END = b"\x07"  # Rank following the last character of a Roman numeral (after those of IVXLCDM_ORDER)
+PAIR_INVALID = b"\x08"  # Rank of any other character
+
+_pair_tables = None  # (rank translation table, pair table, ROMAN_DIGITS as ranks, operator.getitem), built on first use
+
+
+def pair_tables():
+    """
+    Builds (once) and returns the tables of the pair-table engine:
+    a bytes.translate() table mapping each ASCII character to its rank in IVXLCDM_ORDER (PAIR_INVALID for any other),
+    the pair table, indexed by the ranks of two adjacent characters, holding the value the first one adds (negative
+    for the leading numeral of a subtractive pair, None for pairs no Roman numeral has: IL, VV, VX, ...),
+    and ROMAN_DIGITS translated to ranks. The operator module is only imported then.
+
+    RETURNS: (bytes, ((int or None, ...), ...), ((bytes, ...), ...), function)
+    """
+    global _pair_tables
+
+    if _pair_tables is None:
+        import operator
+
+        ranks = bytearray(PAIR_INVALID * 256)
+        for rank, char in enumerate(IVXLCDM_ORDER):
+            ranks[ord(char)] = rank
+        ranks = bytes(ranks)
+
+        pairs = []
+        for char in IVXLCDM_ORDER:
+            row = []
+            for next_char in IVXLCDM_ORDER:
+                if char + next_char in SUBTRACTIVE_PAIRS:
+                    row.append(-IVXLCDM[char])
+                elif IVXLCDM[char] > IVXLCDM[next_char] or (char == next_char and char in "IXCM"):
+                    row.append(IVXLCDM[char])
+                else:
+                    row.append(None)
+            row.append(IVXLCDM[char])  # Last character, followed by PAIR_END
+            pairs.append(tuple(row))
+
+        _pair_tables = (ranks, tuple(pairs),
+                        tuple(tuple(roman_digit.encode("ascii").translate(ranks) for roman_digit in roman_digits)
+                              for roman_digits in ROMAN_DIGITS),
+                        operator.getitem)
+
+    return _pair_tables
+
+
+def roman_to_arabic_pairs(roman_numeral):
+    """
+    Converts a Roman numeral to an Arabic numeral with C-level builtins instead of a loop over its characters.
+    Its characters are translated to their rank (bytes.translate()), each pair of adjacent ranks is looked up in the
+    pair table and the values found are summed (map() and sum()), rejecting invalid characters and pairs on the way.
+    The Roman numeral of that value, written digit by digit (as in arabic_to_roman_digits()), must then be the numeral
+    itself, which rejects what no single pair gives away (IIII, VIV, IXI, ...).
+
+    PARAMETERS:
+        roman_numeral : str, bytes, bytearray or memoryview
+            Bytes are converted by roman_to_arabic_bytes()
+
+    RETURNS: int
+        Actual conversion to Arabic Numeral if possible, -1 otherwise.
+    """
+    try:
+        if len(roman_numeral) > MAX_ROMAN_LENGTH:  # Fast reject, in constant time, before upper() copies it
+            return -1
+        ranks, pairs, roman_digits, getitem = _pair_tables or pair_tables()
+        # Ignore case (while also checking if roman_numeral is a str), any non-ASCII character left is invalid
+        roman_numeral = str.upper(roman_numeral).encode("ascii").translate(ranks)
+    except UnicodeEncodeError:
+        return -1
+    except TypeError:
+        return roman_to_arabic_bytes(roman_numeral)  # -1 unless bytes
+
+    if PAIR_INVALID in roman_numeral:
+        return -1
+
+    try:
+        arabic_numeral = sum(map(getitem, map(pairs.__getitem__, roman_numeral), roman_numeral[1:] + PAIR_END))
+    except TypeError:  # None, a pair no Roman numeral has
+        return -1
+
+    if not 0 < arabic_numeral <= 3999:  # As the other engines, reads Roman numerals up to MMMCMXCIX
+        return -1
+
+    units, tens, hundreds, thousands = roman_digits
+    if (thousands[arabic_numeral // 1000] + hundreds[arabic_numeral // 100 % 10] +
+            tens[arabic_numeral // 10 % 10] + units[arabic_numeral % 10]) != roman_numeral:
+        return -1
+
+    return arabic_numeral
+
+
+################
+# Main Functions
+################
+
+
+# Conversion engines, as (roman_to_arabic, arabic_to_roman) pairs
+#   'rules' validates each numeral rule by rule (reference implementation)
+#   'table' looks each numeral up in precomputed tables (built on first use)
+#   'regex' validates and converts each Roman numeral in a single pass (Arabic numerals as in 'rules')
+#   'digits' writes each Arabic numeral digit by digit, with no table (Roman numerals as in 'regex')
+#   'pairs' converts each Roman numeral through a table of adjacent character pairs, with no loop in Python
+#           (Arabic numerals as in 'digits')
+ENGINES = {"rules": (roman_to_arabic_rules, arabic_to_roman_rules),
+           "table": (roman_to_arabic_table, arabic_to_roman_table),
+           "regex": (roman_to_arabic_regex, arabic_to_roman_rules),
+           "digits": (roman_to_arabic_regex, arabic_to_roman_digits),
+           "pairs": (roman_to_arabic_pairs, arabic_to_roman_digits)}
+
+default_engine = "rules"
+
+
+def get_engine(engine=None):
+    """
+    Gets a conversion engine by name.
+
+    PARAMETERS:
+        engine : str or None
+            Name of the engine, one of ENGINES. None for default_engine
+
+    RETURNS: (function, function)
+        roman_to_arabic and arabic_to_roman functions of the engine
+
+    RAISES:
+        ValueError if engine is unknown
+    """
+    try:
+        return ENGINES[engine or default_engine]
+    except KeyError:
+        raise ValueError("Unknown engine '%s', expected one of: %s" % (engine, ", ".join(sorted(ENGINES))))
+
+
+def set_default_engine(engine):
+    """
+    Sets the engine used by roman_to_arabic() and arabic_to_roman() when none is given.
+
+    PARAMETERS:
+        engine : str
+            Name of the engine, one of ENGINES
+
+    RAISES:
+        ValueError if engine is unknown
+    """
+    global default_engine
+
+    get_engine(engine)
+    default_engine = engine
+
+
+def roman_to_arabic(roman_numeral, engine=None):
+    """
+    Converts a Roman numeral to an Arabic numeral.
+    Roman numerals given as bytes are converted by roman_to_arabic_bytes(), by every engine.
+
+    PARAMETERS:
+        roman_numeral : str, bytes, bytearray or memoryview
+        engine : str or None
+            Name of the conversion engine, one of ENGINES. None for default_engine
+
+    RETURNS: int
+        Actual conversion to Arabic Numeral if possible, -1 otherwise.
+    """
+    convert = get_engine(engine)[0]
+
+    if instrumentation is not None:
+        return instrumentation.measure(convert, roman_numeral)
+    return convert(roman_numeral)
+
+
+def arabic_to_roman(arabic_numeral, engine=None):
+    """
+    Converts an Arabic numeral to a Roman numeral.
+
+    PARAMETERS:
+        arabic_numeral : int or str
+            The value to be converted into a Roman numeral
+        engine : str or None
+            Name of the conversion engine, one of ENGINES. None for default_engine
+
+    RETURNS: str
+        Actual conversion to Roman Numeral if possible, empty string otherwise.
+    """
+    return get_engine(engine)[1](arabic_numeral)
+
+
+def roman_to_arabic_many(roman_numerals, lazy=False, engine="table"):
+    """
+    Converts many Roman numerals to Arabic numerals.
+    The engine is looked up once for the whole batch instead of once per numeral.
+
+    PARAMETERS:
+        roman_numerals : iterable of str (or bytes)
+        lazy : bool
+            True to get a generator instead of a list
+        engine : str or None
+            Name of the conversion engine, one of ENGINES. "table" by default, None for default_engine
+
+    RETURNS: [int, ...] or generator of int
+        Actual conversion to Arabic Numeral of each numeral if possible, -1 otherwise.
+    """
+    convert = get_engine(engine)[0]
+
+    if lazy:
+        return (convert(roman_numeral) for roman_numeral in roman_numerals)
+    return [convert(roman_numeral) for roman_numeral in roman_numerals]
+
+
+def arabic_to_roman_many(arabic_numerals, lazy=False, engine="table"):
+    """
+    Converts many Arabic numerals to Roman numerals.
+    The engine is looked up once for the whole batch instead of once per numeral.
+
+    PARAMETERS:
+        arabic_numerals : iterable of int or str
+        lazy : bool
+            True to get a generator instead of a list
+        engine : str or None
+            Name of the conversion engine, one of ENGINES. "table" by default, None for default_engine
+
+    RETURNS: [str, ...] or generator of str
+        Actual conversion to Roman Numeral of each numeral if possible, empty string otherwise.
+    """
+    convert = get_engine(engine)[1]
+
+    if lazy:
+        return (convert(arabic_numeral) for arabic_numeral in arabic_numerals)
+    return [convert(arabic_numeral) for arabic_numeral in arabic_numerals]
+
+
+#######################
+# Diagnostic conversion
+#######################
+
+
+ERROR_CODES = ("OK", "NOT_A_STRING", "EMPTY", "BAD_CHARACTER", "TOO_LONG", "VLD_REPEATED", "FOUR_IN_A_ROW",
+               "BAD_SUBTRACTIVE_PAIR", "OUT_OF_ORDER", "OUT_OF_RANGE", "LEADING_ZEROES")  # ErrorCode names, in order
+SUBTRACTIVE_PAIRS = frozenset(("IV", "IX", "XL", "XC", "CD", "CM"))  # Valid subtractive combinations
+
+_error_code = None  # ErrorCode, created on first use
+
+
+def error_codes():
+    """
+    Creates (once) and returns ErrorCode, the enumeration of the errors found by the diagnostic conversions,
+    named after ERROR_CODES (0 for OK). The enum module is only imported then, keeping this module fast to import.
+    Also available as RomanNumeralsConverter.ErrorCode.
+
+    RETURNS: enum.IntEnum
+    """
+    global _error_code
+
+    if _error_code is None:
+        import enum
+
+        _error_code = enum.IntEnum("ErrorCode", [(name, code) for code, name in enumerate(ERROR_CODES)],
+                                   module=__name__)
+
+    return _error_code
+
+
+def __getattr__(name):
+    """
+    ErrorCode, created on first use (see error_codes()).
+    """
+    if name == "ErrorCode":
+        return _error_code or error_codes()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+class Diagnostic:
+    """
+    Result of a diagnostic conversion: value (as returned by roman_to_arabic() or arabic_to_roman()),
+    error (ErrorCode, ErrorCode.OK if the numeral could be converted)
+    and index of the character where the error was found (-1 if none or not caused by a single character).
+    Unpacks as a (value, error, index) tuple.
+    """
+    __slots__ = ("value", "error", "index")
+
+    def __init__(self, value, error, index=-1):
+        """
+        PARAMETERS:
+            value : int or str
+            error : ErrorCode
+            index : int
+        """
+        self.value = value
+        self.error = error
+        self.index = index
+
+    def __iter__(self):
+        return iter((self.value, self.error, self.index))
+
+    def __eq__(self, other):
+        return isinstance(other, Diagnostic) and tuple(self) == tuple(other)
+
+    def __repr__(self):
+        return "Diagnostic(value=%r, error=ErrorCode.%s, index=%d)" % (self.value, self.error.name, self.index)
+
+
+def roman_to_arabic_diagnostic(roman_numeral):
+    """
+    Converts a Roman numeral to an Arabic numeral, reporting why it couldn't be converted instead of only -1.
+    Validated and converted in a single pass, stopping at the first error. Accepts the same Roman numerals
+    as the other engines, but errors are reported as found from left to right
+    (IIIIV has four in a row, for instance, while it's first rejected for its subtractive pair by the 'rules' engine).
+    Bytes-like Roman numerals are decoded from ASCII first, as roman_to_arabic() reads them.
+
+    PARAMETERS:
+        roman_numeral : str, bytes, bytearray or memoryview
+
+    RETURNS: Diagnostic
+        Value (-1 if it couldn't be converted), error and index of the character where it was found
+    """
+    codes = _error_code or error_codes()
+
+    if isinstance(roman_numeral, (bytes, bytearray, memoryview)):
+        if len(roman_numeral) > MAX_ROMAN_LENGTH:  # Fast reject, in constant time, before bytes() copies it
+            return Diagnostic(-1, codes.TOO_LONG, MAX_ROMAN_LENGTH)
+        try:
+            roman_numeral = bytes(roman_numeral).decode("ascii")
+        except UnicodeDecodeError as error:
+            return Diagnostic(-1, codes.BAD_CHARACTER, error.start)
+
+    try:
+        upper = roman_numeral.upper  # Checks if roman_numeral is a string
+    except AttributeError:
+        return Diagnostic(-1, codes.NOT_A_STRING)
+    if not roman_numeral:
+        return Diagnostic(-1, codes.EMPTY)
+    if len(roman_numeral) > MAX_ROMAN_LENGTH:  # Fast reject, in constant time, before upper() copies it
+        return Diagnostic(-1, codes.TOO_LONG, MAX_ROMAN_LENGTH)
+    roman_numeral = upper()  # Ignore case
+
+    ivxlcdm = IVXLCDM
+    arabic_numeral = 0
+    ceiling = 1000  # Biggest value allowed next
+    pair_ceiling = 1000  # Biggest value allowed as the 2nd value of a subtractive pair led by the previous char
+    leading = 1000  # Value of the (leading) char of the previous single char or pair
+    previous = ""  # Previous char, "" if it was the 2nd value of a subtractive pair
+    run = 0  # Number of times previous char was repeated in a row
+    vld = ""  # V, L and D found so far
+
+    for index, char in enumerate(roman_numeral):
+        value = ivxlcdm.get(char)
+        if value is None:
+            return Diagnostic(-1, codes.BAD_CHARACTER, index)
+
+        if char in "VLD":
+            if char in vld:
+                return Diagnostic(-1, codes.VLD_REPEATED, index)
+            vld += char
+
+        if char == previous:
+            run += 1
+            if run == 4:
+                return Diagnostic(-1, codes.FOUR_IN_A_ROW, index)
+        elif previous and value > ivxlcdm[previous]:
+            # 2nd value of a subtractive pair: only one I, X or C leading it, not after a smaller char (VIX, DCM)
+            if previous + char not in SUBTRACTIVE_PAIRS or run > 1:
+                return Diagnostic(-1, codes.BAD_SUBTRACTIVE_PAIR, index)
+            if value > pair_ceiling:
+                return Diagnostic(-1, codes.OUT_OF_ORDER, index)
+
+            arabic_numeral += value - 2 * leading
+            ceiling = leading - 1  # Chars following a pair must be smaller than its leading numeral (IVI, XCX)
+            previous = ""
+            continue
+        else:
+            run = 1
+
+        if value > ceiling:
+            return Diagnostic(-1, codes.OUT_OF_ORDER, index)
+
+        arabic_numeral += value
+        pair_ceiling = leading if char != previous else pair_ceiling
+        ceiling = leading = value
+        previous = char
+
+    return Diagnostic(arabic_numeral, codes.OK)
+
+
+def arabic_to_roman_diagnostic(arabic_numeral):
+    """
+    Converts an Arabic numeral to a Roman numeral, reporting why it couldn't be converted instead of only "".
+    Validated in a single pass, stopping at the first error, with the same rules as is_non_zero_arabic_numeral()
+    and has_no_trailing_zeroes() (ASCII digits only). Only the first 5 characters are read:
+    longer numerals that are still valid digits there (zero padded) are TOO_LONG, as are sized numerals other than str
+    (bytes, lists, ...) longer than 5, without being read.
+
+    PARAMETERS:
+        arabic_numeral : int or str
+            The value to be converted into a Roman numeral
+
+    RETURNS: Diagnostic
+        Value ("" if it couldn't be converted), error and index of the character where it was found
+    """
+    codes = _error_code or error_codes()
+
+    if type(arabic_numeral) is not int:
+        if type(arabic_numeral) is not str and is_longer_than(arabic_numeral, MAX_ARABIC_LENGTH + 1):
+            return Diagnostic("", codes.TOO_LONG, MAX_ARABIC_LENGTH + 1)  # Not written out by str() first
+        arabic_numeral = str(arabic_numeral)
+        if not arabic_numeral:
+            return Diagnostic("", codes.EMPTY)
+
+        value = 0
+        for index, char in enumerate(arabic_numeral[:MAX_ARABIC_LENGTH + 1]):
+            if not "0" <= char <= "9":
+                return Diagnostic("", codes.BAD_CHARACTER, index)
+            value = value * 10 + ord(char) - 48
+            if value > 3899:
+                return Diagnostic("", codes.OUT_OF_RANGE, index)
+
+        # Fast reject, in constant time: past 5 characters, only zero padded numerals are left (00001...)
+        if len(arabic_numeral) > MAX_ARABIC_LENGTH + 1:
+            return Diagnostic("", codes.TOO_LONG, MAX_ARABIC_LENGTH + 1)
+
+        if value and arabic_numeral[0] == "0":
+            return Diagnostic("", codes.LEADING_ZEROES, 0)
+        arabic_numeral = value
+
+    if not 0 < arabic_numeral <= 3899:
+        return Diagnostic("", codes.OUT_OF_RANGE)
+
+    return Diagnostic(roman_digits(arabic_numeral), codes.OK)
+
+
+####################
+# Lenient conversion
+####################
+
+
+# Upper case Unicode Roman numeral code points (U+2160 to U+2188), as ASCII Roman numerals, for str.translate().
+# Lower case ones (U+2170 to U+217F) are upper cased first. ↁ, ↂ, ↇ and ↈ (5000 and up) and the reversed C are left out
+UNICODE_ROMAN_NUMERALS = {ord(unicode_numeral): roman_numeral for unicode_numeral, roman_numeral in (
+    ("\u2160", "I"), ("\u2161", "II"), ("\u2162", "III"), ("\u2163", "IV"), ("\u2164", "V"), ("\u2165", "VI"),
+    ("\u2166", "VII"), ("\u2167", "VIII"), ("\u2168", "IX"), ("\u2169", "X"), ("\u216a", "XI"), ("\u216b", "XII"),
+    ("\u216c", "L"), ("\u216d", "C"), ("\u216e", "D"), ("\u216f", "M"), ("\u2180", "M"), ("\u2185", "VI"),
+    ("\u2186", "L"))}
+LENIENT_VALUES = dict(IVXLCDM, J=1)  # Value of each Roman numeral character, J being a final I (iij)
+MAX_LENIENT_LENGTH = 32  # Characters, 18 for MMMDCCCCLXXXXVIIII (3999 in additive form)
+
+
+def roman_to_arabic_lenient(roman_numeral):
+    """
+    Converts a Roman numeral, canonical or not, to an Arabic numeral and its canonical Roman numeral.
+    Besides the canonical Roman numerals (looked up in the table engine's table), accepts historical forms:
+    additive (IIII, VIIII, MDCCCCX), irregular subtractive (IIX, IC), J as a final I (iij),
+    and Unicode Roman numerals (Ⅻ, ⅿⅽⅿⅹⅽⅸ, ...).
+    Each run of the same character is added to the value, or subtracted if followed by a bigger character
+    (IIX is 8), and any value from 1 to 3999 is accepted. Still, only I, X and C can lead a subtraction (not VX nor LC),
+    V, L and D can't be repeated (VVVV, DD) and J can only end the numeral (not JX).
+    Bytes-like Roman numerals are decoded from ASCII first.
+
+    PARAMETERS:
+        roman_numeral : str, bytes, bytearray or memoryview
+
+    RETURNS: (int, str)
+        Actual conversion to Arabic Numeral and canonical Roman numeral (as written by arabic_to_roman())
+        if possible, (-1, "") otherwise.
+    """
+    try:
+        if len(roman_numeral) > MAX_LENIENT_LENGTH:  # Fast reject, in constant time, before upper() copies it
+            return -1, ""
+        if isinstance(roman_numeral, (bytes, bytearray, memoryview)):  # Has upper() too, but holds no str
+            roman_numeral = bytes(roman_numeral).decode("ascii")
+        roman_numeral = roman_numeral.upper()  # Ignore case (while also checking if roman_numeral is a string)
+    except (AttributeError, TypeError, UnicodeDecodeError):
+        return -1, ""
+
+    arabic_numeral = (_arabic_numerals_table or conversion_tables()[1]).get(roman_numeral)
+    if arabic_numeral is not None:  # Already canonical
+        return arabic_numeral, roman_numeral
+    if not roman_numeral.isascii():
+        roman_numeral = roman_numeral.translate(UNICODE_ROMAN_NUMERALS)
+
+    if ("J" in roman_numeral[:-1] or
+            roman_numeral.count("V") > 1 or roman_numeral.count("L") > 1 or roman_numeral.count("D") > 1):
+        return -1, ""
+
+    lenient_values = LENIENT_VALUES
+    arabic_numeral = 0
+    run_value = 0  # Value of the character of the current run
+    run = 0  # Value of the current run
+
+    for char in roman_numeral:
+        value = lenient_values.get(char)
+        if value is None:
+            return -1, ""
+
+        if value == run_value:
+            run += value
+        elif value < run_value:
+            arabic_numeral += run
+            run_value = run = value
+        elif run and run_value not in (1, 10, 100):  # Only I, X and C lead a subtraction
+            return -1, ""
+        else:
+            arabic_numeral -= run
+            run_value = run = value
+
+    arabic_numeral += run
+
+    if not 0 < arabic_numeral <= 3999:
+        return -1, ""
+    return arabic_numeral, roman_digits(arabic_numeral)
+
+
+###########################
+# Extended range (vinculum)
+###########################
+
+
+VINCULUM = "\u0305"  # Combining overline, following each character multiplied by 1000
+ASCII_VINCULUM = "_"
+MAX_EXTENDED_ARABIC_NUMERAL = 3999999  # Overlined MMMCMXCIX followed by CMXCIX
+
+
+def roman_digits(arabic_numeral):
+    """
+    Roman numeral of an Arabic numeral between 0 and 3999, joined from ROMAN_DIGITS. Not validated.
+
+    PARAMETERS:
+        arabic_numeral : int
+
+    RETURNS: str
+    """
+    return "".join((ROMAN_DIGITS[3][arabic_numeral // 1000], ROMAN_DIGITS[2][arabic_numeral // 100 % 10],
+                    ROMAN_DIGITS[1][arabic_numeral // 10 % 10], ROMAN_DIGITS[0][arabic_numeral % 10]))
+
+
+def canonical_roman_value(roman_numeral):
+    """
+    Value of an upper case Roman numeral written as roman_digits() writes it, with no length limit.
+
+    PARAMETERS:
+        roman_numeral : str
+
+    RETURNS: int
+        Value of the Roman numeral, 0 if it is empty or not canonical.
+    """
+    match = (_canonical_roman_numeral or canonical_roman_numeral()).match(roman_numeral)
+    if match is None:
+        return 0
+
+    thousands, hundreds, tens, units = match.groups()
+    return (ROMAN_DIGIT_VALUES[thousands] + ROMAN_DIGIT_VALUES[hundreds] +
+            ROMAN_DIGIT_VALUES[tens] + ROMAN_DIGIT_VALUES[units])
+
+
+def arabic_to_roman_extended(arabic_numeral, mark=VINCULUM):
+    """
+    Converts an Arabic numeral up to MAX_EXTENDED_ARABIC_NUMERAL to a Roman numeral, in vinculum notation:
+    from 4000 on, the thousands are written as a Roman numeral with each character followed by mark
+    (multiplying it by 1000), followed by the hundreds, tens and units as usual.
+    Up to 3999, the Roman numeral is the same as arabic_to_roman() (which stops at 3899).
+    Built from ROMAN_DIGITS in time proportional to the number of digits.
+
+    PARAMETERS:
+        arabic_numeral : int or str
+            The value to be converted into a Roman numeral
+        mark : str
+            VINCULUM (combining overline) or ASCII_VINCULUM, for instance
+
+    RETURNS: str
+        Actual conversion to Roman Numeral if possible, empty string otherwise.
+    """
+    if type(arabic_numeral) is not int:
+        if type(arabic_numeral) is not str and is_longer_than(arabic_numeral, 7):
+            return ""  # As in arabic_to_roman_table()
+        arabic_numeral = str(arabic_numeral)
+
+        # Up to 7 digits, no trailing zeroes
+        if len(arabic_numeral) > 7 or not arabic_numeral.isdecimal() or int(arabic_numeral[0]) == 0:
+            return ""
+        arabic_numeral = int(arabic_numeral)
+
+    if not 0 < arabic_numeral <= MAX_EXTENDED_ARABIC_NUMERAL:
+        return ""
+
+    if arabic_numeral < 4000:
+        return roman_digits(arabic_numeral)
+
+    thousands, units = divmod(arabic_numeral, 1000)
+    return "".join([char + mark for char in roman_digits(thousands)] + [roman_digits(units)])
+
+
+def roman_to_arabic_extended(roman_numeral, mark=VINCULUM):
+    """
+    Converts a Roman numeral in vinculum notation (as written by arabic_to_roman_extended()) to an Arabic numeral.
+    Overlined characters (followed by mark) must come first and be worth at least 4000,
+    the remaining ones less than 1000. Without overlined characters, reads up to 3999 (with no length limit).
+    Parsed in a single pass.
+
+    PARAMETERS:
+        roman_numeral : str
+        mark : str
+            VINCULUM (combining overline) or ASCII_VINCULUM, for instance
+
+    RETURNS: int
+        Actual conversion to Arabic Numeral if possible, -1 otherwise.
+    """
+    if not isinstance(roman_numeral, str):  # Bytes have upper() too, but can't be searched for mark
+        return -1
+
+    try:
+        # Longest extended Roman numeral: overlined MMMDCCCLXXXVIII followed by DCCCLXXXVIII
+        # (fast reject, in constant time, before upper() copies it)
+        if not mark or len(roman_numeral) > 15 * (1 + len(mark)) + 12:
+            return -1
+    except TypeError:
+        return -1
+    roman_numeral = roman_numeral.upper()  # Ignore case
+
+    # Overlined characters
+    thousands = []
+    position = 0
+    while roman_numeral.startswith(mark, position + 1):
+        thousands.append(roman_numeral[position])
+        position += 1 + len(mark)
+
+    units = roman_numeral[position:]
+    if not thousands:
+        return canonical_roman_value(units) or -1
+
+    thousands = canonical_roman_value("".join(thousands))
+    units_value = canonical_roman_value(units)
+    if thousands < 4 or (units and not 0 < units_value < 1000):
+        return -1
+
+    return thousands * 1000 + units_value
+
+
+##############################
+# Vectorized conversion (NumPy)
+##############################
+
+
+_numpy_tables = None  # (sorted upper case Roman numerals array, their values array, digit arrays by decimal place)
+
+
+def numpy_tables():
+    """
+    Builds (once) and returns the conversion tables used by the vectorized functions, as NumPy arrays.
+    NumPy is an optional dependency, only imported when a vectorized function is first called.
+
+    RETURNS: (numpy.ndarray, numpy.ndarray, (numpy.ndarray, ...))
+        Sorted upper case Roman numerals, their values and the Roman numerals of each digit by decimal place
+    """
+    global _numpy_tables
+
+    if _numpy_tables is None:
+        import numpy
+
+        roman_numerals = sorted(conversion_tables()[1].items())
+        _numpy_tables = (numpy.array([roman_numeral for roman_numeral, _ in roman_numerals]),
+                         numpy.array([value for _, value in roman_numerals]),
+                         tuple(numpy.array(digits) for digits in ROMAN_DIGITS))
+
+    return _numpy_tables
+
+
+def roman_to_arabic_array(roman_numerals, mask=False):
+    """
+    Converts an array of Roman numerals to an array of Arabic numerals, with NumPy.
+    Each numeral is upper cased and searched for in the sorted table of valid Roman numerals, all at once.
+    Bytes arrays are read as ASCII. Other arrays (object, ...) are converted numeral by numeral.
+
+    PARAMETERS:
+        roman_numerals : numpy.ndarray or array_like of str
+        mask : bool
+            True to also get a boolean array flagging the numerals that could be converted
+
+    RETURNS: numpy.ndarray of int or (numpy.ndarray of int, numpy.ndarray of bool)
+        Actual conversion to Arabic Numeral of each numeral if possible, -1 otherwise.
+    """
+    import numpy
+
+    roman_numerals = numpy.asarray(roman_numerals)
+
+    if roman_numerals.dtype.kind in "US":
+        sorted_roman_numerals, values, _ = numpy_tables()
+        if roman_numerals.dtype.kind != sorted_roman_numerals.dtype.kind:
+            sorted_roman_numerals = sorted_roman_numerals.astype(roman_numerals.dtype.kind)
+
+        roman_numerals = numpy.char.upper(roman_numerals)
+        indexes = numpy.minimum(numpy.searchsorted(sorted_roman_numerals, roman_numerals), len(values) - 1)
+        valid = sorted_roman_numerals[indexes] == roman_numerals
+        arabic_numerals = numpy.where(valid, values[indexes], -1)
+    else:
+        arabic_numerals = numpy.array(roman_to_arabic_many(roman_numerals.ravel().tolist()),
+                                      dtype=int).reshape(roman_numerals.shape)
+        valid = arabic_numerals != -1
+
+    return (arabic_numerals, valid) if mask else arabic_numerals
+
+
+def arabic_to_roman_array(arabic_numerals, mask=False):
+    """
+    Converts an array of Arabic numerals to an array of Roman numerals, with NumPy.
+    Integer arrays are split into thousands, hundreds, tens and units, whose Roman numerals are concatenated,
+    all at once. Other arrays (str, object, ...) are converted numeral by numeral.
+
+    PARAMETERS:
+        arabic_numerals : numpy.ndarray or array_like of int
+        mask : bool
+            True to also get a boolean array flagging the numerals that could be converted
+
+    RETURNS: numpy.ndarray of str or (numpy.ndarray of str, numpy.ndarray of bool)
+        Actual conversion to Roman Numeral of each numeral if possible, empty string otherwise.
+    """
+    import numpy
+
+    arabic_numerals = numpy.asarray(arabic_numerals)
+
+    if arabic_numerals.dtype.kind in "iu":
+        units, tens, hundreds, thousands = numpy_tables()[2]
+
+        # Wide enough for 3899 and 1000 (NumPy 2 rejects Python ints out of the array dtype), uint64 above int64 wraps
+        # to negative (invalid)
+        arabic_numerals = arabic_numerals.astype(numpy.int64, copy=False)
+        valid = (arabic_numerals > 0) & (arabic_numerals <= 3899)
+        arabic_numerals = numpy.where(valid, arabic_numerals, 0)
+        roman_numerals = numpy.char.add(numpy.char.add(thousands[arabic_numerals // 1000],
+                                                       hundreds[arabic_numerals // 100 % 10]),
+                                        numpy.char.add(tens[arabic_numerals // 10 % 10],
+                                                       units[arabic_numerals % 10]))
+    else:
+        roman_numerals = numpy.array(arabic_to_roman_many(arabic_numerals.ravel().tolist()),
+                                     dtype=str).reshape(arabic_numerals.shape)
+        valid = roman_numerals != ""
+
+    return (roman_numerals, valid) if mask else roman_numerals
+
+
+##################
+# pandas accessor
+##################
+
+
+_pandas_accessor_registered = False
+
+
+class RomanAccessor:
+    """
+    Conversions of a pandas Series of numerals, as series.roman (see register_pandas_accessor()).
+    Each unique numeral is converted once (pandas.factorize()) and its conversion broadcast to every row that holds it,
+    so large columns with few distinct numerals convert at the cost of an array lookup.
+    Missing values (None, NaN, NA) are converted as invalid numerals. Results keep the index and name of the Series.
+    """
+    __slots__ = ("_series",)
+
+    def __init__(self, series):
+        """
+        PARAMETERS:
+            series : pandas.Series
+        """
+        self._series = series
+
+    def _map_uniques(self, convert, invalid, dtype):
+        """
+        Converts each unique value of the Series once and broadcasts the conversions to its rows.
+
+        PARAMETERS:
+            convert : function
+                [value, ...] -> [conversion, ...]
+            invalid : int or str or bool
+                Conversion of missing values
+            dtype : type
+
+        RETURNS: pandas.Series
+        """
+        import numpy
+        import pandas
+
+        codes, uniques = pandas.factorize(self._series)  # Missing values get the code -1
+        conversions = numpy.array(convert(uniques.tolist()) + [invalid], dtype=dtype)  # ... which reads the last one
+        return pandas.Series(conversions.take(codes), index=self._series.index, name=self._series.name)
+
+    def to_arabic(self, engine="table"):
+        """
+        Converts a Series of Roman numerals to Arabic numerals.
+
+        PARAMETERS:
+            engine : str or None
+                Name of the conversion engine, one of ENGINES. "table" by default, None for default_engine
+
+        RETURNS: pandas.Series of int
+            Actual conversion to Arabic Numeral of each numeral if possible, -1 otherwise.
+        """
+        return self._map_uniques(lambda uniques: roman_to_arabic_many(uniques, engine=engine), -1, int)
+
+    def to_roman(self, engine="table"):
+        """
+        Converts a Series of Arabic numerals to Roman numerals.
+        Use an integer dtype ('Int64' if it holds missing values): floats are not valid Arabic numerals.
+
+        PARAMETERS:
+            engine : str or None
+                Name of the conversion engine, one of ENGINES. "table" by default, None for default_engine
+
+        RETURNS: pandas.Series of str
+            Actual conversion to Roman Numeral of each numeral if possible, empty string otherwise.
+        """
+        return self._map_uniques(lambda uniques: arabic_to_roman_many(uniques, engine=engine), "", object)
+
+    def is_valid(self):
+        """
+        Flags the valid Roman numerals of a Series.
+
+        RETURNS: pandas.Series of bool
+            True for each numeral that roman_to_arabic() converts, False otherwise.
+        """
+        return self._map_uniques(lambda uniques: [value != -1 for value in roman_to_arabic_many(uniques)], False, bool)
+
+
+def register_pandas_accessor():
+    """
+    Registers RomanAccessor as the 'roman' accessor of pandas Series (series.roman.to_arabic(), ...), once.
+    pandas is an optional dependency: this is done on import only if pandas was already imported, since importing it
+    is slow, so call this function first otherwise.
+
+    RETURNS: bool
+        True if the accessor is registered, False if pandas is not installed.
+    """
+    global _pandas_accessor_registered
+
+    if not _pandas_accessor_registered:
+        try:
+            import pandas.api.extensions
+        except ImportError:
+            return False
+
+        pandas.api.extensions.register_series_accessor("roman")(RomanAccessor)
+        _pandas_accessor_registered = True
+
+    return True
+
+
+if "pandas" in sys.modules:  # Already imported, so registering the accessor costs next to nothing
+    register_pandas_accessor()
+
+
+##################
+# Bytes conversion
+##################
+
+
+ROMAN_BYTES_UPPER = bytes(range(256)).upper()  # 256-entry table upper casing ASCII bytes, for bytes.translate()
+MAX_ROMAN_BYTES_CHUNK = 64 * 1024  # Bytes of a buffer copied at a time by roman_to_arabic_buffer()
+
+_arabic_numerals_bytes_table = None  # {bytes: int, ...} upper case Roman numeral, in ASCII, to Arabic numeral
+
+
+def bytes_conversion_table():
+    """
+    Builds (once) and returns the table used to convert Roman numerals given as bytes:
+    the Roman numerals of the table engine, encoded in ASCII.
+
+    RETURNS: {bytes: int, ...}
+        Dictionary of upper case Roman numerals to their value
+    """
+    global _arabic_numerals_bytes_table
+
+    if _arabic_numerals_bytes_table is None:
+        _arabic_numerals_bytes_table = {roman_numeral.encode("ascii"): value
+                                        for roman_numeral, value in conversion_tables()[1].items()}
+
+    return _arabic_numerals_bytes_table
+
+
+def roman_to_arabic_bytes(roman_numeral):
+    """
+    Converts a Roman numeral given as bytes to an Arabic numeral, without decoding it to str:
+    it is upper cased through ROMAN_BYTES_UPPER (in place of a copy, if it already is) and looked up as bytes.
+    Accepts the same Roman numerals as the table engine, in ASCII.
+
+    PARAMETERS:
+        roman_numeral : bytes, bytearray or memoryview
+
+    RETURNS: int
+        Actual conversion to Arabic Numeral if possible, -1 otherwise.
+    """
+    if type(roman_numeral) is not bytes:
+        if not isinstance(roman_numeral, (bytearray, memoryview)) or len(roman_numeral) > MAX_ROMAN_LENGTH:
+            return -1
+        roman_numeral = bytes(roman_numeral)  # At most MAX_ROMAN_LENGTH bytes
+    elif len(roman_numeral) > MAX_ROMAN_LENGTH:  # Fast reject, in constant time, before translate() copies it
+        return -1
+
+    return (_arabic_numerals_bytes_table or bytes_conversion_table()).get(
+        roman_numeral.translate(ROMAN_BYTES_UPPER), -1)
+
+
+def roman_to_arabic_buffer(buffer, delimiter=b"\n"):
+    """
+    Converts every Roman numeral of a delimited buffer to Arabic numerals, without decoding it to str.
+    The buffer is read MAX_ROMAN_BYTES_CHUNK bytes at a time, each chunk upper cased, split and looked up as a whole,
+    so that memory use stays bounded even for large memory-mapped files.
+    A delimiter at the end of the buffer doesn't start another numeral, so both b"I\nII" and b"I\nII\n" hold 2.
+
+    PARAMETERS:
+        buffer : bytes, bytearray, memoryview, mmap.mmap or any other object supporting the buffer protocol
+        delimiter : bytes
+            Single byte between numerals
+
+    RETURNS: (array.array, bytearray)
+        Arabic numeral of each Roman numeral, as an array of unsigned shorts ('H', 0 if it couldn't be converted),
+        and error mask (1 for each Roman numeral that couldn't be converted, 0 otherwise)
+
+    RAISES:
+        ValueError if delimiter isn't a single byte
+    """
+    from array import array
+
+    if len(delimiter) != 1:
+        raise ValueError("delimiter must be a single byte, got %r" % (delimiter,))
+
+    table = _arabic_numerals_bytes_table or bytes_conversion_table()
+    arabic_numerals = array("H")
+    remainder = b""  # Start of a numeral split between chunks
+
+    with memoryview(buffer) as view, view.cast("B") as view:  # Released at the end, so that mmaps can be closed
+        for start in range(0, len(view), MAX_ROMAN_BYTES_CHUNK):
+            roman_numerals = (remainder + view[start:start + MAX_ROMAN_BYTES_CHUNK].tobytes()).translate(
+                ROMAN_BYTES_UPPER).split(delimiter)
+            remainder = roman_numerals.pop()[:15]  # Longer than 14 bytes is as invalid, at any length
+            arabic_numerals.extend([table.get(roman_numeral, 0) for roman_numeral in roman_numerals])
+
+    if remainder:
+        arabic_numerals.append(table.get(remainder, 0))
+
+    return arabic_numerals, bytearray(not arabic_numeral for arabic_numeral in arabic_numerals)
+
+
+#################
+# Compact columns
+#################
+
+
+COLUMN_MAGIC = b"ROMN"  # First bytes of a RomanColumn file
+COLUMN_VERSION = 1
+COLUMN_HEADER = "<4sHHQ"  # Magic, version, bytes per value and number of values, followed by the values (uint16 LE)
+COLUMN_HEADER_SIZE = 16
+
+
+class RomanColumn:
+    """
+    Column of Roman numerals stored compactly, as their values in an array of unsigned shorts (2 bytes each,
+    0 for a numeral that couldn't be converted), instead of one str each.
+    Roman numerals are written on demand, through the table engine's table: the same as arabic_to_roman().
+    Columns can be saved to a binary file and loaded back memory-mapped, read from the file on access.
+    """
+    def __init__(self, values=()):
+        """
+        PARAMETERS:
+            values : iterable of int
+                Arabic numerals, from 1 to 3999 (anything else is stored as 0).
+                An array('H') or memoryview of unsigned shorts is used as is, without copying it
+        """
+        from array import array
+
+        if isinstance(values, array) and values.typecode == "H" or \
+                isinstance(values, memoryview) and values.format == "H":
+            self.values = values
+        else:
+            self.values = array("H", [value if type(value) is int and 0 < value <= 3999 else 0 for value in values])
+        self._mmap = None  # File the values are mapped from, if loaded with mmap
+
+    @classmethod
+    def from_roman(cls, roman_numerals, engine="table"):
+        """
+        Column of Roman numerals, converted to Arabic numerals.
+
+        PARAMETERS:
+            roman_numerals : iterable of str (or bytes)
+            engine : str or None
+                Name of the conversion engine, one of ENGINES. "table" by default, None for default_engine
+
+        RETURNS: RomanColumn
+        """
+        return cls(roman_to_arabic_many(roman_numerals, lazy=True, engine=engine))
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        """
+        Roman numeral at index, as written by arabic_to_roman() ("" if it couldn't be converted).
+        Slices are columns of their own, in memory (even those of memory-mapped columns).
+
+        PARAMETERS:
+            index : int or slice
+
+        RETURNS: str or RomanColumn
+        """
+        if isinstance(index, slice):
+            from array import array
+
+            return RomanColumn(array("H", self.values[index].tobytes()))
+
+        roman_numerals = _roman_numerals_table or conversion_tables()[0]
+        value = self.values[index]
+        return roman_numerals[value] if value < len(roman_numerals) else ""
+
+    def __iter__(self):
+        """
+        Lazily writes each Roman numeral, as arabic_to_roman() would ("" if it couldn't be converted).
+
+        RETURNS: generator of str
+        """
+        roman_numerals = _roman_numerals_table or conversion_tables()[0]
+        size = len(roman_numerals)
+
+        for value in self.values:
+            yield roman_numerals[value] if value < size else ""
+
+    def save(self, path):
+        """
+        Writes the column to a binary file: a COLUMN_HEADER, followed by each value as a little endian unsigned short.
+
+        PARAMETERS:
+            path : str
+        """
+        import struct
+
+        values = self.values
+        if sys.byteorder == "big":
+            from array import array
+
+            values = array("H", values)
+            values.byteswap()
+
+        with open(path, "wb") as column_file:
+            column_file.write(struct.pack(COLUMN_HEADER, COLUMN_MAGIC, COLUMN_VERSION, 2, len(values)))
+            column_file.write(values)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Reads a column written by save().
+
+        PARAMETERS:
+            path : str
+            mmap : bool
+                True to memory-map the file, its values only being read on access (see close()),
+                False to read them all into memory
+
+        RETURNS: RomanColumn
+
+        RAISES:
+            ValueError if path isn't a column file, or is truncated
+        """
+        import struct
+
+        with open(path, "rb") as column_file:
+            header = column_file.read(COLUMN_HEADER_SIZE)
+            if len(header) < COLUMN_HEADER_SIZE:
+                raise ValueError("%s is not a Roman numerals column file" % path)
+            magic, version, value_size, size = struct.unpack(COLUMN_HEADER, header)
+            if magic != COLUMN_MAGIC or version != COLUMN_VERSION or value_size != 2:
+                raise ValueError("%s is not a Roman numerals column file" % path)
+
+            if mmap and size and sys.byteorder == "little":
+                import mmap as mmap_module
+
+                mapped = mmap_module.mmap(column_file.fileno(), 0, access=mmap_module.ACCESS_READ)
+                if len(mapped) < COLUMN_HEADER_SIZE + 2 * size:
+                    mapped.close()
+                    raise ValueError("%s is truncated" % path)
+                column = cls(memoryview(mapped)[COLUMN_HEADER_SIZE:COLUMN_HEADER_SIZE + 2 * size].cast("H"))
+                column._mmap = mapped
+            else:
+                from array import array
+
+                values = array("H")
+                try:
+                    values.fromfile(column_file, size)
+                except EOFError:
+                    raise ValueError("%s is truncated" % path)
+                if sys.byteorder == "big":
+                    values.byteswap()
+                column = cls(values)
+
+        return column
+
+    def close(self):
+        """
+        Unmaps the file of a memory-mapped column (see load()), after which it can't be read.
+        Does nothing for other columns.
+        """
+        if self._mmap is not None:
+            self.values.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+#############################
+# Sorting and range queries
+#############################
+
+
+INVALID_SORT_KEY = 4000  # Sort key of invalid Roman numerals, after every valid one
+
+
+def roman_sort_key(roman_numeral):
+    """
+    Sort key of a Roman numeral: its value, looked up in the table engine's table
+    (invalid Roman numerals sort last, with INVALID_SORT_KEY). For sorted(..., key=roman_sort_key), for instance.
+
+    PARAMETERS:
+        roman_numeral : str, bytes, bytearray or memoryview
+
+    RETURNS: int
+    """
+    arabic_numeral = roman_to_arabic_table(roman_numeral)
+    return arabic_numeral if arabic_numeral > 0 else INVALID_SORT_KEY
+
+
+class RomanIndex:
+    """
+    Items (Roman numerals, or anything numbered by one) kept sorted by the value of their Roman numeral,
+    for range queries in O(log n) plus the size of the result, through bisect over their precomputed sort keys.
+    Items with invalid Roman numerals are kept last, out of any range.
+    """
+    def __init__(self, items=(), numeral=None):
+        """
+        PARAMETERS:
+            items : iterable
+            numeral : function or None
+                Roman numeral of an item (its "XIV" for ("Chapter", "XIV"), for instance). None for the item itself
+        """
+        self.numeral = numeral
+        keyed_items = sorted(((self.sort_key(item), item) for item in items), key=lambda keyed_item: keyed_item[0])
+        self.keys = [key for key, _ in keyed_items]  # Sort key of each item, in ascending order
+        self.items = [item for _, item in keyed_items]
+
+    def sort_key(self, item):
+        """
+        Sort key of an item (see roman_sort_key()).
+
+        PARAMETERS:
+            item : object
+
+        RETURNS: int
+        """
+        return roman_sort_key(item if self.numeral is None else self.numeral(item))
+
+    def insert(self, item):
+        """
+        Inserts an item in order, after any other item with the same value, without sorting again.
+
+        PARAMETERS:
+            item : object
+        """
+        from bisect import bisect_right
+
+        key = self.sort_key(item)
+        index = bisect_right(self.keys, key)
+        self.keys.insert(index, key)
+        self.items.insert(index, item)
+
+    def range(self, low, high):
+        """
+        Items whose value is between low and high (both included), in ascending order.
+
+        PARAMETERS:
+            low : str or int
+                Roman or Arabic numeral
+            high : str or int
+                Roman or Arabic numeral
+
+        RETURNS: list
+
+        RAISES:
+            ValueError if low or high is an invalid Roman numeral
+        """
+        from bisect import bisect_left, bisect_right
+
+        low, high = (bound if type(bound) is int else roman_sort_key(bound) for bound in (low, high))
+        if INVALID_SORT_KEY in (low, high):
+            raise ValueError("invalid Roman numeral bound")
+
+        high = min(high, INVALID_SORT_KEY - 1)
+        return self.items[bisect_left(self.keys, low):bisect_right(self.keys, high)]
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+#####################
+# Streaming conversion
+#####################
+
+
+def detect_numeral_type(numeral):
+    """
+    Detects the type of a numeral: 'arabic' if it starts with a digit or a minus sign, 'roman' otherwise.
+
+    PARAMETERS:
+        numeral : str
+
+    RETURNS: str
+        'roman' or 'arabic'
+    """
+    return "arabic" if numeral[:1].isdigit() or numeral[:1] == "-" else "roman"
+
+
+def read_numerals(stream):
+    """
+    Lazily reads numerals from a newline-delimited stream, one line at a time.
+    Surrounding whitespace (line endings included) is removed.
+
+    PARAMETERS:
+        stream : file or iterable of str
+
+    RETURNS: generator of str
+    """
+    for line in stream:
+        yield line.strip()
+
+
+def convert_stream(numerals, numeral_type="auto", engine=None):
+    """
+    Lazily converts numerals, one at a time.
+
+    PARAMETERS:
+        numerals : iterable of str
+        numeral_type : str
+            'roman' or 'arabic' to explicitly define the type of all numerals,
+            'auto' to detect the type of each numeral with detect_numeral_type()
+        engine : str or None
+            Name of the conversion engine, one of ENGINES. None for default_engine
+
+    RETURNS: generator of str
+        Actual conversion of each numeral, as returned by roman_to_arabic() or arabic_to_roman()
+    """
+    roman_to_arabic_, arabic_to_roman_ = get_engine(engine)
+
+    for numeral in numerals:
+        if (numeral_type if numeral_type != "auto" else detect_numeral_type(numeral)) == "roman":
+            yield str(roman_to_arabic_(numeral))
+        else:
+            yield arabic_to_roman_(numeral)
+
+
+def write_lines(lines, output, buffer_lines=8192):
+    """
+    Writes lines to output, buffer_lines lines per write.
+
+    PARAMETERS:
+        lines : iterable of str
+            Lines without line endings
+        output : file
+        buffer_lines : int
+            Number of lines held in memory before being written
+    """
+    buffer = []
+
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) == buffer_lines:
+            buffer.append("")  # Line ending of the last line
+            output.write("\n".join(buffer))
+            del buffer[:]
+
+    if buffer:
+        buffer.append("")
+        output.write("\n".join(buffer))
+
+
+#####################
+# Incremental parsing
+#####################
+
+
+class IncrementalRomanParser:
+    """
+    Parses a Roman numeral one character at a time (from a keyboard, an OCR pipeline, ...), in O(1) per character,
+    with the same rules as roman_to_arabic_rules(). It keeps their state instead of the characters:
+    the V, L and D seen (at_most_once_vld()), the current run of I, X, C or M (at_most_3_in_row_ixcm()),
+    the last character, whether it leads a subtractive pair (known once the next one is fed)
+    and the biggest character allowed next.
+    A prefix of a valid Roman numeral is itself a valid Roman numeral, so the first character that makes the numeral
+    invalid can't be made up for: feed() returns False from then on, until reset().
+    """
+    __slots__ = ("_valid", "_length", "_vld", "_run_char", "_run_length", "_previous", "_last", "_max_index",
+                 "_pair_ceiling", "_jump_char", "_value")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets every character fed, to parse another numeral.
+        """
+        self._valid = True
+        self._length = 0
+        self._vld = set()  # V, L and D seen
+        self._run_char = ""  # I, X, C or M of the current run, "" if none
+        self._run_length = 0
+        self._previous = ""  # Last character fed, not summed yet (it may lead a subtractive pair)
+        # As in roman_to_arabic_rules(), up to the character before self._previous
+        self._last = "M"
+        self._max_index = len(IVXLCDM_ORDER) - 1
+        self._pair_ceiling = "M"
+        self._jump_char = False
+        self._value = 0
+
+    def feed(self, char):
+        """
+        Parses the next character of the Roman numeral (of any case).
+
+        PARAMETERS:
+            char : str
+                Single character
+
+        RETURNS: bool
+            True if the characters fed so far make a valid Roman numeral (so far), False otherwise.
+        """
+        if not self._valid:
+            return False
+
+        try:
+            char = char.upper()  # Ignore case (while also checking if char is a string)
+        except AttributeError:
+            char = ""
+
+        self._length += 1
+        if char not in IVXLCDM or self._length > MAX_ROMAN_LENGTH:
+            return self._reject()
+
+        # V, L and D can only appear at most once
+        if char in "VLD":
+            if char in self._vld:
+                return self._reject()
+            self._vld.add(char)
+
+        # I, X, C and M cannot occur more than 3 times in a row
+        if char in "IXCM":
+            if char == self._run_char:
+                self._run_length += 1
+                if self._run_length > 3:
+                    return self._reject()
+            else:
+                self._run_char = char
+                self._run_length = 1
+        else:
+            self._run_char = ""
+            self._run_length = 0
+
+        # The previous character leads a subtractive pair if this one is bigger, which must then be a valid pair
+        previous = self._previous
+        ivxlcdm_order = IVXLCDM_ORDER
+        subtractive = previous and ivxlcdm_order.index(char) > ivxlcdm_order.index(previous)
+        if subtractive and previous + char not in SUBTRACTIVE_PAIRS:
+            return self._reject()
+
+        # Now that it is known whether it leads a subtractive pair, the previous character is summed
+        if previous:
+            if self._jump_char:
+                # The 2nd value of a pair can't lead another pair (IXC)
+                if subtractive:
+                    return self._reject()
+                # Chars following a pair must be smaller than its leading numeral (IVI, XCX)
+                self._max_index -= 1
+                self._jump_char = False
+            else:
+                self._pair_ceiling = self._last
+                self._last = previous
+                self._max_index = ivxlcdm_order.index(previous)
+
+            if subtractive:
+                self._value -= IVXLCDM[previous]
+                self._jump_char = True
+            else:
+                self._value += IVXLCDM[previous]
+
+        # Whatever follows, this character must not be bigger than the biggest one allowed here
+        if self._jump_char:
+            # The 2nd value of a pair can't be bigger than the char preceding the pair (VIX, CCM)
+            if ivxlcdm_order.index(char) > ivxlcdm_order.index(self._pair_ceiling):
+                return self._reject()
+        elif ivxlcdm_order.index(char) > self._max_index:
+            return self._reject()
+
+        self._previous = char
+        return True
+
+    def _reject(self):
+        """
+        Marks the numeral as invalid, for good.
+
+        RETURNS: bool
+            False
+        """
+        self._valid = False
+        return False
+
+    @property
+    def value(self):
+        """
+        Value of the characters fed so far, as roman_to_arabic() would convert them (the last one ending the numeral).
+
+        RETURNS: int
+            Actual conversion to Arabic Numeral if possible, -1 otherwise.
+        """
+        if not self._valid or not self._previous:
+            return -1
+        return self._value + IVXLCDM[self._previous]
+
+    def __repr__(self):
+        return "IncrementalRomanParser(value=%d)" % self.value
+
+
+##############
+# Text scanning
+##############
+
+
+ROMAN_NUMERAL_TOKEN = r"\b[IVXLCDMivxlcdm]+\b"  # Whole word made of Roman numeral characters, a candidate numeral
+SKIPPED_ROMAN_NUMERALS = frozenset(("I",))  # Left as they are by default, being words too (the pronoun I)
+
+_roman_numeral_token = None  # ROMAN_NUMERAL_TOKEN, compiled on first use
+
+
+def roman_numeral_token():
+    """
+    Compiles (once) and returns the ROMAN_NUMERAL_TOKEN regular expression.
+
+    RETURNS: re.Pattern
+    """
+    global _roman_numeral_token
+
+    if _roman_numeral_token is None:
+        import re
+
+        _roman_numeral_token = re.compile(ROMAN_NUMERAL_TOKEN)
+
+    return _roman_numeral_token
+
+
+def text_segments(text):
+    """
+    Lazily splits a text, given whole or in chunks, into segments that can be scanned for Roman numerals one at a time.
+    A word split between chunks is held back until the next chunk, unless it is already too long to be a Roman
+    numeral, so that only a few characters are held in memory besides the current chunk.
+
+    PARAMETERS:
+        text : str or iterable of str
+            Whole text, or chunks of it (a file, for instance)
+
+    RETURNS: generator of (int, str, int)
+        Position in the whole text of each segment (preceded by the last character of the previous segment,
+        which decides the word boundary at its start), the segment and the position where it starts (0 or 1)
+    """
+    if isinstance(text, str):
+        text = (text,)
+
+    previous = ""  # Last character of the previous segment
+    pending = ""  # Text not yet in a segment
+    position = 0  # Of pending, in the whole text
+
+    for chunk in text:
+        pending += chunk
+
+        # Start of the word at the end of pending (a word character is what "\w" matches)
+        end = len(pending)
+        while end and (pending[end - 1].isalnum() or pending[end - 1] == "_"):
+            end -= 1
+            if len(pending) - end > MAX_ROMAN_LENGTH:
+                end = len(pending)
+                break
+
+        if end:
+            yield position - len(previous), previous + pending[:end], len(previous)
+            previous = pending[end - 1]
+            position += end
+            pending = pending[end:]
+
+    if pending:
+        yield position - len(previous), previous + pending, len(previous)
+
+
+def scan_segment(segment, start, roman_to_arabic_, ignore_case=False, skip=SKIPPED_ROMAN_NUMERALS):
+    """
+    Finds the Roman numerals of a segment of text, as yielded by text_segments().
+
+    PARAMETERS:
+        segment : str
+        start : int
+            Position where the segment starts
+        roman_to_arabic_ : function
+            Converts (and validates) each candidate numeral
+        ignore_case : bool
+            True to also find lower and mixed case Roman numerals
+        skip : set of str
+            Upper case Roman numerals not to find, whatever their case
+
+    RETURNS: generator of (re.Match, int)
+        Match and value of each Roman numeral
+    """
+    for match in (_roman_numeral_token or roman_numeral_token()).finditer(segment, start):
+        numeral = match.group()
+        if (ignore_case or numeral.isupper()) and numeral.upper() not in skip:
+            value = roman_to_arabic_(numeral)
+            if value > 0:
+                yield match, value
+
+
+def find_roman_numerals(text, engine=None, ignore_case=False, skip=SKIPPED_ROMAN_NUMERALS):
+    """
+    Lazily finds the Roman numerals of a text, given whole or in chunks ("Chapter XIV", "Part III", ...).
+    Candidate numerals (whole words of ROMAN_NUMERAL_TOKEN) are matched by a single precompiled regular expression,
+    then validated and converted by the engine.
+    By default, only upper case Roman numerals are found, and not a standalone I, so that plain prose is left alone
+    ("I think", "mix", ...): pass ignore_case=True and skip=() to find them all ("Part iii", "World War I").
+
+    PARAMETERS:
+        text : str or iterable of str
+            Whole text, or chunks of it (a file, for instance)
+        engine : str or None
+            Name of the conversion engine, one of ENGINES. None for default_engine
+        ignore_case : bool
+            True to also find lower and mixed case Roman numerals
+        skip : set of str
+            Upper case Roman numerals not to find, whatever their case (SKIPPED_ROMAN_NUMERALS, the pronoun I)
+
+    RETURNS: generator of ((int, int), str, int)
+        Span in the whole text, Roman numeral and value of each Roman numeral
+    """
+    roman_to_arabic_ = get_engine(engine)[0]
+
+    for position, segment, start in text_segments(text):
+        for match, value in scan_segment(segment, start, roman_to_arabic_, ignore_case, skip):
+            yield (position + match.start(), position + match.end()), match.group(), value
+
+
+def replace_roman_numerals(text, replacement=None, engine=None, ignore_case=False, skip=SKIPPED_ROMAN_NUMERALS):
+    """
+    Lazily rewrites a text, given whole or in chunks, replacing each of its Roman numerals (see find_roman_numerals(),
+    which leaves lower case ones and a standalone I alone by default).
+
+    PARAMETERS:
+        text : str or iterable of str
+            Whole text, or chunks of it (a file, for instance)
+        replacement : function or None
+            Text replacing each Roman numeral, given the Roman numeral and its value. None for its value
+        engine : str or None
+            Name of the conversion engine, one of ENGINES. None for default_engine
+        ignore_case : bool
+            True to also replace lower and mixed case Roman numerals
+        skip : set of str
+            Upper case Roman numerals not to replace, whatever their case (SKIPPED_ROMAN_NUMERALS, the pronoun I)
+
+    RETURNS: generator of str
+        Rewritten text, a segment at a time (joined, the whole rewritten text)
+    """
+    roman_to_arabic_ = get_engine(engine)[0]
+
+    for _, segment, start in text_segments(text):
+        rewritten = []
+        for match, value in scan_segment(segment, start, roman_to_arabic_, ignore_case, skip):
+            rewritten.append(segment[start:match.start()])
+            rewritten.append(str(value) if replacement is None else replacement(match.group(), value))
+            start = match.end()
+        rewritten.append(segment[start:])
+
+        yield "".join(rewritten)
+
+
+####################
+# Parallel conversion
+####################
+
+
+def chunks(iterable, chunk_size):
+    """
+    Lazily splits an iterable into lists of chunk_size items (the last one may be shorter).
+
+    PARAMETERS:
+        iterable : iterable
+        chunk_size : int
+
+    RETURNS: generator of list
+    """
+    chunk = []
+
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def convert_chunk(arguments):
+    """
+    Converts a chunk of numerals. Runs in the worker processes of convert_parallel().
+
+    PARAMETERS:
+        arguments : ([str, ...], str, str)
+            Numerals, numeral_type and engine, as taken by convert_stream()
+
+    RETURNS: [str, ...]
+    """
+    numerals, numeral_type, engine = arguments
+    return list(convert_stream(numerals, numeral_type, engine))
+
+
+SHARED_ENTRY_SIZE = 16  # Bytes per Roman numeral of a shared table: its length, then up to 15 ASCII characters
+
+
+class SharedRomanNumerals:
+    """
+    Read-only table of Roman numerals indexed by their value, as conversion_tables()[0],
+    held in a shared memory block published by publish_conversion_table().
+    Its first entry holds the number of Roman numerals. Each Roman numeral is read from the block when accessed,
+    so attaching to it copies nothing.
+    """
+    def __init__(self, block):
+        """
+        PARAMETERS:
+            block : multiprocessing.shared_memory.SharedMemory
+        """
+        self.block = block
+        self._buffer = block.buf
+        self._size = int.from_bytes(self._buffer[:4], "little")
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, arabic_numeral):
+        """
+        PARAMETERS:
+            arabic_numeral : int
+                From 0 to len() - 1
+
+        RETURNS: str
+
+        RAISES:
+            IndexError if arabic_numeral is out of range
+        """
+        if not 0 <= arabic_numeral < self._size:
+            raise IndexError("shared table index out of range")
+
+        offset = (arabic_numeral + 1) * SHARED_ENTRY_SIZE
+        return str(self._buffer[offset + 1:offset + 1 + self._buffer[offset]], "ascii")
+
+    def close(self):
+        """
+        Detaches from the shared memory block (which stays published until unlinked).
+        """
+        self._buffer.release()
+        self.block.close()
+
+
+def publish_conversion_table():
+    """
+    Copies the table of Roman numerals of conversion_tables() into a new shared memory block (Python 3.8+),
+    which other processes of the same program attach to by name, through attach_conversion_table().
+
+    RETURNS: multiprocessing.shared_memory.SharedMemory
+        To close() and unlink() once no process needs it anymore
+    """
+    from multiprocessing import shared_memory
+
+    roman_numerals = _roman_numerals_table or conversion_tables()[0]
+    table = len(roman_numerals).to_bytes(SHARED_ENTRY_SIZE, "little") + b"".join(
+        bytes((len(roman_numeral), )) + roman_numeral.encode("ascii").ljust(SHARED_ENTRY_SIZE - 1, b"\0")
+        for roman_numeral in roman_numerals)
+
+    block = shared_memory.SharedMemory(create=True, size=len(table))
+    block.buf[:len(table)] = table
+    return block
+
+
+def attach_conversion_table(name):
+    """
+    Attaches this process to a table published by publish_conversion_table(), used from then on
+    instead of building its own (by the table engine, RomanColumn and Roman).
+    Runs in the worker processes of convert_parallel(shared_table=True).
+
+    PARAMETERS:
+        name : str
+            Name of the shared memory block
+
+    RETURNS: SharedRomanNumerals
+    """
+    global _roman_numerals_table
+    from multiprocessing import shared_memory
+
+    _roman_numerals_table = SharedRomanNumerals(shared_memory.SharedMemory(name))
+    return _roman_numerals_table
+
+
+def convert_parallel(numerals, numeral_type="auto", engine=None, jobs=None, chunk_size=10000, shared_table=False):
+    """
+    Lazily converts numerals in chunks, across a pool of worker processes, keeping their order.
+    At most 2 chunks per worker are read ahead, so memory stays bounded whatever the number of numerals.
+
+    PARAMETERS:
+        numerals : iterable of str
+        numeral_type : str
+            'roman', 'arabic' or 'auto', as taken by convert_stream()
+        engine : str or None
+            Name of the conversion engine, one of ENGINES. None for default_engine
+        jobs : int or None
+            Number of worker processes. None for the number of CPUs
+        chunk_size : int
+            Number of numerals sent to a worker at a time
+        shared_table : bool
+            True to publish the table of Roman numerals once in shared memory (publish_conversion_table()),
+            which the workers attach to instead of each building their own (Python 3.8+).
+            Mostly useful when workers are spawned, as forked ones start with a copy of this process' tables
+
+    RETURNS: generator of str
+        Actual conversion of each numeral, as returned by roman_to_arabic() or arabic_to_roman()
+    """
+    import collections
+    import multiprocessing
+
+    engine = engine or default_engine  # Workers may not share this process' default engine
+    get_engine(engine)
+    jobs = jobs or multiprocessing.cpu_count()
+
+    table = publish_conversion_table() if shared_table else None
+    pool = multiprocessing.Pool(jobs, *((attach_conversion_table, (table.name, )) if table is not None else ()))
+    try:
+        pending = collections.deque()
+        for chunk in chunks(numerals, chunk_size):
+            pending.append(pool.apply_async(convert_chunk, ((chunk, numeral_type, engine), )))
+            if len(pending) > 2 * jobs:
+                for converted in pending.popleft().get():
+                    yield converted
+
+        while pending:
+            for converted in pending.popleft().get():
+                yield converted
+    finally:
+        pool.terminate()
+        pool.join()
+        if table is not None:
+            table.close()
+            table.unlink()
+
+
+#############
+# Memoization
+#############
+
+
+class MemoizedConverter:
+    """
+    Conversion function wrapped with a bounded least recently used (LRU) cache of its results.
+    Invalid numerals are cached as well, but never more than maxsize numerals are kept.
+    Numerals are cached by type and value (1, "1" and True are cached apart). Unhashable ones are not cached,
+    nor strings (or bytes) longer than any valid numeral, which are passed straight to function, without being hashed
+    (read whole) or kept alive by the cache.
+    """
+    def __init__(self, function, maxsize=1024):
+        """
+        PARAMETERS:
+            function : function
+                Conversion function taking a single numeral (roman_to_arabic, arabic_to_roman, ...)
+            maxsize : int
+                Maximum number of cached numerals
+        """
+        self.function = function
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache = {}  # Least recently used first (dictionaries keep insertion order)
+
+    def __call__(self, numeral):
+        """
+        Converts a numeral, through the cache.
+
+        PARAMETERS:
+            numeral : str or int
+
+        RETURNS: int or str
+            Same as function(numeral)
+        """
+        # Too long to be a valid Roman (or, starting with a digit, Arabic) numeral: not cached, nor counted
+        if isinstance(numeral, (str, bytes, bytearray, memoryview)) and len(numeral) > MAX_ARABIC_LENGTH:
+            first = numeral[:1] if not isinstance(numeral, memoryview) else bytes(numeral[:1])  # No memoryview.isdigit()
+            if len(numeral) > MAX_ROMAN_LENGTH or first.isdigit():
+                return self.function(numeral)
+
+        key = (type(numeral), numeral)
+        try:
+            hash(key)
+        except TypeError:  # Unhashable numeral
+            self.misses += 1
+            return self.function(numeral)
+
+        converted = self._cache.pop(key, self)  # self if not cached
+        if converted is self:
+            converted = self.function(numeral)
+            self.misses += 1
+            if self.maxsize <= 0:
+                return converted
+            if len(self._cache) >= self.maxsize:
+                del self._cache[next(iter(self._cache))]
+                self.evictions += 1
+        else:
+            self.hits += 1
+
+        self._cache[key] = converted  # Most recently used
+        return converted
+
+    def cache_info(self):
+        """
+        Cache statistics.
+
+        RETURNS: {str: int, ...}
+            hits, misses, evictions, size (number of cached numerals) and maxsize
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._cache), "maxsize": self.maxsize}
+
+    def cache_clear(self):
+        """
+        Empties the cache and resets its statistics.
+        """
+        self._cache.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def resize(self, maxsize):
+        """
+        Changes the maximum number of cached numerals, evicting the least recently used ones if needed.
+
+        PARAMETERS:
+            maxsize : int
+        """
+        self.maxsize = maxsize
+        while len(self._cache) > max(maxsize, 0):
+            del self._cache[next(iter(self._cache))]
+            self.evictions += 1
+
+
+def memoize(function, maxsize=1024):
+    """
+    Wraps a conversion function with a bounded least recently used (LRU) cache of its results.
+
+    PARAMETERS:
+        function : function
+            Conversion function taking a single numeral (roman_to_arabic, arabic_to_roman, ...)
+        maxsize : int
+            Maximum number of cached numerals
+
+    RETURNS: MemoizedConverter
+    """
+    return MemoizedConverter(function, maxsize)
+
+
+####################
+# Roman numeral type
+####################
+
+_new_roman = object.__new__  # Arithmetic results are built without Roman.__init__, their value being known
+
+
+class Roman:
+    """
+    Immutable Roman numeral, from 1 to 3899 (as arabic_to_roman()), stored as its value.
+    Supports +, -, * (with Roman numerals or int), comparison and hashing (equal to its value), all on the value:
+    its Roman numeral is only written when displayed (str()), then kept.
+    Results out of range raise ValueError, as does Roman() of an invalid numeral.
+    """
+    __slots__ = ("_value", "_numeral")
+
+    def __init__(self, numeral):
+        """
+        PARAMETERS:
+            numeral : str, int or Roman
+                Roman numeral (converted by roman_to_arabic()) or Arabic numeral
+
+        RAISES:
+            ValueError if numeral is invalid or out of range
+        """
+        if type(numeral) is int:
+            value = numeral
+        elif isinstance(numeral, Roman):
+            value = numeral._value
+        else:
+            value = roman_to_arabic(numeral)
+            if value < 0:
+                raise ValueError("invalid Roman numeral %r" % (numeral,))
+
+        if not 0 < value <= 3899:
+            raise ValueError("%d is out of range (1 to 3899)" % value)
+
+        self._value = value
+        self._numeral = None
+
+    @property
+    def value(self):
+        """
+        Arabic numeral.
+
+        RETURNS: int
+        """
+        return self._value
+
+    @staticmethod
+    def _from_value(value):
+        """
+        Roman numeral of an arithmetic result, built without __init__ as value is already an int.
+
+        PARAMETERS:
+            value : int
+
+        RETURNS: Roman
+
+        RAISES:
+            ValueError if value is out of range
+        """
+        if 0 < value <= 3899:
+            roman = _new_roman(Roman)
+            roman._value = value
+            roman._numeral = None
+            return roman
+        raise ValueError("%d is out of range (1 to 3899)" % value)
+
+    def __add__(self, other):
+        if type(other) is int:
+            value = self._value + other
+        elif isinstance(other, Roman):
+            value = self._value + other._value
+        else:
+            return NotImplemented
+        return Roman._from_value(value)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if type(other) is int:
+            value = self._value - other
+        elif isinstance(other, Roman):
+            value = self._value - other._value
+        else:
+            return NotImplemented
+        return Roman._from_value(value)
+
+    def __rsub__(self, other):
+        if type(other) is int:
+            value = other - self._value
+        else:
+            return NotImplemented
+        return Roman._from_value(value)
+
+    def __mul__(self, other):
+        if type(other) is int:
+            value = self._value * other
+        elif isinstance(other, Roman):
+            value = self._value * other._value
+        else:
+            return NotImplemented
+        return Roman._from_value(value)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        if type(other) is int:
+            return self._value == other
+        if isinstance(other, Roman):
+            return self._value == other._value
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __lt__(self, other):
+        if type(other) is int:
+            return self._value < other
+        if isinstance(other, Roman):
+            return self._value < other._value
+        return NotImplemented
+
+    def __le__(self, other):
+        if type(other) is int:
+            return self._value <= other
+        if isinstance(other, Roman):
+            return self._value <= other._value
+        return NotImplemented
+
+    def __gt__(self, other):
+        if type(other) is int:
+            return self._value > other
+        if isinstance(other, Roman):
+            return self._value > other._value
+        return NotImplemented
+
+    def __ge__(self, other):
+        if type(other) is int:
+            return self._value >= other
+        if isinstance(other, Roman):
+            return self._value >= other._value
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._value)
+
+    def __int__(self):
+        return self._value
+
+    __index__ = __int__
+
+    def __str__(self):
+        """
+        Roman numeral, as written by arabic_to_roman() (written once, through the table engine's table).
+
+        RETURNS: str
+        """
+        if self._numeral is None:
+            self._numeral = (_roman_numerals_table or conversion_tables()[0])[self._value]
+        return self._numeral
+
+    def __repr__(self):
+        return "Roman(%r)" % str(self)
+
+
+#################
+# Instrumentation
+#################
+
+
+REJECTION_RULES = ("is_string", "is_possible_roman_numeral", "at_most_once_vld", "at_most_3_in_row_ixcm",
+                   "subtractive_combination_validity", "descending_order")  # Rules of the rule-based engine
+INPUT_CLASSES = ("upper_case", "lower_case", "mixed_case", "not_roman", "too_long", "empty", "bytes",
+                 "not_a_string")  # Classes of the Roman numerals given to roman_to_arabic()
+
+instrumentation = None  # Instrumentation, while enabled (see enable_instrumentation())
+
+
+def input_class(roman_numeral):
+    """
+    Class of a Roman numeral given to roman_to_arabic(), one of INPUT_CLASSES.
+
+    PARAMETERS:
+        roman_numeral : object
+
+    RETURNS: str
+    """
+    if isinstance(roman_numeral, (bytes, bytearray, memoryview)):
+        return "bytes"
+    if not isinstance(roman_numeral, str):
+        return "not_a_string"
+    if not roman_numeral:
+        return "empty"
+    if len(roman_numeral) > MAX_ROMAN_LENGTH:
+        return "too_long"
+    if roman_numeral.upper().strip("IVXLCDM"):
+        return "not_roman"
+    if roman_numeral.isupper():
+        return "upper_case"
+    return "lower_case" if roman_numeral.islower() else "mixed_case"
+
+
+def rejected(rule):
+    """
+    Rejection of a Roman numeral by a rule of the rule-based engine, counted while instrumentation is enabled.
+
+    PARAMETERS:
+        rule : str
+            One of REJECTION_RULES
+
+    RETURNS: int
+        -1, as returned by roman_to_arabic_rules()
+    """
+    if instrumentation is not None:
+        instrumentation.rejections[rule] += 1
+    return -1
+
+
+class Instrumentation:
+    """
+    Counters and latency samples of Roman numeral conversions, while enabled (see enable_instrumentation()):
+    rejections by rule of the rule-based engine (whichever way it is called),
+    and calls, rejections and per-call latency of roman_to_arabic() by input class (whatever the engine).
+    Latency is sampled once every sample_every calls, keeping the max_samples latest samples.
+    """
+    def __init__(self, sample_every=100, max_samples=10000):
+        """
+        PARAMETERS:
+            sample_every : int
+                Number of calls per latency sample
+            max_samples : int
+                Maximum number of latency samples kept
+        """
+        self.sample_every = sample_every
+        self.max_samples = max_samples
+        self.rejections = dict.fromkeys(REJECTION_RULES, 0)
+        self.calls = dict.fromkeys(INPUT_CLASSES, 0)
+        self.class_rejections = dict.fromkeys(INPUT_CLASSES, 0)
+        self.samples = []  # Seconds, a ring buffer once max_samples are kept
+        self.sampled = 0  # Number of samples ever taken
+        self._countdown = sample_every  # Calls until the next sample
+
+        from time import perf_counter
+
+        self._timer = perf_counter
+
+    def measure(self, function, roman_numeral):
+        """
+        Converts a Roman numeral, counting the call (and rejection) by input class and sampling its latency.
+
+        PARAMETERS:
+            function : function
+                Conversion function taking a single Roman numeral
+            roman_numeral : object
+
+        RETURNS: int
+            Same as function(roman_numeral)
+        """
+        numeral_class = input_class(roman_numeral)
+        self.calls[numeral_class] += 1
+
+        self._countdown -= 1
+        if self._countdown > 0:
+            arabic_numeral = function(roman_numeral)
+        else:
+            self._countdown = self.sample_every
+            start = self._timer()
+            arabic_numeral = function(roman_numeral)
+            latency = self._timer() - start
+
+            if len(self.samples) < self.max_samples:
+                self.samples.append(latency)
+            else:
+                self.samples[self.sampled % self.max_samples] = latency
+            self.sampled += 1
+
+        if arabic_numeral < 0:
+            self.class_rejections[numeral_class] += 1
+        return arabic_numeral
+
+    def as_dict(self):
+        """
+        Counters and latency summary.
+
+        RETURNS: {str: {str: int or float, ...}, ...}
+            rejections_by_rule, calls_by_class and rejections_by_class counters,
+            and latency_seconds summary (samples, sum, p50 and p99 of the kept samples, None without samples)
+        """
+        samples = sorted(self.samples)
+        return {"rejections_by_rule": dict(self.rejections),
+                "calls_by_class": dict(self.calls),
+                "rejections_by_class": dict(self.class_rejections),
+                "latency_seconds": {"samples": len(samples),
+                                    "sum": sum(samples),
+                                    "p50": samples[len(samples) // 2] if samples else None,
+                                    "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+                                    if samples else None}}
+
+    def prometheus(self, prefix="roman_numerals"):
+        """
+        Counters and latency summary, in the Prometheus text exposition format.
+
+        PARAMETERS:
+            prefix : str
+                Prefix of every metric name
+
+        RETURNS: str
+        """
+        metrics = self.as_dict()
+        lines = []
+
+        for name, labels, counters, description in (
+                ("rejections_total", "rule", metrics["rejections_by_rule"],
+                 "Roman numerals rejected by the rule-based engine, by rule"),
+                ("calls_total", "input_class", metrics["calls_by_class"], "roman_to_arabic() calls, by input class"),
+                ("call_rejections_total", "input_class", metrics["rejections_by_class"],
+                 "roman_to_arabic() calls returning -1, by input class")):
+            lines.append("# HELP %s_%s %s" % (prefix, name, description))
+            lines.append("# TYPE %s_%s counter" % (prefix, name))
+            lines.extend('%s_%s{%s="%s"} %d' % (prefix, name, labels, label, count)
+                         for label, count in sorted(counters.items()))
+
+        latency = metrics["latency_seconds"]
+        lines.append("# HELP %s_latency_seconds Sampled roman_to_arabic() latency" % prefix)
+        lines.append("# TYPE %s_latency_seconds summary" % prefix)
+        if latency["samples"]:
+            lines.append('%s_latency_seconds{quantile="0.5"} %.9f' % (prefix, latency["p50"]))
+            lines.append('%s_latency_seconds{quantile="0.99"} %.9f' % (prefix, latency["p99"]))
+        lines.append("%s_latency_seconds_sum %.9f" % (prefix, latency["sum"]))
+        lines.append("%s_latency_seconds_count %d" % (prefix, latency["samples"]))
+
+        return "\n".join(lines) + "\n"
+
+
+def enable_instrumentation(sample_every=100, max_samples=10000):
+    """
+    Starts counting rejections and sampling latency of Roman numeral conversions (see Instrumentation),
+    from zero. While disabled (the default), the only cost is a check per roman_to_arabic() call
+    and per rejection of the rule-based engine.
+
+    PARAMETERS:
+        sample_every : int
+            Number of calls per latency sample
+        max_samples : int
+            Maximum number of latency samples kept
+
+    RETURNS: Instrumentation
+    """
+    global instrumentation
+
+    instrumentation = Instrumentation(sample_every, max_samples)
+    return instrumentation
+
+
+def disable_instrumentation():
+    """
+    Stops counting rejections and sampling latency of Roman numeral conversions.
+
+    RETURNS: Instrumentation or None
+        Counters and latency samples up to now, None if instrumentation wasn't enabled
+    """
+    global instrumentation
+
+    disabled, instrumentation = instrumentation, None
+    return disabled
+
+
+def main(arguments=None):
+    """
+    Command line interface (see HOW TO RUN, at the top).
+    argparse is only imported here, keeping this module fast to import.
+
+    PARAMETERS:
+        arguments : [str, ...] or None
+            Command line arguments. None for sys.argv[1:]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Converts Roman Numerals into Arabic Numerals (and vice versa)')
+
+    parser.add_argument('type', nargs='?', choices=['roman', 'arabic', 'auto', 'text'],
+                        help='\'roman\' to convert a Roman numeral, \'arabic\' to convert an Arabic numeral, '
+                             '\'auto\' to detect it, \'text\' to replace the Roman numerals of a text')
+    parser.add_argument('numeral', nargs='?', help='Roman/Arabic numeral to be converted')
+    parser.add_argument('-i', '--input', help='file of newline-delimited numerals to be converted, '
+                                              '\'-\' for stdin (instead of numeral)')
+    parser.add_argument('-o', '--output', help='file to write the conversions to, one per line (default: stdout)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of processes converting --input, 0 for the number of CPUs (default: 1)')
+    parser.add_argument('--chunk-size', type=int, default=10000,
+                        help='number of numerals sent to a process at a time, with --jobs (default: %(default)s)')
+    parser.add_argument('--serve', metavar='HOST:PORT',
+                        help='serves conversions over HTTP/JSON instead (see RomanNumeralsServer.py)')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default=default_engine,
+                        help='conversion engine (default: %(default)s)')
+
+    arguments = parser.parse_args(arguments)
+
+    if arguments.serve is None:
+        if arguments.type is None:
+            parser.error("expected a type")
+        if (arguments.numeral is None) == (arguments.input is None):
+            parser.error("expected either a numeral or --input")
+        if arguments.type == 'text' and arguments.jobs != 1:
+            parser.error("--jobs can't be used with 'text'")
+        if arguments.jobs < 0:
+            parser.error("--jobs must be 0 (the number of CPUs) or more")
+        if arguments.chunk_size < 1:
+            parser.error("--chunk-size must be 1 or more")
+
+    if arguments.serve is not None:
+        from RomanNumeralsServer import serve
+
+        try:
+            serve(arguments.serve, arguments.engine)
+        except ValueError as error:
+            parser.error(str(error))
+
+    elif arguments.input is not None:
+        input_file = sys.stdin if arguments.input == '-' else open(arguments.input)
+        output_file = sys.stdout if arguments.output is None else open(arguments.output, 'w')
+        try:
+            if arguments.type == 'text':
+                for rewritten in replace_roman_numerals(input_file, engine=arguments.engine):
+                    output_file.write(rewritten)
+            else:
+                if arguments.jobs == 1:
+                    converted = convert_stream(read_numerals(input_file), arguments.type, arguments.engine)
+                else:
+                    converted = convert_parallel(read_numerals(input_file), arguments.type, arguments.engine,
+                                                 arguments.jobs or None, arguments.chunk_size)
+                write_lines(converted, output_file)
+        finally:
+            if input_file is not sys.stdin:
+                input_file.close()
+            if output_file is not sys.stdout:
+                output_file.close()
+
+    elif arguments.type == 'text':
+        print("".join(replace_roman_numerals(arguments.numeral, engine=arguments.engine)))
+    elif (arguments.type if arguments.type != 'auto' else detect_numeral_type(arguments.numeral)) == 'roman':
+        print("Arabic Numeral: " + str(roman_to_arabic(arguments.numeral, arguments.engine)))
+    else:
+        print("Roman Numeral: " + arabic_to_roman(arguments.numeral, arguments.engine))
+
+
+if __name__ == "__main__":
+    main()
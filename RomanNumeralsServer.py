@@ -0,0 +1,259 @@
+#!python3
+# coding: utf-8
+
+"""
+ROMAN NUMERALS CONVERTER SERVER
+Serves RomanNumeralsConverter.py conversions over HTTP/JSON, keeping the converter resident in memory
+
+DEPENDENCIES:
+    - Python 3.7+
+
+HOW TO RUN:
+    Through the command line:
+
+    RomanNumeralsServer.py HOST:PORT [--engine {digits,pairs,regex,rules,table}]
+    (or RomanNumeralsConverter.py --serve HOST:PORT [--engine {digits,pairs,regex,rules,table}])
+
+    Conversions are requested with POST /convert and a JSON body, over keep-alive connections:
+
+    - {"numeral": "XIV", "type": "roman"} converts a single numeral: {"result": 14}
+    - {"numerals": ["XIV", "14"], "type": "auto"} converts a batch of numerals: {"results": [14, "XIV"]}
+    - 'type' is either 'roman', 'arabic' or 'auto' (default), as in RomanNumeralsConverter.py
+
+    Each result is the same as roman_to_arabic() or arabic_to_roman() would return.
+    GET /health answers {"status": "ok"}. Malformed requests get a 4xx status and {"error": "..."}.
+"""
+
+import argparse
+import asyncio
+import json
+
+from RomanNumeralsConverter import ENGINES, get_engine, detect_numeral_type
+
+__author__ = 'Pedro HC David, https://github.com/Kronopt'
+__credits__ = ['Pedro HC David']
+__version__ = '1.0'
+
+
+MAX_BODY_SIZE = 1024 * 1024  # Bytes
+MAX_BATCH_SIZE = 10000  # Numerals, so that a single request can't block the event loop for long
+MAX_HEADERS = 100  # Header lines per request (each one up to the StreamReader limit, 64 KB by default)
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+def handle_request(method, path, body, engine=None):
+    """
+    Handles an HTTP request.
+
+    PARAMETERS:
+        method : str
+        path : str
+        body : bytes
+        engine : str or None
+            Name of the conversion engine, one of ENGINES. None for default_engine
+
+    RETURNS: (int, dict)
+        HTTP status and JSON response
+    """
+    if path == "/health":
+        return (200, {"status": "ok"}) if method == "GET" else (405, {"error": "expected GET"})
+    if path != "/convert":
+        return 404, {"error": "unknown path %s" % path}
+    if method != "POST":
+        return 405, {"error": "expected POST"}
+
+    try:
+        request = json.loads(body.decode("utf-8"))
+    except ValueError:
+        return 400, {"error": "body is not valid JSON"}
+    if not isinstance(request, dict):
+        return 400, {"error": "expected a JSON object"}
+
+    numeral_type = request.get("type", "auto")
+    if numeral_type not in ("roman", "arabic", "auto"):
+        return 400, {"error": "'type' must be 'roman', 'arabic' or 'auto'"}
+
+    roman_to_arabic, arabic_to_roman = get_engine(engine)
+
+    def convert(numeral):
+        if numeral_type == "roman" or (numeral_type == "auto" and detect_numeral_type(str(numeral)) == "roman"):
+            return roman_to_arabic(numeral)
+        return arabic_to_roman(numeral)
+
+    if "numeral" in request:
+        return 200, {"result": convert(request["numeral"])}
+
+    if "numerals" in request:
+        numerals = request["numerals"]
+        if not isinstance(numerals, list):
+            return 400, {"error": "'numerals' must be a list"}
+        if len(numerals) > MAX_BATCH_SIZE:
+            return 413, {"error": "at most %d numerals per request" % MAX_BATCH_SIZE}
+        return 200, {"results": [convert(numeral) for numeral in numerals]}
+
+    return 400, {"error": "expected 'numeral' or 'numerals'"}
+
+
+async def read_request_head(reader):
+    """
+    Reads the request line and headers of an HTTP request.
+
+    PARAMETERS:
+        reader : asyncio.StreamReader
+
+    RETURNS: (str, str, {str: str, ...}) or None
+        Method, path and headers (lower case names), None if the client closed the connection
+
+    RAISES:
+        ValueError if the request line or a header is malformed or too long, or if there are too many headers
+    """
+    try:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+
+        method, path, _ = request_line.decode("latin-1").split()
+
+        headers = {}
+        while True:
+            header = await reader.readline()
+            if header in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise ValueError("more than %d headers" % MAX_HEADERS)
+            name, _, value = header.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+    except asyncio.LimitOverrunError as error:  # Line longer than the StreamReader limit
+        raise ValueError(str(error))
+
+    return method, path, headers
+
+
+async def write_response(writer, status, response):
+    """
+    Writes an HTTP response with a JSON body.
+
+    PARAMETERS:
+        writer : asyncio.StreamWriter
+        status : int
+        response : dict
+    """
+    payload = json.dumps(response).encode("utf-8")
+    writer.write(b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s"
+                 % (status, REASONS[status].encode("latin-1"), len(payload), payload))
+    await writer.drain()
+
+
+async def handle_connection(reader, writer, engine=None):
+    """
+    Serves the HTTP requests of a client connection, until the client closes it or asks to.
+    Malformed requests get a 400 status, and the connection is closed.
+
+    PARAMETERS:
+        reader : asyncio.StreamReader
+        writer : asyncio.StreamWriter
+        engine : str or None
+            Name of the conversion engine, one of ENGINES. None for default_engine
+    """
+    try:
+        while True:
+            try:
+                head = await read_request_head(reader)
+                if head is None:
+                    break
+                method, path, headers = head
+                body_size = int(headers.get("content-length", 0))
+                if body_size < 0:
+                    raise ValueError("negative Content-Length")
+            except ValueError as error:
+                await write_response(writer, 400, {"error": "malformed request: %s" % error})
+                break
+
+            if body_size > MAX_BODY_SIZE:
+                await write_response(writer, 413, {"error": "body larger than %d bytes" % MAX_BODY_SIZE})
+                break  # Body is not read
+
+            body = await reader.readexactly(body_size)
+            await write_response(writer, *handle_request(method, path, body, engine))
+
+            if headers.get("connection", "").lower() == "close":
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(host, port, engine=None):
+    """
+    Starts serving conversions.
+
+    PARAMETERS:
+        host : str
+        port : int
+            0 for any free port
+        engine : str or None
+            Name of the conversion engine, one of ENGINES. None for default_engine
+
+    RETURNS: asyncio.base_events.Server
+    """
+    get_engine(engine)  # Fails early on unknown engines
+
+    async def client_connected(reader, writer):
+        await handle_connection(reader, writer, engine)
+
+    return await asyncio.start_server(client_connected, host, port)
+
+
+def parse_address(address):
+    """
+    Parses a HOST:PORT address.
+
+    PARAMETERS:
+        address : str
+
+    RETURNS: (str, int)
+
+    RAISES:
+        ValueError if address is not HOST:PORT
+    """
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError("expected HOST:PORT, got '%s'" % address)
+    return host, int(port)
+
+
+def serve(address, engine=None):
+    """
+    Serves conversions on address until interrupted.
+
+    PARAMETERS:
+        address : str
+            HOST:PORT
+        engine : str or None
+            Name of the conversion engine, one of ENGINES. None for default_engine
+    """
+    host, port = parse_address(address)
+
+    async def run():
+        server = await start_server(host, port, engine)
+        print("Serving on %s" % ", ".join("%s:%d" % socket.getsockname()[:2] for socket in server.sockets))
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serves Roman/Arabic numeral conversions over HTTP/JSON')
+
+    parser.add_argument('address', help='HOST:PORT to listen on')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default=None,
+                        help='conversion engine (default: RomanNumeralsConverter.default_engine)')
+
+    arguments = parser.parse_args()
+
+    serve(arguments.address, arguments.engine)
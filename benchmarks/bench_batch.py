@@ -0,0 +1,58 @@
+#!python3
+# coding: utf-8
+
+"""
+Benchmark of the batch conversion functions against a list comprehension over the scalar functions,
+both with the "table" engine (the default of the batch functions)
+
+HOW TO RUN:
+    python benchmarks/bench_batch.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from RomanNumeralsConverter import roman_to_arabic, arabic_to_roman, roman_to_arabic_many, arabic_to_roman_many
+
+
+def best_time(function, repeat):
+    """
+    Best of repeat runs of function, in seconds.
+
+    PARAMETERS:
+        function : callable
+        repeat : int
+
+    RETURNS: float
+    """
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmarks batch conversions against the scalar functions')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs, the best is kept (default: 5)')
+    parser = parser.parse_args()
+
+    arabic_numerals = list(range(1, 3900)) * 10
+    roman_numerals = [arabic_to_roman(arabic_numeral) for arabic_numeral in arabic_numerals]
+
+    cases = (
+        ("arabic_to_roman", len(arabic_numerals),
+         lambda: [arabic_to_roman(arabic_numeral, "table") for arabic_numeral in arabic_numerals],
+         lambda: arabic_to_roman_many(arabic_numerals, engine="table")),
+        ("roman_to_arabic", len(roman_numerals),
+         lambda: [roman_to_arabic(roman_numeral, "table") for roman_numeral in roman_numerals],
+         lambda: roman_to_arabic_many(roman_numerals, engine="table")),
+    )
+
+    arabic_to_roman_many([1])  # Build the conversion tables outside of the measurements
+
+    print("%-16s %10s %14s %14s %8s" % ("function", "numerals", "scalar (s)", "many (s)", "speedup"))
+    for name, size, scalar, many in cases:
+        scalar_time = best_time(scalar, parser.repeat)
+        many_time = best_time(many, parser.repeat)
+        print("%-16s %10d %14.4f %14.4f %7.1fx" % (name, size, scalar_time, many_time, scalar_time / many_time))
@@ -0,0 +1,85 @@
+#!python3
+# coding: utf-8
+
+"""
+Benchmark of RomanColumn against a list of Roman numerals (str): memory held by a column of N rows,
+time to write every Roman numeral out, and saving/loading it (memory-mapped or read into memory).
+
+HOW TO RUN:
+    python benchmarks/bench_column.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from RomanNumeralsConverter import RomanColumn, arabic_to_roman, conversion_tables
+
+
+def allocated(function):
+    """
+    Memory still allocated (tracemalloc) by what function returns, and what it returns.
+
+    PARAMETERS:
+        function : function
+
+    RETURNS: (int, object)
+        Bytes, result of function
+    """
+    tracemalloc.start()
+    result = function()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def best_time(function, repeat):
+    """
+    Best of repeat runs of function, in seconds.
+
+    PARAMETERS:
+        function : callable
+        repeat : int
+
+    RETURNS: float
+    """
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmarks RomanColumn against a list of Roman numerals')
+    parser.add_argument('--rows', type=int, default=1000000, help='number of rows (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs, the best is kept (default: 3)')
+    arguments = parser.parse_args()
+
+    conversion_tables()  # Shared by both, not counted
+    arabic_numerals = [i % 3899 + 1 for i in range(arguments.rows)]
+
+    # One str per row, as read from a file
+    list_size, roman_numerals = allocated(lambda: [(arabic_to_roman(value, "table") + "\n")[:-1]
+                                                   for value in arabic_numerals])
+    column_size, column = allocated(lambda: RomanColumn(arabic_numerals))
+    print("%d rows" % arguments.rows)
+    print("list of str:          %8.1f MB" % (list_size / 1e6))
+    print("RomanColumn:          %8.1f MB" % (column_size / 1e6))
+
+    print("iterate list:         %8.1f ms" % (best_time(lambda: list(roman_numerals), arguments.repeat) * 1000))
+    print("iterate RomanColumn:  %8.1f ms" % (best_time(lambda: list(column), arguments.repeat) * 1000))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "column.rmn")
+        print("save:                 %8.1f ms (%d bytes)" % (best_time(lambda: column.save(path), arguments.repeat)
+                                                             * 1000, os.path.getsize(path)))
+        print("load (read):          %8.1f ms" % (best_time(lambda: RomanColumn.load(path, mmap=False),
+                                                            arguments.repeat) * 1000))
+
+        mapped_size, mapped = allocated(lambda: RomanColumn.load(path))
+        print("load (mmap):          %8.1f ms, %.1f kB allocated" % (
+            best_time(lambda: RomanColumn.load(path).close(), arguments.repeat) * 1000, mapped_size / 1e3))
+        print("iterate mmap column:  %8.1f ms" % (best_time(lambda: list(mapped), arguments.repeat) * 1000))
+        mapped.close()
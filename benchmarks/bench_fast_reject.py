@@ -0,0 +1,111 @@
+#!python3
+# coding: utf-8
+
+"""
+Benchmark of the fast reject of oversized numerals: per-call latency (p99 and median) of every engine and of the other
+conversion functions on inputs from 10 B to 100 MB. It should stay flat, as they are rejected on their length alone,
+unlike str.upper() (shown for reference), which every Roman numeral used to go through first.
+Roman numerals are all "M" (valid characters, so nothing but their length rejects them),
+Arabic numerals all "1" (valid digits, past int()'s digit limit from 4300 on), also given as bytes (b"1" ...)
+and as lists ([1, ...], of 8 B pointers), which str() would write out before any check.
+
+HOW TO RUN:
+    python benchmarks/bench_fast_reject.py [--max-size N] [--calls N] [--max-ratio RATIO]
+
+    - '--max-ratio' exits with status 1 when the p99 latency of any function on the largest input
+      is more than RATIO times its p99 latency on the smallest one
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from RomanNumeralsConverter import (ENGINES, conversion_tables, bytes_conversion_table, roman_to_arabic_diagnostic,
+                                    arabic_to_roman_diagnostic, roman_to_arabic_lenient, roman_to_arabic_bytes)
+
+
+def functions():
+    """
+    Conversion functions, with the kind of input they take.
+
+    RETURNS: [(str, function, str), ...]
+        Name, function and 'roman', 'arabic', 'arabic bytes', 'arabic list' or 'bytes'
+    """
+    return ([("roman_to_arabic/%s" % engine, roman_to_arabic_, "roman")
+             for engine, (roman_to_arabic_, _) in sorted(ENGINES.items())] +
+            [("arabic_to_roman/%s" % engine, arabic_to_roman_, "arabic")
+             for engine, (_, arabic_to_roman_) in sorted(ENGINES.items())] +
+            [("arabic_to_roman/%s, %s" % (engine, kind), arabic_to_roman_, "arabic " + kind)
+             for kind in ("bytes", "list") for engine, (_, arabic_to_roman_) in sorted(ENGINES.items())] +
+            [("roman_to_arabic_diagnostic", roman_to_arabic_diagnostic, "roman"),
+             ("arabic_to_roman_diagnostic", arabic_to_roman_diagnostic, "arabic"),
+             ("arabic_to_roman_diagnostic, bytes", arabic_to_roman_diagnostic, "arabic bytes"),
+             ("arabic_to_roman_diagnostic, list", arabic_to_roman_diagnostic, "arabic list"),
+             ("roman_to_arabic_lenient", roman_to_arabic_lenient, "roman"),
+             ("roman_to_arabic_bytes", roman_to_arabic_bytes, "bytes")])
+
+
+def latency(function, numeral, calls):
+    """
+    p99 and median latency of calls to function(numeral).
+
+    PARAMETERS:
+        function : function
+        numeral : str, bytes or list
+        calls : int
+
+    RETURNS: (float, float)
+        p99 and median latency, in seconds
+    """
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        function(numeral)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], latencies[len(latencies) // 2]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmarks the fast reject of oversized numerals')
+    parser.add_argument('--max-size', type=int, default=100 * 1000 * 1000,
+                        help='largest input, in characters (default: %(default)s)')
+    parser.add_argument('--calls', type=int, default=1000, help='calls per function and size (default: %(default)s)')
+    parser.add_argument('--max-ratio', type=float, default=None,
+                        help='exits with status 1 above this ratio of p99 latencies (largest / smallest input)')
+    arguments = parser.parse_args()
+
+    conversion_tables()  # Built once, not counted
+    bytes_conversion_table()
+    for _, function, kind in functions():  # Anything else built on first use (regex, error codes)
+        function({"roman": "XIV", "arabic": "14", "arabic bytes": b"14", "arabic list": [14], "bytes": b"XIV"}[kind])
+
+    sizes = [10 ** exponent for exponent in range(1, 9, 2) if 10 ** exponent < arguments.max_size]
+    sizes.append(arguments.max_size)
+
+    print("%-36s %s" % ("p99 (median) latency, us", " ".join("%18s" % ("%d B" % size) for size in sizes)))
+    results = {name: [] for name, _, _ in functions()}
+    upper = []
+    for size in sizes:
+        numerals = {"roman": "M" * size, "arabic": "1" * size, "arabic bytes": b"1" * size,
+                    "arabic list": [1] * max(1, size // 8), "bytes": b"M" * size}
+        for name, function, kind in functions():
+            results[name].append(latency(function, numerals[kind], arguments.calls))
+        upper.append(latency(str.upper, numerals["roman"], max(1, min(arguments.calls, 10 ** 8 // size))))
+        del numerals
+
+    ratios = {}
+    for name, latencies in results.items():
+        print("%-36s %s" % (name, " ".join("%18s" % ("%.1f (%.1f)" % (p99 * 1e6, median * 1e6))
+                                            for p99, median in latencies)))
+        ratios[name] = latencies[-1][0] / latencies[0][0]
+    print("%-36s %s" % ("(str.upper(), for reference)", " ".join("%18s" % ("%.1f (%.1f)" % (p99 * 1e6, median * 1e6))
+                                                                  for p99, median in upper)))
+
+    name = max(ratios, key=ratios.get)
+    print("\nlargest ratio of p99 latencies (%d B / %d B): %.1fx (%s)" % (sizes[-1], sizes[0], ratios[name], name))
+    if arguments.max_ratio is not None and ratios[name] > arguments.max_ratio:
+        sys.exit(1)
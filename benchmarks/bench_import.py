@@ -0,0 +1,70 @@
+#!python3
+# coding: utf-8
+
+"""
+Benchmark of the import time of RomanNumeralsConverter.py, through 'python -X importtime', in a fresh interpreter.
+Also checks that importing it as a library doesn't load the CLI's argparse.
+
+HOW TO RUN:
+    python benchmarks/bench_import.py [--repeat N] [--max-ms MS]
+
+    - '--max-ms' exits with status 1 when the best import time is above MS milliseconds
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHECK_MODULES = "import sys; import RomanNumeralsConverter; print(' '.join(sorted(set(sys.modules) & {%s})))" % \
+    ", ".join(repr(module) for module in ("argparse", "re", "numpy", "pandas", "multiprocessing", "asyncio"))
+
+
+def import_time():
+    """
+    Cumulative import time of RomanNumeralsConverter, as reported by -X importtime in a fresh interpreter.
+
+    RETURNS: float
+        Milliseconds
+    """
+    environment = dict(os.environ)
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)  # Bytecode is cached, as in any installed library
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", "import RomanNumeralsConverter"],
+                             cwd=ROOT, env=environment, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+
+    for line in process.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == "RomanNumeralsConverter":
+            return int(fields[1]) / 1000.0
+    raise RuntimeError("RomanNumeralsConverter not found in -X importtime output")
+
+
+def loaded_modules():
+    """
+    Heavy modules loaded by importing RomanNumeralsConverter, in a fresh interpreter.
+
+    RETURNS: [str, ...]
+    """
+    process = subprocess.run([sys.executable, "-c", CHECK_MODULES], cwd=ROOT, stdout=subprocess.PIPE,
+                             universal_newlines=True, check=True)
+    return process.stdout.split()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmarks the import time of RomanNumeralsConverter.py')
+    parser.add_argument('--repeat', type=int, default=10, help='number of imports, the best is kept (default: 10)')
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='exits with status 1 above this import time, in milliseconds')
+    arguments = parser.parse_args()
+
+    import_time()  # Warm-up, writes the bytecode cache
+    best = min(import_time() for _ in range(arguments.repeat))
+    modules = loaded_modules()
+
+    print("import RomanNumeralsConverter: %.2f ms (best of %d)" % (best, arguments.repeat))
+    print("heavy modules loaded on import: %s" % (", ".join(modules) or "none"))
+
+    if modules or (arguments.max_ms is not None and best > arguments.max_ms):
+        sys.exit(1)
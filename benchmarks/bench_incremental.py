@@ -0,0 +1,94 @@
+#!python3
+# coding: utf-8
+
+"""
+Benchmark of IncrementalRomanParser against calling roman_to_arabic() again on each growing prefix,
+for Roman numerals received one character at a time: time per character, by length of the numeral
+(every Roman numeral of that length), which only grows with it for roman_to_arabic().
+
+HOW TO RUN:
+    python benchmarks/bench_incremental.py [--repeat N] [--engine ENGINE]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from RomanNumeralsConverter import ENGINES, IncrementalRomanParser, arabic_to_roman, roman_to_arabic
+
+
+def prefixes(roman_numerals, engine):
+    """
+    Value of each numeral, converting each of its prefixes in turn.
+
+    PARAMETERS:
+        roman_numerals : [str, ...]
+        engine : str
+
+    RETURNS: [int, ...]
+    """
+    values = []
+    for roman_numeral in roman_numerals:
+        for end in range(1, len(roman_numeral) + 1):
+            value = roman_to_arabic(roman_numeral[:end], engine)
+        values.append(value)
+    return values
+
+
+def incremental(roman_numerals):
+    """
+    Value of each numeral, feeding its characters to an IncrementalRomanParser.
+
+    PARAMETERS:
+        roman_numerals : [str, ...]
+
+    RETURNS: [int, ...]
+    """
+    values = []
+    parser = IncrementalRomanParser()
+    for roman_numeral in roman_numerals:
+        parser.reset()
+        for char in roman_numeral:
+            parser.feed(char)
+        values.append(parser.value)
+    return values
+
+
+def per_char(function, roman_numerals, repeat):
+    """
+    Best of repeat runs of function over roman_numerals, per character, in seconds.
+
+    PARAMETERS:
+        function : function
+        roman_numerals : [str, ...]
+        repeat : int
+
+    RETURNS: float
+    """
+    return min(timeit.repeat(lambda: function(roman_numerals), number=1, repeat=repeat)) / \
+        sum(len(roman_numeral) for roman_numeral in roman_numerals)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmarks IncrementalRomanParser against converting each prefix')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs, the best is kept (default: 5)')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='rules',
+                        help='engine converting each prefix (default: %(default)s)')
+    arguments = parser.parse_args()
+
+    by_length = {}
+    for arabic_numeral in range(1, 3900):
+        roman_numeral = arabic_to_roman(arabic_numeral)
+        by_length.setdefault(len(roman_numeral), []).append(roman_numeral)
+
+    print("%-8s %10s %28s %26s" % ("length", "numerals", "prefixes (%s), per char" % arguments.engine,
+                                   "incremental, per char"))
+    for length, roman_numerals in sorted(by_length.items()):
+        assert incremental(roman_numerals) == prefixes(roman_numerals, arguments.engine)
+        baseline = per_char(lambda numerals: prefixes(numerals, arguments.engine), roman_numerals, arguments.repeat)
+        elapsed = per_char(incremental, roman_numerals, arguments.repeat)
+        print("%-8d %10d %25.0f ns %15.0f ns (%.1fx)" % (length, len(roman_numerals), baseline * 1e9, elapsed * 1e9,
+                                                         baseline / elapsed))
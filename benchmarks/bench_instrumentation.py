@@ -0,0 +1,86 @@
+#!python3
+# coding: utf-8
+
+"""
+Benchmark of the cost of instrumentation (see enable_instrumentation()) on roman_to_arabic(), disabled and enabled,
+against the same dispatch to the engine without any instrumentation check (reference).
+Valid and invalid Roman numerals are measured apart, as rejections of the rule-based engine are counted separately.
+
+HOW TO RUN:
+    python benchmarks/bench_instrumentation.py [--repeat N] [--max-overhead RATIO]
+
+    - '--max-overhead' exits with status 1 when disabled instrumentation makes roman_to_arabic() slower than
+      the reference by more than RATIO (default: 0.1, i.e. 10%)
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from RomanNumeralsConverter import (roman_to_arabic, arabic_to_roman, get_engine, enable_instrumentation,
+                                    disable_instrumentation)
+
+
+def reference(roman_numeral, engine=None):
+    """
+    roman_to_arabic(), without the instrumentation check.
+    """
+    return get_engine(engine)[0](roman_numeral)
+
+
+def best_times(functions, numerals, repeat):
+    """
+    Best of repeat runs of each function over numerals, in seconds per call.
+    Runs of the functions are interleaved, so that they all see the same machine load.
+
+    PARAMETERS:
+        functions : [function, ...]
+        numerals : [str, ...]
+        repeat : int
+
+    RETURNS: [float, ...]
+    """
+    times = [float("inf")] * len(functions)
+    for _ in range(repeat):
+        for i, function in enumerate(functions):
+            times[i] = min(times[i], timeit.timeit(lambda: [function(numeral) for numeral in numerals], number=1))
+    return [best / len(numerals) for best in times]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmarks the cost of instrumentation on roman_to_arabic()')
+    parser.add_argument('--repeat', type=int, default=20, help='number of runs, the best is kept (default: 20)')
+    parser.add_argument('--max-overhead', type=float, default=0.1,
+                        help='maximum slowdown of disabled instrumentation (default: %(default)s)')
+    arguments = parser.parse_args()
+
+    random.seed(0)
+    valid = [arabic_to_roman(arabic_numeral) for arabic_numeral in range(1, 3900)]
+    invalid = ["".join(random.choice("IVXLCDM") for _ in range(random.randint(2, 8))) for _ in range(3899)]
+    invalid = [roman_numeral for roman_numeral in invalid if roman_to_arabic(roman_numeral) < 0]
+
+    failed = False
+    print("%-18s %12s %12s %12s %10s" % ("case", "reference", "disabled", "enabled", "overhead"))
+    for engine in ("rules", "table"):
+        for name, numerals in (("valid", valid), ("invalid", invalid)):
+            uninstrumented = lambda numeral, e=engine: reference(numeral, e)
+            instrumented = lambda numeral, e=engine: roman_to_arabic(numeral, e)
+
+            disable_instrumentation()
+            reference_time, disabled_time = best_times([uninstrumented, instrumented], numerals, arguments.repeat)
+            enable_instrumentation()
+            enabled_time, = best_times([instrumented], numerals, arguments.repeat)
+            disable_instrumentation()
+
+            overhead = disabled_time / reference_time - 1
+            failed = failed or overhead > arguments.max_overhead
+            print("%-18s %9.0f ns %9.0f ns %9.0f ns %+9.1f%%" % ("%s/%s" % (engine, name), reference_time * 1e9,
+                                                                 disabled_time * 1e9, enabled_time * 1e9,
+                                                                 overhead * 100))
+
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,80 @@
+#!python3
+# coding: utf-8
+
+"""
+Benchmark of the pair-table engine (roman_to_arabic_pairs()) against roman_to_arabic() with its default engine
+('rules') and the other engines, per Roman numeral, on valid inputs (every Roman numeral, upper and lower case)
+and invalid ones (random strings of Roman numeral characters, digits and noise, and Roman numerals with a character
+inserted, removed or replaced).
+
+HOW TO RUN:
+    python benchmarks/bench_pairs.py [--repeat N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from RomanNumeralsConverter import ENGINES, arabic_to_roman, roman_to_arabic, roman_to_arabic_pairs, pair_tables
+
+
+def inputs():
+    """
+    Valid and invalid Roman numerals.
+
+    RETURNS: {str: [str, ...]}
+    """
+    random.seed(0)
+
+    roman_numerals = [arabic_to_roman(arabic_numeral) for arabic_numeral in range(1, 3900)]
+    mutated = []
+    for roman_numeral in roman_numerals:
+        position = random.randrange(len(roman_numeral))
+        mutated.append(random.choice((roman_numeral[:position] + random.choice("IVXLCDM") + roman_numeral[position:],
+                                      roman_numeral[:position] + roman_numeral[position + 1:],
+                                      roman_numeral[:position] + random.choice("IVXLCDM") +
+                                      roman_numeral[position + 1:])))
+
+    return {"valid": roman_numerals,
+            "valid, lower case": [roman_numeral.lower() for roman_numeral in roman_numerals],
+            "invalid, garbage": ["".join(random.choice("IVXLCDMivxlcdm0123456789 #")
+                                         for _ in range(random.randint(1, 14))) for _ in range(3899)],
+            "invalid, mutated": [roman_numeral for roman_numeral in mutated if roman_to_arabic(roman_numeral) == -1]}
+
+
+def per_numeral(function, numerals, repeat):
+    """
+    Best of repeat runs of function over numerals, per numeral, in seconds.
+
+    PARAMETERS:
+        function : function
+        numerals : [str, ...]
+        repeat : int
+
+    RETURNS: float
+    """
+    return min(timeit.repeat(lambda: [function(numeral) for numeral in numerals], number=1, repeat=repeat)) / \
+        len(numerals)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmarks the pair-table engine against roman_to_arabic()')
+    parser.add_argument('--repeat', type=int, default=10, help='number of runs, the best is kept (default: 10)')
+    arguments = parser.parse_args()
+
+    pair_tables()  # Built once, not counted
+    functions = [("roman_to_arabic()", roman_to_arabic)] + [
+        ("engine %s" % engine, roman_to_arabic_) for engine, (roman_to_arabic_, _) in sorted(ENGINES.items())]
+
+    for name, numerals in inputs().items():
+        assert [roman_to_arabic_pairs(numeral) for numeral in numerals] == [roman_to_arabic(numeral)
+                                                                            for numeral in numerals]
+        baseline = per_numeral(roman_to_arabic, numerals, arguments.repeat)
+        print("%s (%d numerals), per numeral:" % (name, len(numerals)))
+        for function_name, function in functions:
+            elapsed = per_numeral(function, numerals, arguments.repeat)
+            print("    %-24s %8.0f ns (%.1fx)" % (function_name, elapsed * 1e9, baseline / elapsed))
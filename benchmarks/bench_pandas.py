@@ -0,0 +1,67 @@
+#!python3
+# coding: utf-8
+
+"""
+Benchmark of the pandas Series accessor (series.roman) against series.map(roman_to_arabic) and
+series.map(arabic_to_roman), on a column of N rows holding few (low cardinality) or every (high cardinality) numeral.
+Copying the column (series.copy()) is shown for reference.
+Requires pandas.
+
+HOW TO RUN:
+    python benchmarks/bench_pandas.py [--rows N] [--unique N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import pandas
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from RomanNumeralsConverter import arabic_to_roman, roman_to_arabic, conversion_tables, register_pandas_accessor
+
+
+def best_time(function, repeat):
+    """
+    Best of repeat runs of function, in seconds.
+
+    PARAMETERS:
+        function : callable
+        repeat : int
+
+    RETURNS: float
+    """
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmarks the pandas Series accessor against Series.map()')
+    parser.add_argument('--rows', type=int, default=1000000, help='number of rows (default: %(default)s)')
+    parser.add_argument('--unique', type=int, default=100,
+                        help='distinct numerals of the low cardinality column (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs, the best is kept (default: 3)')
+    arguments = parser.parse_args()
+
+    register_pandas_accessor()
+    conversion_tables()  # Shared by all, not counted
+
+    for cardinality in (arguments.unique, 3899):
+        arabic_numerals = pandas.Series([i * 7919 % cardinality + 1 for i in range(arguments.rows)])
+        roman_numerals = pandas.Series([arabic_to_roman(arabic_numeral) for arabic_numeral in arabic_numerals])
+        assert roman_numerals.roman.to_arabic().equals(roman_numerals.map(roman_to_arabic))
+        assert arabic_numerals.roman.to_roman().tolist() == roman_numerals.tolist()
+
+        print("%d rows, %d distinct numerals" % (arguments.rows, cardinality))
+        print("%-40s %8.1f ms" % ("(series.copy(), for reference)",
+                                  best_time(roman_numerals.copy, arguments.repeat) * 1000))
+        for name, baseline, function in (
+                ("to_arabic", lambda: roman_numerals.map(roman_to_arabic), roman_numerals.roman.to_arabic),
+                ("to_roman", lambda: arabic_numerals.map(arabic_to_roman), arabic_numerals.roman.to_roman),
+                ("is_valid", lambda: roman_numerals.map(roman_to_arabic) != -1, roman_numerals.roman.is_valid)):
+            baseline_time = best_time(baseline, arguments.repeat)
+            elapsed = best_time(function, arguments.repeat)
+            print("%-40s %8.1f ms" % ("series.map() (%s)" % name, baseline_time * 1000))
+            print("%-40s %8.1f ms (%.1fx)" % ("series.roman.%s()" % name, elapsed * 1000, baseline_time / elapsed))
+        print("")
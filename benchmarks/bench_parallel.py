@@ -0,0 +1,61 @@
+#!python3
+# coding: utf-8
+
+"""
+Benchmark of the parallel conversion against the single process one, for growing numbers of numerals.
+Reports the crossover point: the smallest number of numerals for which the parallel conversion is faster.
+
+HOW TO RUN:
+    python benchmarks/bench_parallel.py [--jobs N] [--chunk-size N] [--engine ENGINE] [--max-size N] [--shared-table]
+
+    - '--shared-table' publishes the table of Roman numerals once in shared memory, for the workers to attach to
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from RomanNumeralsConverter import ENGINES, convert_stream, convert_parallel
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmarks parallel conversions against single process ones')
+    parser.add_argument('--jobs', type=int, default=multiprocessing.cpu_count(),
+                        help='number of worker processes (default: number of CPUs, %(default)s)')
+    parser.add_argument('--chunk-size', type=int, default=10000,
+                        help='number of numerals sent to a worker at a time (default: %(default)s)')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='table',
+                        help='conversion engine (default: %(default)s)')
+    parser.add_argument('--max-size', type=int, default=1000000,
+                        help='largest number of numerals converted (default: %(default)s)')
+    parser.add_argument('--shared-table', action='store_true',
+                        help='workers attach to a shared table instead of building their own (Python 3.8+)')
+    arguments = parser.parse_args()
+
+    print("%-10s %14s %14s %8s" % ("numerals", "single (s)", "parallel (s)", "speedup"))
+
+    crossover = None
+    size = 1000
+    while size <= arguments.max_size:
+        numerals = [str(arabic_numeral % 3899 + 1) for arabic_numeral in range(size)]
+
+        single_time = min(timeit.repeat(lambda: list(convert_stream(numerals, "auto", arguments.engine)),
+                                        number=1, repeat=3))
+        parallel_time = min(timeit.repeat(lambda: list(convert_parallel(numerals, "auto", arguments.engine,
+                                                                        arguments.jobs, arguments.chunk_size,
+                                                                        arguments.shared_table)),
+                                          number=1, repeat=3))
+        print("%-10d %14.4f %14.4f %7.2fx" % (size, single_time, parallel_time, single_time / parallel_time))
+
+        if crossover is None and parallel_time < single_time:
+            crossover = size
+        size *= 10
+
+    if crossover is None:
+        print("\nNo crossover up to %d numerals with %d jobs" % (arguments.max_size, arguments.jobs))
+    else:
+        print("\nCrossover at about %d numerals with %d jobs" % (crossover, arguments.jobs))
@@ -0,0 +1,92 @@
+#!python3
+# coding: utf-8
+
+"""
+Benchmark of arithmetic on Roman numerals: the Roman type against converting the operands, computing and converting
+the result back (arabic_to_roman(roman_to_arabic(a) + roman_to_arabic(b))), for pairs of Roman numerals,
+with the results written out (str()) or not.
+
+HOW TO RUN:
+    python benchmarks/bench_roman_type.py [--pairs N] [--repeat N] [--engine ENGINE]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from RomanNumeralsConverter import ENGINES, Roman, arabic_to_roman, roman_to_arabic, conversion_tables
+
+
+def round_trip(pairs, engine):
+    """
+    a + b for every pair of Roman numerals, converting them to int and the result back.
+
+    PARAMETERS:
+        pairs : [(str, str), ...]
+        engine : str
+
+    RETURNS: [str, ...]
+    """
+    return [arabic_to_roman(roman_to_arabic(a, engine) + roman_to_arabic(b, engine), engine)
+            for a, b in pairs]
+
+
+def roman_arithmetic(pairs):
+    """
+    a + b for every pair of Roman.
+
+    PARAMETERS:
+        pairs : [(Roman, Roman), ...]
+
+    RETURNS: [Roman, ...]
+    """
+    return [a + b for a, b in pairs]
+
+
+def roman_arithmetic_shown(pairs):
+    """
+    a + b for every pair of Roman, written out.
+
+    PARAMETERS:
+        pairs : [(Roman, Roman), ...]
+
+    RETURNS: [str, ...]
+    """
+    return [str(a + b) for a, b in pairs]
+
+
+def best_time(function, repeat):
+    """
+    Best of repeat runs of function, in seconds.
+
+    PARAMETERS:
+        function : callable
+        repeat : int
+
+    RETURNS: float
+    """
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmarks the Roman type against converting back and forth')
+    parser.add_argument('--pairs', type=int, default=100000, help='pairs of Roman numerals (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs, the best is kept (default: 5)')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='table',
+                        help='engine of the round trip (default: %(default)s)')
+    arguments = parser.parse_args()
+
+    conversion_tables()  # Shared by both, not counted
+    pairs = [(arabic_to_roman(i % 1000 + 1), arabic_to_roman(i * 7 % 1000 + 1)) for i in range(arguments.pairs)]
+    roman_pairs = [(Roman(a), Roman(b)) for a, b in pairs]
+    assert roman_arithmetic_shown(roman_pairs) == round_trip(pairs, arguments.engine)
+
+    baseline = best_time(lambda: round_trip(pairs, arguments.engine), arguments.repeat)
+    print("%d pairs, a + b" % arguments.pairs)
+    print("round trip (%s):%s %8.1f ms" % (arguments.engine, " " * (16 - len(arguments.engine)), baseline * 1000))
+    for name, function in (("Roman:", roman_arithmetic), ("Roman, written out:", roman_arithmetic_shown)):
+        elapsed = best_time(lambda: function(roman_pairs), arguments.repeat)
+        print("%-29s %8.1f ms (%.1fx)" % (name, elapsed * 1000, baseline / elapsed))
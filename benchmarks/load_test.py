@@ -0,0 +1,160 @@
+#!python3
+# coding: utf-8
+
+"""
+Load test of a local conversion server (RomanNumeralsServer.py), with many concurrent keep-alive clients.
+Reports requests/sec, numerals/sec and p50/p99 request latency, and checks every result against the converter.
+
+HOW TO RUN:
+    python benchmarks/load_test.py HOST:PORT [--spawn] [--clients N] [--requests N] [--batch N] [--engine ENGINE]
+
+    - '--spawn' starts the server on HOST:PORT first (and stops it at the end)
+    - '--clients' is the number of concurrent connections (default: 50)
+    - '--requests' is the number of requests sent by each client (default: 200)
+    - '--batch' is the number of numerals per request, 1 for single conversions (default: 1)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from RomanNumeralsConverter import ENGINES, roman_to_arabic, arabic_to_roman
+from RomanNumeralsServer import parse_address
+
+
+async def client(host, port, requests, batch, latencies):
+    """
+    Sends requests over a single keep-alive connection, checking every result.
+
+    PARAMETERS:
+        host : str
+        port : int
+        requests : int
+        batch : int
+            Number of numerals per request, 1 for single conversions
+        latencies : [float, ...]
+            Latency of each request, in seconds, appended to
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+
+    try:
+        for request in range(requests):
+            arabic_numerals = [(request * batch + i) % 3899 + 1 for i in range(batch)]
+            if batch == 1:
+                body = {"numeral": arabic_numerals[0], "type": "arabic"}
+            else:
+                body = {"numerals": [arabic_to_roman(numeral) for numeral in arabic_numerals], "type": "roman"}
+            body = json.dumps(body).encode("utf-8")
+
+            start = time.perf_counter()
+            writer.write(b"POST /convert HTTP/1.1\r\nHost: %s\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: %d\r\n\r\n%s" % (host.encode("latin-1"), len(body), body))
+            await writer.drain()
+
+            status_line = await reader.readline()
+            content_length = 0
+            while True:
+                header = await reader.readline()
+                if header in (b"\r\n", b""):
+                    break
+                name, _, value = header.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    content_length = int(value)
+            response = json.loads((await reader.readexactly(content_length)).decode("utf-8"))
+            latencies.append(time.perf_counter() - start)
+
+            if not status_line.startswith(b"HTTP/1.1 200"):
+                raise AssertionError("unexpected response %r: %r" % (status_line, response))
+            if batch == 1:
+                assert response["result"] == arabic_to_roman(arabic_numerals[0]), response
+            else:
+                assert response["results"] == [roman_to_arabic(arabic_to_roman(numeral))
+                                               for numeral in arabic_numerals], response
+    finally:
+        writer.close()
+
+
+async def load_test(host, port, clients, requests, batch):
+    """
+    Runs clients concurrently.
+
+    PARAMETERS:
+        host : str
+        port : int
+        clients : int
+        requests : int
+            Number of requests per client
+        batch : int
+            Number of numerals per request
+
+    RETURNS: (float, [float, ...])
+        Total time and sorted request latencies, in seconds
+    """
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, requests, batch, latencies) for _ in range(clients)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+async def wait_for_server(host, port, timeout=10):
+    """
+    Waits until the server accepts connections.
+
+    PARAMETERS:
+        host : str
+        port : int
+        timeout : float
+            Seconds
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Load tests a local conversion server')
+    parser.add_argument('address', help='HOST:PORT of the server')
+    parser.add_argument('--spawn', action='store_true', help='starts the server first')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='table',
+                        help='conversion engine of the spawned server (default: %(default)s)')
+    parser.add_argument('--clients', type=int, default=50, help='concurrent connections (default: %(default)s)')
+    parser.add_argument('--requests', type=int, default=200, help='requests per client (default: %(default)s)')
+    parser.add_argument('--batch', type=int, default=1, help='numerals per request (default: %(default)s)')
+    arguments = parser.parse_args()
+
+    host, port = parse_address(arguments.address)
+
+    server = None
+    if arguments.spawn:
+        server = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__))), "RomanNumeralsServer.py"), arguments.address, "--engine", arguments.engine],
+            stdout=subprocess.DEVNULL)
+    try:
+        asyncio.run(wait_for_server(host, port))
+        elapsed, latencies = asyncio.run(load_test(host, port, arguments.clients, arguments.requests,
+                                                   arguments.batch))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    total_requests = len(latencies)
+    print("%d clients x %d requests x %d numerals in %.2f s" % (arguments.clients, arguments.requests,
+                                                                 arguments.batch, elapsed))
+    print("%.0f requests/sec, %.0f numerals/sec" % (total_requests / elapsed,
+                                                    total_requests * arguments.batch / elapsed))
+    print("latency p50 %.2f ms, p99 %.2f ms" % (latencies[total_requests // 2] * 1000,
+                                                latencies[min(total_requests - 1, int(total_requests * 0.99))] * 1000))
@@ -0,0 +1,236 @@
+#!python3
+# coding: utf-8
+
+"""
+Benchmark suite of the conversion hot paths, for every engine.
+Measures throughput (ops/sec), per-call latency (p50/p99, in microseconds) and peak memory (tracemalloc),
+emitted as JSON. A run can be compared against a saved baseline, failing when any case regresses.
+
+HOW TO RUN:
+    python benchmarks/suite.py [--output FILE] [--baseline FILE] [--threshold RATIO] [--filter TEXT] [--rounds N]
+
+    - '--output' saves the results as JSON (default: stdout)
+    - '--baseline' compares the results against a previously saved run,
+      exiting with status 1 if any case lost more than '--threshold' of its ops/sec (default: 0.1, i.e. 10%)
+    - '--filter' only runs the cases whose name contains TEXT
+    - '--rounds' sets how many times each case goes over its inputs (default: 3)
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from RomanNumeralsConverter import (ENGINES, roman_to_arabic, arabic_to_roman, roman_to_arabic_many,
+                                    arabic_to_roman_many, roman_to_arabic_bytes, roman_to_arabic_buffer,
+                                    roman_to_arabic_diagnostic, arabic_to_roman_diagnostic, roman_to_arabic_lenient,
+                                    read_numerals, convert_stream, write_lines, replace_roman_numerals,
+                                    roman_sort_key, RomanIndex)
+
+timer = time.perf_counter
+
+
+class NullOutput:
+    """
+    File discarding everything written to it.
+    """
+    def write(self, string):
+        pass
+
+
+def cases():
+    """
+    Benchmark cases.
+
+    RETURNS: [(str, function, [object, ...], int), ...]
+        Name, function called once per input, inputs and number of operations per call
+    """
+    random.seed(0)
+
+    arabic_numerals = list(range(1, 3900))
+    roman_numerals = [arabic_to_roman(arabic_numeral) for arabic_numeral in arabic_numerals]
+    lower_case = [roman_numeral.lower() for roman_numeral in roman_numerals]
+    garbage = ["".join(random.choice("IVXLCDMivxlcdm0123456789 #") for _ in range(random.randint(1, 14)))
+               for _ in range(3899)]
+    long_strings = ["MCMXCIX" * 10 ** random.randint(1, 4) for _ in range(100)]
+    invalid_arabic = [random.choice((0, -1, 3900, 10 ** 10, "0012", "12a", "", 1.5)) for _ in range(3899)]
+
+    benchmark_cases = []
+    for engine in sorted(ENGINES):
+        benchmark_cases.extend((
+            ("roman_to_arabic/%s/valid" % engine, lambda numeral, e=engine: roman_to_arabic(numeral, e),
+             roman_numerals, 1),
+            ("roman_to_arabic/%s/lower_case" % engine, lambda numeral, e=engine: roman_to_arabic(numeral, e),
+             lower_case, 1),
+            ("roman_to_arabic/%s/garbage" % engine, lambda numeral, e=engine: roman_to_arabic(numeral, e),
+             garbage, 1),
+            ("roman_to_arabic/%s/long_strings" % engine, lambda numeral, e=engine: roman_to_arabic(numeral, e),
+             long_strings, 1),
+            ("arabic_to_roman/%s/valid" % engine, lambda numeral, e=engine: arabic_to_roman(numeral, e),
+             arabic_numerals, 1),
+            ("arabic_to_roman/%s/invalid" % engine, lambda numeral, e=engine: arabic_to_roman(numeral, e),
+             invalid_arabic, 1),
+        ))
+
+    batch_size = 1000
+    roman_batches = [roman_numerals[i:i + batch_size] for i in range(0, len(roman_numerals), batch_size)]
+    arabic_batches = [arabic_numerals[i:i + batch_size] for i in range(0, len(arabic_numerals), batch_size)]
+    stream_lines = ["%s\n" % numeral for numeral in roman_numerals + arabic_numerals]
+    stream_batches = [stream_lines[i:i + batch_size] for i in range(0, len(stream_lines), batch_size)]
+    prose_lines = ["Chapter %s: in which Louis %s meets %s of the %d guests.\n"
+                   % (roman_numeral, roman_numeral.lower(), numeral, i) for i, (roman_numeral, numeral)
+                   in enumerate(zip(roman_numerals, garbage))]
+    prose_batches = [prose_lines[i:i + batch_size] for i in range(0, len(prose_lines), batch_size)]
+
+    additive = [roman_numeral.replace("CM", "DCCCC").replace("CD", "CCCC").replace("XC", "LXXXX").replace(
+        "XL", "XXXX").replace("IX", "VIIII").replace("IV", "IIII") for roman_numeral in roman_numerals]
+    roman_bytes = [roman_numeral.encode("ascii") for roman_numeral in roman_numerals]
+    shuffled = random.sample(roman_numerals, len(roman_numerals))
+    shuffled_batches = [shuffled[i:i + batch_size] for i in range(0, len(shuffled), batch_size)]
+    roman_index = RomanIndex(shuffled)
+    range_bounds = [(roman_numerals[value], roman_numerals[value + 20]) for value in random.sample(range(3879), 1000)]
+    lower_case_bytes = [roman_numeral.encode("ascii") for roman_numeral in lower_case]
+    roman_buffers = [b"\n".join(roman_bytes[i:i + batch_size]) for i in range(0, len(roman_bytes), batch_size)]
+
+    benchmark_cases.extend((
+        ("roman_to_arabic_diagnostic/valid", roman_to_arabic_diagnostic, roman_numerals, 1),
+        ("roman_to_arabic_diagnostic/garbage", roman_to_arabic_diagnostic, garbage, 1),
+        ("arabic_to_roman_diagnostic/invalid", arabic_to_roman_diagnostic, invalid_arabic, 1),
+        ("roman_to_arabic_lenient/valid", roman_to_arabic_lenient, roman_numerals, 1),
+        ("roman_to_arabic_lenient/additive", roman_to_arabic_lenient, additive, 1),
+        ("roman_to_arabic_bytes/valid", roman_to_arabic_bytes, roman_bytes, 1),
+        ("roman_to_arabic_bytes/lower_case", roman_to_arabic_bytes, lower_case_bytes, 1),
+        ("roman_to_arabic_bytes/decode_table", lambda numeral, convert=ENGINES["table"][0]: convert(numeral.decode("ascii")),
+         lower_case_bytes, 1),
+        ("roman_to_arabic_buffer", roman_to_arabic_buffer, roman_buffers, batch_size),
+        ("sorted/roman_sort_key", lambda batch: sorted(batch, key=roman_sort_key), shuffled_batches, batch_size),
+        ("RomanIndex.range", lambda bounds: roman_index.range(*bounds), range_bounds, 1),
+        ("roman_to_arabic_many/table", roman_to_arabic_many, roman_batches, batch_size),
+        ("arabic_to_roman_many/table", arabic_to_roman_many, arabic_batches, batch_size),
+        ("convert_stream/auto", lambda lines: write_lines(convert_stream(read_numerals(lines)), NullOutput()),
+         stream_batches, batch_size),
+        ("replace_roman_numerals/prose", lambda lines: "".join(replace_roman_numerals(lines)), prose_batches,
+         batch_size),
+    ))
+
+    return benchmark_cases
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of sorted values.
+
+    PARAMETERS:
+        sorted_values : [float, ...]
+        fraction : float
+            Between 0 and 1
+
+    RETURNS: float
+    """
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def run_case(function, inputs, operations, rounds):
+    """
+    Runs a benchmark case.
+
+    PARAMETERS:
+        function : function
+        inputs : [object, ...]
+        operations : int
+            Number of operations per call of function
+        rounds : int
+            Number of times inputs are run through
+
+    RETURNS: {str: float, ...}
+        ops_per_sec, p50_us and p99_us (per operation), peak_memory_bytes
+    """
+    for numeral in inputs:  # Warm up (tables built on first use, ...)
+        function(numeral)
+
+    latencies = []
+    for _ in range(rounds):
+        for numeral in inputs:
+            start = timer()
+            function(numeral)
+            latencies.append((timer() - start) / operations)
+    latencies.sort()
+
+    tracemalloc.start()
+    for numeral in inputs:
+        function(numeral)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"ops_per_sec": len(latencies) / sum(latencies),
+            "p50_us": percentile(latencies, 0.50) * 1e6,
+            "p99_us": percentile(latencies, 0.99) * 1e6,
+            "peak_memory_bytes": peak_memory}
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares results against a baseline.
+
+    PARAMETERS:
+        results : {str: {str: float, ...}, ...}
+        baseline : {str: {str: float, ...}, ...}
+        threshold : float
+            Fraction of ops/sec a case may lose before being a regression
+
+    RETURNS: [(str, float, float), ...]
+        Name, baseline ops/sec and current ops/sec of each regressed case
+    """
+    regressions = []
+
+    for name in sorted(results):
+        if name in baseline:
+            before, after = baseline[name]["ops_per_sec"], results[name]["ops_per_sec"]
+            if after < before * (1 - threshold):
+                regressions.append((name, before, after))
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmarks the conversion hot paths')
+    parser.add_argument('--output', help='file to save the results to, as JSON (default: stdout)')
+    parser.add_argument('--baseline', help='results of a previous run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='fraction of ops/sec a case may lose against the baseline (default: %(default)s)')
+    parser.add_argument('--filter', default='', help='only runs the cases whose name contains this text')
+    parser.add_argument('--rounds', type=int, default=3,
+                        help='number of times each case goes over its inputs (default: %(default)s)')
+    arguments = parser.parse_args()
+
+    results = {}
+    for name, function, inputs, operations in cases():
+        if arguments.filter in name:
+            results[name] = run_case(function, inputs, operations, arguments.rounds)
+            sys.stderr.write("%-40s %14.0f ops/sec\n" % (name, results[name]["ops_per_sec"]))
+
+    report = json.dumps({"python": platform.python_version(),
+                         "platform": platform.platform(),
+                         "results": results}, indent=2, sort_keys=True)
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            output_file.write(report + "\n")
+    else:
+        print(report)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file)["results"], arguments.threshold)
+
+        for name, before, after in regressions:
+            sys.stderr.write("REGRESSION %s: %.0f -> %.0f ops/sec (%+.1f%%)\n"
+                             % (name, before, after, (after / before - 1) * 100))
+        if regressions:
+            sys.exit(1)
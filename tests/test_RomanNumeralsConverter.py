@@ -1,4 +1,4 @@
-#!python2
+#!python3
 # coding: utf-8
 
 """
@@ -6,7 +6,25 @@ Tests for RomanNumeralsConverter.py
 """
 
 
+import array
+import contextlib
+import io
+import itertools
+import mmap
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
+try:
+    import numpy
+except ImportError:
+    numpy = None
+try:
+    import pandas
+except ImportError:
+    pandas = None
+import RomanNumeralsConverter
 from RomanNumeralsConverter import (is_possible_roman_numeral,
                                     at_most_once_vld,
                                     at_most_3_in_row_ixcm,
@@ -14,8 +32,59 @@ from RomanNumeralsConverter import (is_possible_roman_numeral,
                                     subtractive_combination_validity,
                                     is_non_zero_arabic_numeral,
                                     has_no_trailing_zeroes,
+                                    roman_to_arabic_rules,
+                                    arabic_to_roman_rules,
+                                    conversion_tables,
+                                    roman_to_arabic_table,
+                                    arabic_to_roman_table,
+                                    roman_to_arabic_regex,
+                                    arabic_to_roman_digits,
+                                    roman_to_arabic_pairs,
+                                    get_engine,
+                                    set_default_engine,
                                     roman_to_arabic,
-                                    arabic_to_roman)
+                                    arabic_to_roman,
+                                    roman_to_arabic_many,
+                                    arabic_to_roman_many,
+                                    Diagnostic,
+                                    roman_to_arabic_diagnostic,
+                                    arabic_to_roman_diagnostic,
+                                    roman_to_arabic_lenient,
+                                    VINCULUM,
+                                    ASCII_VINCULUM,
+                                    roman_digits,
+                                    canonical_roman_value,
+                                    arabic_to_roman_extended,
+                                    roman_to_arabic_extended,
+                                    roman_to_arabic_array,
+                                    arabic_to_roman_array,
+                                    RomanAccessor,
+                                    register_pandas_accessor,
+                                    roman_to_arabic_bytes,
+                                    roman_to_arabic_buffer,
+                                    RomanColumn,
+                                    roman_sort_key,
+                                    RomanIndex,
+                                    detect_numeral_type,
+                                    read_numerals,
+                                    convert_stream,
+                                    write_lines,
+                                    IncrementalRomanParser,
+                                    text_segments,
+                                    find_roman_numerals,
+                                    replace_roman_numerals,
+                                    chunks,
+                                    convert_chunk,
+                                    SharedRomanNumerals,
+                                    publish_conversion_table,
+                                    attach_conversion_table,
+                                    convert_parallel,
+                                    memoize,
+                                    Roman,
+                                    input_class,
+                                    enable_instrumentation,
+                                    disable_instrumentation,
+                                    main)
 
 
 class TestIsPossibleRomanNumeral(unittest.TestCase):
@@ -161,58 +230,58 @@ class TestFindSubtractiveCombinations(unittest.TestCase):
     find_subtractive_combinations
     """
     def test_iv(self):
-        self.assertEquals(find_subtractive_combinations("IV"), (("IV", 0), ))
+        self.assertEqual(find_subtractive_combinations("IV"), (("IV", 0), ))
 
     def test_ix(self):
-        self.assertEquals(find_subtractive_combinations("IX"), (("IX", 0), ))
+        self.assertEqual(find_subtractive_combinations("IX"), (("IX", 0), ))
 
     def test_xl(self):
-        self.assertEquals(find_subtractive_combinations("XL"), (("XL", 0), ))
+        self.assertEqual(find_subtractive_combinations("XL"), (("XL", 0), ))
 
     def test_xc(self):
-        self.assertEquals(find_subtractive_combinations("XC"), (("XC", 0), ))
+        self.assertEqual(find_subtractive_combinations("XC"), (("XC", 0), ))
 
     def test_cd(self):
-        self.assertEquals(find_subtractive_combinations("CD"), (("CD", 0), ))
+        self.assertEqual(find_subtractive_combinations("CD"), (("CD", 0), ))
 
     def test_cm(self):
-        self.assertEquals(find_subtractive_combinations("CM"), (("CM", 0), ))
+        self.assertEqual(find_subtractive_combinations("CM"), (("CM", 0), ))
 
     def test_xiv(self):
-        self.assertEquals(find_subtractive_combinations("XIV"), (("IV", 1), ))
+        self.assertEqual(find_subtractive_combinations("XIV"), (("IV", 1), ))
 
     def test_xix(self):
-        self.assertEquals(find_subtractive_combinations("XIX"), (("IX", 1), ))
+        self.assertEqual(find_subtractive_combinations("XIX"), (("IX", 1), ))
 
     def test_cxl(self):
-        self.assertEquals(find_subtractive_combinations("CXL"), (("XL", 1), ))
+        self.assertEqual(find_subtractive_combinations("CXL"), (("XL", 1), ))
 
     def test_cxc(self):
-        self.assertEquals(find_subtractive_combinations("CXC"), (("XC", 1), ))
+        self.assertEqual(find_subtractive_combinations("CXC"), (("XC", 1), ))
 
     def test_mcd(self):
-        self.assertEquals(find_subtractive_combinations("MCD"), (("CD", 1), ))
+        self.assertEqual(find_subtractive_combinations("MCD"), (("CD", 1), ))
 
     def test_mcm(self):
-        self.assertEquals(find_subtractive_combinations("MCM"), (("CM", 1), ))
+        self.assertEqual(find_subtractive_combinations("MCM"), (("CM", 1), ))
 
     def test_ccxciv(self):
-        self.assertEquals(find_subtractive_combinations("CCXCIV"), (("XC", 2), ("IV", 4), ))
+        self.assertEqual(find_subtractive_combinations("CCXCIV"), (("XC", 2), ("IV", 4), ))
 
     def test_xliv(self):
-        self.assertEquals(find_subtractive_combinations("XLIV"), (("XL", 0), ("IV", 2), ))
+        self.assertEqual(find_subtractive_combinations("XLIV"), (("XL", 0), ("IV", 2), ))
 
     def test_cmxliv(self):
-        self.assertEquals(find_subtractive_combinations("CMXLIV"), (("CM", 0), ("XL", 2), ("IV", 4), ))
+        self.assertEqual(find_subtractive_combinations("CMXLIV"), (("CM", 0), ("XL", 2), ("IV", 4), ))
 
     def test_i(self):
-        self.assertEquals(find_subtractive_combinations("I"), ())
+        self.assertEqual(find_subtractive_combinations("I"), ())
 
     def test_xxx(self):
-        self.assertEquals(find_subtractive_combinations("XXX"), ())
+        self.assertEqual(find_subtractive_combinations("XXX"), ())
 
     def test_mmmcccxxxviii(self):
-        self.assertEquals(find_subtractive_combinations("MMMCCCXXXVIII"), ())
+        self.assertEqual(find_subtractive_combinations("MMMCCCXXXVIII"), ())
 
 
 class TestSubtractiveCombinationValidity(unittest.TestCase):
@@ -284,6 +353,9 @@ class TestIsNonZeroArabicNumeral(unittest.TestCase):
     def test_middle(self):
         self.assertTrue(is_non_zero_arabic_numeral("2000"))
 
+    def test_superscript(self):
+        self.assertFalse(is_non_zero_arabic_numeral("\u00b2"))  # A digit, but not a decimal one int() reads
+
 
 class TestIsHasNoTrailingZeroes(unittest.TestCase):
     """
@@ -306,80 +378,112 @@ class TestRomanToArabic(unittest.TestCase):
     roman_to_arabic(roman_numeral)
     """
     def test_lower_case(self):
-        self.assertEquals(roman_to_arabic("i"), 1)
+        self.assertEqual(roman_to_arabic("i"), 1)
 
     def test_lower_case_2(self):
-        self.assertEquals(roman_to_arabic("xxiv"), 24)
+        self.assertEqual(roman_to_arabic("xxiv"), 24)
 
     def test_mixed_case(self):
-        self.assertEquals(roman_to_arabic("mMmccCXXXviii"), 3338)
+        self.assertEqual(roman_to_arabic("mMmccCXXXviii"), 3338)
 
     def test_i(self):
-        self.assertEquals(roman_to_arabic("I"), 1)
+        self.assertEqual(roman_to_arabic("I"), 1)
 
     def test_v(self):
-        self.assertEquals(roman_to_arabic("V"), 5)
+        self.assertEqual(roman_to_arabic("V"), 5)
 
     def test_x(self):
-        self.assertEquals(roman_to_arabic("X"), 10)
+        self.assertEqual(roman_to_arabic("X"), 10)
 
     def test_l(self):
-        self.assertEquals(roman_to_arabic("L"), 50)
+        self.assertEqual(roman_to_arabic("L"), 50)
 
     def test_c(self):
-        self.assertEquals(roman_to_arabic("C"), 100)
+        self.assertEqual(roman_to_arabic("C"), 100)
 
     def test_d(self):
-        self.assertEquals(roman_to_arabic("D"), 500)
+        self.assertEqual(roman_to_arabic("D"), 500)
 
     def test_m(self):
-        self.assertEquals(roman_to_arabic("M"), 1000)
+        self.assertEqual(roman_to_arabic("M"), 1000)
 
     def test_iv(self):
-        self.assertEquals(roman_to_arabic("IV"), 4)
+        self.assertEqual(roman_to_arabic("IV"), 4)
 
     def test_ix(self):
-        self.assertEquals(roman_to_arabic("IX"), 9)
+        self.assertEqual(roman_to_arabic("IX"), 9)
 
     def test_xl(self):
-        self.assertEquals(roman_to_arabic("XL"), 40)
+        self.assertEqual(roman_to_arabic("XL"), 40)
 
     def test_xc(self):
-        self.assertEquals(roman_to_arabic("XC"), 90)
+        self.assertEqual(roman_to_arabic("XC"), 90)
 
     def test_cd(self):
-        self.assertEquals(roman_to_arabic("CD"), 400)
+        self.assertEqual(roman_to_arabic("CD"), 400)
 
     def test_cm(self):
-        self.assertEquals(roman_to_arabic("CM"), 900)
+        self.assertEqual(roman_to_arabic("CM"), 900)
 
     def test_max_roman_numeral(self):
-        self.assertEquals(roman_to_arabic("MMMDCCCXCIX"), 3899)
+        self.assertEqual(roman_to_arabic("MMMDCCCXCIX"), 3899)
 
     def test_longest_roman_numeral(self):
-        self.assertEquals(roman_to_arabic("MMDCCCLXXXVIII"), 2888)
+        self.assertEqual(roman_to_arabic("MMDCCCLXXXVIII"), 2888)
 
     def test_wrong_numeral_clxvc(self):
-        self.assertEquals(roman_to_arabic("CLXVC"), -1)
+        self.assertEqual(roman_to_arabic("CLXVC"), -1)
 
     def test_wrong_numeral_ixx(self):
-        self.assertEquals(roman_to_arabic("IXX"), -1)
+        self.assertEqual(roman_to_arabic("IXX"), -1)
 
     def test_wrong_numeral_civm(self):
-        self.assertEquals(roman_to_arabic("CIVM"), -1)
+        self.assertEqual(roman_to_arabic("CIVM"), -1)
 
     def test_wrong_numeral_mmmcdm(self):
-        self.assertEquals(roman_to_arabic("MMMCDM"), -1)
+        self.assertEqual(roman_to_arabic("MMMCDM"), -1)
+
+    def test_wrong_numeral_ivi(self):
+        self.assertEqual(roman_to_arabic("IVI"), -1)
+
+    def test_wrong_numeral_xcx(self):
+        self.assertEqual(roman_to_arabic("XCX"), -1)
+
+    def test_wrong_numeral_cmcm(self):
+        self.assertEqual(roman_to_arabic("CMCM"), -1)
+
+    def test_wrong_numeral_vix(self):
+        self.assertEqual(roman_to_arabic("VIX"), -1)
+
+    def test_wrong_numeral_ccm(self):
+        self.assertEqual(roman_to_arabic("CCM"), -1)
+
+    def test_wrong_numeral_iix(self):
+        self.assertEqual(roman_to_arabic("IIX"), -1)
+
+    def test_wrong_numeral_ixc(self):
+        self.assertEqual(roman_to_arabic("IXC"), -1)
+
+    def test_cmxc(self):
+        self.assertEqual(roman_to_arabic("CMXC"), 990)
+
+    def test_mcmxcix(self):
+        self.assertEqual(roman_to_arabic("MCMXCIX"), 1999)
+
+    def test_not_a_string(self):
+        self.assertEqual(roman_to_arabic(10), -1)
 
-    # TODO correct the following cases
+    def test_table_engine(self):
+        self.assertEqual(roman_to_arabic("xxiv", engine="table"), 24)
 
-    # def test_wrong_numeral_ivi(self):
-    #     self.assertEquals(roman_to_arabic("IVI"), -1)
-    #
-    # def test_wrong_numeral_xcx(self):
-    #     self.assertEquals(roman_to_arabic("XCX"), -1)
+    def test_unknown_engine(self):
+        self.assertRaises(ValueError, roman_to_arabic, "X", "abacus")
 
-    # TODO more wrong cases
+    def test_bytes(self):
+        self.assertEqual(roman_to_arabic(b"xxiv", engine="rules"), 24)
+
+    def test_bytes_unknown_engine(self):
+        self.assertRaises(ValueError, roman_to_arabic, b"X", "abacus")
 
 
 class TestArabicToRoman(unittest.TestCase):
@@ -387,112 +491,1650 @@ class TestArabicToRoman(unittest.TestCase):
     arabic_to_roman(arabic_numeral)
     """
     def test_1(self):
-        self.assertEquals(arabic_to_roman(1), "I")
+        self.assertEqual(arabic_to_roman(1), "I")
 
     def test_5(self):
-        self.assertEquals(arabic_to_roman(5), "V")
+        self.assertEqual(arabic_to_roman(5), "V")
 
     def test_10(self):
-        self.assertEquals(arabic_to_roman(10), "X")
+        self.assertEqual(arabic_to_roman(10), "X")
 
     def test_50(self):
-        self.assertEquals(arabic_to_roman(50), "L")
+        self.assertEqual(arabic_to_roman(50), "L")
 
     def test_100(self):
-        self.assertEquals(arabic_to_roman(100), "C")
+        self.assertEqual(arabic_to_roman(100), "C")
 
     def test_500(self):
-        self.assertEquals(arabic_to_roman(500), "D")
+        self.assertEqual(arabic_to_roman(500), "D")
 
     def test_1000(self):
-        self.assertEquals(arabic_to_roman(1000), "M")
+        self.assertEqual(arabic_to_roman(1000), "M")
 
     def test_4(self):
-        self.assertEquals(arabic_to_roman(4), "IV")
+        self.assertEqual(arabic_to_roman(4), "IV")
 
     def test_9(self):
-        self.assertEquals(arabic_to_roman(9), "IX")
+        self.assertEqual(arabic_to_roman(9), "IX")
 
     def test_40(self):
-        self.assertEquals(arabic_to_roman(40), "XL")
+        self.assertEqual(arabic_to_roman(40), "XL")
 
     def test_90(self):
-        self.assertEquals(arabic_to_roman(90), "XC")
+        self.assertEqual(arabic_to_roman(90), "XC")
 
     def test_400(self):
-        self.assertEquals(arabic_to_roman(400), "CD")
+        self.assertEqual(arabic_to_roman(400), "CD")
 
     def test_900(self):
-        self.assertEquals(arabic_to_roman(900), "CM")
+        self.assertEqual(arabic_to_roman(900), "CM")
 
     def test_max_roman_numeral(self):
-        self.assertEquals(arabic_to_roman(3899), "MMMDCCCXCIX")
+        self.assertEqual(arabic_to_roman(3899), "MMMDCCCXCIX")
 
     def test_longest_roman_numeral(self):
-        self.assertEquals(arabic_to_roman(2888), "MMDCCCLXXXVIII")
+        self.assertEqual(arabic_to_roman(2888), "MMDCCCLXXXVIII")
 
     def test_zero(self):
-        self.assertEquals(arabic_to_roman(0), "")
+        self.assertEqual(arabic_to_roman(0), "")
 
     def test_negative(self):
-        self.assertEquals(arabic_to_roman(-1), "")
+        self.assertEqual(arabic_to_roman(-1), "")
 
     def test_above_max(self):
-        self.assertEquals(arabic_to_roman(3900), "")
+        self.assertEqual(arabic_to_roman(3900), "")
 
     def test_s1(self):
-        self.assertEquals(arabic_to_roman("1"), "I")
+        self.assertEqual(arabic_to_roman("1"), "I")
 
     def test_s5(self):
-        self.assertEquals(arabic_to_roman("5"), "V")
+        self.assertEqual(arabic_to_roman("5"), "V")
 
     def test_s10(self):
-        self.assertEquals(arabic_to_roman("10"), "X")
+        self.assertEqual(arabic_to_roman("10"), "X")
 
     def test_s50(self):
-        self.assertEquals(arabic_to_roman("50"), "L")
+        self.assertEqual(arabic_to_roman("50"), "L")
 
     def test_s100(self):
-        self.assertEquals(arabic_to_roman("100"), "C")
+        self.assertEqual(arabic_to_roman("100"), "C")
 
     def test_s500(self):
-        self.assertEquals(arabic_to_roman("500"), "D")
+        self.assertEqual(arabic_to_roman("500"), "D")
 
     def test_s1000(self):
-        self.assertEquals(arabic_to_roman("1000"), "M")
+        self.assertEqual(arabic_to_roman("1000"), "M")
 
     def test_s4(self):
-        self.assertEquals(arabic_to_roman("4"), "IV")
+        self.assertEqual(arabic_to_roman("4"), "IV")
 
     def test_s9(self):
-        self.assertEquals(arabic_to_roman("9"), "IX")
+        self.assertEqual(arabic_to_roman("9"), "IX")
 
     def test_s40(self):
-        self.assertEquals(arabic_to_roman("40"), "XL")
+        self.assertEqual(arabic_to_roman("40"), "XL")
 
     def test_s90(self):
-        self.assertEquals(arabic_to_roman("90"), "XC")
+        self.assertEqual(arabic_to_roman("90"), "XC")
 
     def test_s400(self):
-        self.assertEquals(arabic_to_roman("400"), "CD")
+        self.assertEqual(arabic_to_roman("400"), "CD")
 
     def test_s900(self):
-        self.assertEquals(arabic_to_roman("900"), "CM")
+        self.assertEqual(arabic_to_roman("900"), "CM")
 
     def test_s_max_roman_numeral(self):
-        self.assertEquals(arabic_to_roman("3899"), "MMMDCCCXCIX")
+        self.assertEqual(arabic_to_roman("3899"), "MMMDCCCXCIX")
 
     def test_s_longest_roman_numeral(self):
-        self.assertEquals(arabic_to_roman("2888"), "MMDCCCLXXXVIII")
+        self.assertEqual(arabic_to_roman("2888"), "MMDCCCLXXXVIII")
 
     def test_s_zero(self):
-        self.assertEquals(arabic_to_roman("000000"), "")
+        self.assertEqual(arabic_to_roman("000000"), "")
 
     def test_s_negative(self):
-        self.assertEquals(arabic_to_roman("-1"), "")
+        self.assertEqual(arabic_to_roman("-1"), "")
 
     def test_s_above_max(self):
-        self.assertEquals(arabic_to_roman("3900"), "")
+        self.assertEqual(arabic_to_roman("3900"), "")
+
+    def test_trailing_zeroes(self):
+        self.assertEqual(arabic_to_roman("00012"), "")
+
+    def test_table_engine(self):
+        self.assertEqual(arabic_to_roman(24, engine="table"), "XXIV")
+
+    def test_unknown_engine(self):
+        self.assertRaises(ValueError, arabic_to_roman, 10, "abacus")
+
+
+class TestRomanToArabicRegex(unittest.TestCase):
+    """
+    roman_to_arabic_regex(roman_numeral)
+    Must agree with the rule-based engine on every input
+    """
+    def assertAgrees(self, roman_numeral):
+        self.assertEqual(roman_to_arabic_regex(roman_numeral), roman_to_arabic_rules(roman_numeral),
+                         repr(roman_numeral))
+
+    def test_mcmxcix(self):
+        self.assertEqual(roman_to_arabic_regex("mcmxcix"), 1999)
+
+    def test_empty_string(self):
+        self.assertEqual(roman_to_arabic_regex(""), -1)
+
+    def test_new_line(self):
+        self.assertEqual(roman_to_arabic_regex("X\n"), -1)
+
+    def test_all_roman_numerals(self):
+        for arabic_numeral in range(1, 4000):
+            roman_numeral = "MMM" + arabic_to_roman_rules(arabic_numeral - 3000) if arabic_numeral > 3899 \
+                else arabic_to_roman_rules(arabic_numeral)
+            self.assertAgrees(roman_numeral)
+            self.assertAgrees(roman_numeral.lower())
+
+    def test_all_short_strings(self):
+        for length in range(5):
+            for chars in itertools.product("IVXLCDMivxlcdm", repeat=length):
+                self.assertAgrees("".join(chars))
+
+    def test_non_strings(self):
+        for roman_numeral in (None, 1, 1.0, ["X"], " X", "X ", "MMMDCCCLXXXVIII", "I" * 20):
+            self.assertAgrees(roman_numeral)
+
+
+class UncopiedString(str):
+    """
+    String that fails when upper cased (copied), to check that it is rejected before.
+    """
+    def upper(self):
+        raise AssertionError("upper() called on %d characters" % len(self))
+
+
+class UnprintedBytes(bytes):
+    """
+    Bytes that fail when written out as a string, to check that they are rejected before.
+    """
+    def __str__(self):
+        raise AssertionError("str() called on %d bytes" % len(self))
+
+
+class UnprintedList(list):
+    """
+    List that fails when written out as a string, to check that it is rejected before.
+    """
+    def __str__(self):
+        raise AssertionError("str() called on %d items" % len(self))
+
+
+class TestFastReject(unittest.TestCase):
+    """
+    Every conversion function, on numerals too long (or too big) to be converted
+    """
+    def test_roman_numerals(self):
+        for roman_to_arabic_ in [engine[0] for engine in RomanNumeralsConverter.ENGINES.values()] + [
+                roman_to_arabic, roman_to_arabic_extended]:
+            self.assertEqual(roman_to_arabic_(UncopiedString("M" * 1000)), -1, roman_to_arabic_)
+        self.assertEqual(roman_to_arabic_lenient(UncopiedString("I" * 33)), (-1, ""))
+        self.assertEqual(roman_to_arabic_diagnostic(UncopiedString("M" * 15)),
+                         Diagnostic(-1, RomanNumeralsConverter.ErrorCode.TOO_LONG, 14))
+        self.assertEqual(roman_to_arabic_bytes(b"M" * 1000), -1)
+
+    def test_long_arabic_numerals(self):
+        for arabic_to_roman_ in [engine[1] for engine in RomanNumeralsConverter.ENGINES.values()] + [
+                arabic_to_roman, arabic_to_roman_extended]:
+            self.assertEqual(arabic_to_roman_("1" * 10000), "", arabic_to_roman_)  # Past int()'s digit limit
+            self.assertEqual(arabic_to_roman_("0" * 10000 + "1"), "", arabic_to_roman_)
+        self.assertEqual(arabic_to_roman_diagnostic("0" * 10000 + "1"),
+                         Diagnostic("", RomanNumeralsConverter.ErrorCode.TOO_LONG, 5))
+
+    def test_big_arabic_numerals(self):
+        for arabic_to_roman_ in [engine[1] for engine in RomanNumeralsConverter.ENGINES.values()] + [
+                arabic_to_roman, arabic_to_roman_extended]:
+            self.assertEqual(arabic_to_roman_(10 ** 10000), "", arabic_to_roman_)  # Past str()'s digit limit
+        self.assertEqual(arabic_to_roman_diagnostic(10 ** 10000).error, RomanNumeralsConverter.ErrorCode.OUT_OF_RANGE)
+
+    def test_long_sized_arabic_numerals(self):
+        for numeral in (UnprintedBytes(b"1" * 10000), UnprintedList([1] * 10000), bytearray(10000)):
+            for arabic_to_roman_ in [engine[1] for engine in RomanNumeralsConverter.ENGINES.values()] + [
+                    arabic_to_roman, arabic_to_roman_extended]:
+                self.assertEqual(arabic_to_roman_(numeral), "", arabic_to_roman_)
+            self.assertEqual(arabic_to_roman_diagnostic(numeral),
+                             Diagnostic("", RomanNumeralsConverter.ErrorCode.TOO_LONG, 5))
+
+
+class TestEngines(unittest.TestCase):
+    """
+    get_engine(engine), set_default_engine(engine)
+    """
+    def tearDown(self):
+        set_default_engine("rules")
+
+    def test_default_engine(self):
+        self.assertEqual(get_engine(), (roman_to_arabic_rules, arabic_to_roman_rules))
+
+    def test_table_engine(self):
+        self.assertEqual(get_engine("table"), (roman_to_arabic_table, arabic_to_roman_table))
+
+    def test_digits_engine(self):
+        self.assertEqual(get_engine("digits"), (roman_to_arabic_regex, arabic_to_roman_digits))
+
+    def test_pairs_engine(self):
+        self.assertEqual(get_engine("pairs"), (roman_to_arabic_pairs, arabic_to_roman_digits))
+
+    def test_unknown_engine(self):
+        self.assertRaises(ValueError, get_engine, "abacus")
+
+    def test_set_default_engine(self):
+        set_default_engine("table")
+        self.assertEqual(get_engine(), (roman_to_arabic_table, arabic_to_roman_table))
+
+    def test_set_unknown_default_engine(self):
+        self.assertRaises(ValueError, set_default_engine, "abacus")
+        self.assertEqual(RomanNumeralsConverter.default_engine, "rules")
+
+
+class TestConversionTables(unittest.TestCase):
+    """
+    conversion_tables()
+    """
+    def test_built_once(self):
+        roman_numerals, arabic_numerals = conversion_tables()
+        self.assertTrue(conversion_tables()[0] is roman_numerals)
+        self.assertTrue(conversion_tables()[1] is arabic_numerals)
+
+    def test_roman_numerals(self):
+        roman_numerals, _ = conversion_tables()
+        self.assertEqual(len(roman_numerals), 3900)
+        self.assertEqual(roman_numerals[0], "")
+        self.assertEqual(roman_numerals[3899], "MMMDCCCXCIX")
+
+    def test_arabic_numerals(self):
+        _, arabic_numerals = conversion_tables()
+        self.assertEqual(arabic_numerals["MMMDCCCXCIX"], 3899)
+        self.assertEqual(arabic_numerals["MMMCMXCIX"], 3999)
+        self.assertFalse("MMMDCCCLXXXVIII" in arabic_numerals)  # 3888, longer than 14 characters
+
+
+class TestTableEngine(unittest.TestCase):
+    """
+    roman_to_arabic_table(roman_numeral), arabic_to_roman_table(arabic_numeral)
+    Must agree with the rule-based engine on every input
+    """
+    def assertRomanAgrees(self, roman_numeral):
+        self.assertEqual(roman_to_arabic_table(roman_numeral), roman_to_arabic_rules(roman_numeral),
+                         repr(roman_numeral))
+
+    def assertArabicAgrees(self, arabic_numeral):
+        self.assertEqual(arabic_to_roman_table(arabic_numeral), arabic_to_roman_rules(arabic_numeral),
+                         repr(arabic_numeral))
+
+    def test_all_arabic_numerals(self):
+        for arabic_numeral in range(-10, 4010):
+            self.assertArabicAgrees(arabic_numeral)
+            self.assertArabicAgrees(str(arabic_numeral))
+            self.assertArabicAgrees("0" + str(arabic_numeral))
+
+    def test_arabic_non_integers(self):
+        for arabic_numeral in ("", " 1", "1 ", "1.0", 1.0, True, None, [1], "MCM"):
+            self.assertArabicAgrees(arabic_numeral)
+
+    def test_all_roman_numerals(self):
+        for arabic_numeral in range(1, 4000):
+            roman_numeral = "MMM" + arabic_to_roman_rules(arabic_numeral - 3000) if arabic_numeral > 3899 \
+                else arabic_to_roman_rules(arabic_numeral)
+            for case_roman_numeral in (roman_numeral, roman_numeral.lower(), roman_numeral.swapcase().title()):
+                self.assertRomanAgrees(case_roman_numeral)
+
+    def test_all_short_strings(self):
+        for length in range(5):
+            for chars in itertools.product("IVXLCDMivxlcdm", repeat=length):
+                self.assertRomanAgrees("".join(chars))
+
+    def test_roman_non_strings(self):
+        for roman_numeral in (None, 1, 1.0, ["X"], " X", "X ", "X\n", "MMMDCCCLXXXVIII", "I" * 20):
+            self.assertRomanAgrees(roman_numeral)
+
+
+class TestDigitEngine(unittest.TestCase):
+    """
+    arabic_to_roman_digits(arabic_numeral)
+    Must agree with the rule-based engine on every input
+    """
+    def test_all_arabic_numerals(self):
+        for arabic_numeral in range(-10, 4010):
+            for numeral in (arabic_numeral, str(arabic_numeral), "0" + str(arabic_numeral)):
+                self.assertEqual(arabic_to_roman_digits(numeral), arabic_to_roman_rules(numeral), repr(numeral))
+
+    def test_arabic_non_integers(self):
+        for arabic_numeral in ("", " 1", "1 ", "1.0", 1.0, True, None, [1], "MCM", "\u00b2"):
+            self.assertEqual(arabic_to_roman_digits(arabic_numeral), arabic_to_roman_rules(arabic_numeral))
+
+    def test_interned(self):
+        self.assertIs(arabic_to_roman_digits(1994), arabic_to_roman_digits("1994"))
+
+
+class TestPairEngine(unittest.TestCase):
+    """
+    roman_to_arabic_pairs(roman_numeral)
+    Must agree with the rule-based engine on every input
+    """
+    def test_all_roman_numerals(self):
+        for arabic_numeral in range(1, 4000):  # Read up to 3999
+            roman_numeral = roman_digits(arabic_numeral)
+            for numeral in (roman_numeral, roman_numeral.lower()):
+                self.assertEqual(roman_to_arabic_pairs(numeral), roman_to_arabic_rules(numeral), numeral)
+
+    def test_invalid_roman_numerals(self):
+        for roman_numeral in ["".join(chars) for length in range(5)
+                              for chars in itertools.product("IVXLCDM", repeat=length)]:
+            self.assertEqual(roman_to_arabic_pairs(roman_numeral), roman_to_arabic_rules(roman_numeral), roman_numeral)
+
+    def test_roman_non_numerals(self):
+        for roman_numeral in ("", " I", "I ", "X\x07", "X\x08", "\x01", "2", "\u0131", "\u2160", None, 14, "MMMM",
+                              "MMMMMMMMMMMMMM"):
+            self.assertEqual(roman_to_arabic_pairs(roman_numeral), roman_to_arabic_rules(roman_numeral),
+                             repr(roman_numeral))
+        self.assertEqual(roman_to_arabic_pairs(b"XIV"), 14)  # As roman_to_arabic_bytes()
+
+
+class TestRomanToArabicMany(unittest.TestCase):
+    """
+    roman_to_arabic_many(roman_numerals, lazy, engine)
+    """
+    def test_list(self):
+        self.assertEqual(roman_to_arabic_many(["I", "xxiv", "IIII", "", None]), [1, 24, -1, -1, -1])
+
+    def test_iterable(self):
+        self.assertEqual(roman_to_arabic_many(iter(("MCM", "XC"))), [1900, 90])
+
+    def test_empty(self):
+        self.assertEqual(roman_to_arabic_many([]), [])
+
+    def test_lazy(self):
+        converted = roman_to_arabic_many(["I", "V"], lazy=True)
+        self.assertFalse(isinstance(converted, list))
+        self.assertEqual(list(converted), [1, 5])
+
+    def test_rules_engine(self):
+        self.assertEqual(roman_to_arabic_many(["I", "IVI"], engine="rules"), [1, -1])
+
+    def test_matches_scalar(self):
+        roman_numerals = [arabic_to_roman(arabic_numeral) for arabic_numeral in range(1, 3900)]
+        self.assertEqual(roman_to_arabic_many(roman_numerals),
+                         [roman_to_arabic(roman_numeral) for roman_numeral in roman_numerals])
+
+
+class TestArabicToRomanMany(unittest.TestCase):
+    """
+    arabic_to_roman_many(arabic_numerals, lazy, engine)
+    """
+    def test_list(self):
+        self.assertEqual(arabic_to_roman_many([1, "24", 0, 3900, "0012"]), ["I", "XXIV", "", "", ""])
+
+    def test_iterable(self):
+        self.assertEqual(arabic_to_roman_many(range(1, 4)), ["I", "II", "III"])
+
+    def test_empty(self):
+        self.assertEqual(arabic_to_roman_many([]), [])
+
+    def test_lazy(self):
+        converted = arabic_to_roman_many([1, 5], lazy=True)
+        self.assertFalse(isinstance(converted, list))
+        self.assertEqual(list(converted), ["I", "V"])
+
+    def test_rules_engine(self):
+        self.assertEqual(arabic_to_roman_many([1, -1], engine="rules"), ["I", ""])
+
+    def test_matches_scalar(self):
+        arabic_numerals = list(range(-10, 4010)) + [str(arabic_numeral) for arabic_numeral in range(-10, 4010)]
+        self.assertEqual(arabic_to_roman_many(arabic_numerals),
+                         [arabic_to_roman(arabic_numeral) for arabic_numeral in arabic_numerals])
+
+
+@unittest.skipUnless(numpy, "requires NumPy")
+class TestRomanToArabicArray(unittest.TestCase):
+    """
+    roman_to_arabic_array(roman_numerals, mask)
+    """
+    def test_str_array(self):
+        self.assertEqual(roman_to_arabic_array(numpy.array(["I", "xxiv", "IIII", "", "ZZZZZZZZZZZZZZZZ"])).tolist(),
+                         [1, 24, -1, -1, -1])
+
+    def test_bytes_array(self):
+        self.assertEqual(roman_to_arabic_array(numpy.array([b"MCM", b"xc", b"IC"])).tolist(), [1900, 90, -1])
+
+    def test_object_array(self):
+        self.assertEqual(roman_to_arabic_array(numpy.array(["X", None, 10], dtype=object)).tolist(), [10, -1, -1])
+
+    def test_shape(self):
+        self.assertEqual(roman_to_arabic_array([["I", "II"], ["III", "IV"]]).tolist(), [[1, 2], [3, 4]])
+
+    def test_empty(self):
+        self.assertEqual(roman_to_arabic_array(numpy.array([], dtype=str)).tolist(), [])
+
+    def test_mask(self):
+        arabic_numerals, valid = roman_to_arabic_array(["X", "VV"], mask=True)
+        self.assertEqual(arabic_numerals.tolist(), [10, -1])
+        self.assertEqual(valid.tolist(), [True, False])
+
+    def test_matches_scalar(self):
+        roman_numerals = ["".join(chars) for length in range(4)
+                          for chars in itertools.product("IVXLCDMi ", repeat=length)]
+        roman_numerals.extend(arabic_to_roman(arabic_numeral) for arabic_numeral in range(1, 3900))
+        self.assertEqual(roman_to_arabic_array(roman_numerals).tolist(),
+                         [roman_to_arabic(roman_numeral) for roman_numeral in roman_numerals])
+
+
+@unittest.skipUnless(numpy, "requires NumPy")
+class TestArabicToRomanArray(unittest.TestCase):
+    """
+    arabic_to_roman_array(arabic_numerals, mask)
+    """
+    def test_int_array(self):
+        self.assertEqual(arabic_to_roman_array(numpy.array([1, 24, 0, -1, 3900])).tolist(),
+                         ["I", "XXIV", "", "", ""])
+
+    def test_unsigned_array(self):
+        self.assertEqual(arabic_to_roman_array(numpy.array([1, 3899], dtype=numpy.uint16)).tolist(),
+                         ["I", "MMMDCCCXCIX"])
+
+    def test_small_array(self):
+        for dtype in (numpy.int8, numpy.uint8):
+            self.assertEqual(arabic_to_roman_array(numpy.array([5, 0, 127], dtype=dtype)).tolist(),
+                             ["V", "", "CXXVII"])
+        self.assertEqual(arabic_to_roman_array(numpy.array([-5], dtype=numpy.int8)).tolist(), [""])
+        self.assertEqual(arabic_to_roman_array(numpy.array([2 ** 64 - 1], dtype=numpy.uint64)).tolist(), [""])
+
+    def test_str_array(self):
+        self.assertEqual(arabic_to_roman_array(numpy.array(["1", "0012"])).tolist(), ["I", ""])
+
+    def test_float_array(self):
+        self.assertEqual(arabic_to_roman_array(numpy.array([1.0, 2.5])).tolist(), ["", ""])
+
+    def test_shape(self):
+        self.assertEqual(arabic_to_roman_array([[1, 2], [3, 4]]).tolist(), [["I", "II"], ["III", "IV"]])
+
+    def test_empty(self):
+        self.assertEqual(arabic_to_roman_array(numpy.array([], dtype=int)).tolist(), [])
+
+    def test_mask(self):
+        roman_numerals, valid = arabic_to_roman_array([10, 0], mask=True)
+        self.assertEqual(roman_numerals.tolist(), ["X", ""])
+        self.assertEqual(valid.tolist(), [True, False])
+
+    def test_matches_scalar(self):
+        arabic_numerals = numpy.arange(-10, 4010)
+        self.assertEqual(arabic_to_roman_array(arabic_numerals).tolist(),
+                         [arabic_to_roman(arabic_numeral) for arabic_numeral in arabic_numerals.tolist()])
+
+
+@unittest.skipUnless(pandas, "requires pandas")
+class TestRomanAccessor(unittest.TestCase):
+    """
+    RomanAccessor(series), as series.roman
+    """
+    @classmethod
+    def setUpClass(cls):
+        register_pandas_accessor()
+
+    def test_registered(self):
+        self.assertTrue(register_pandas_accessor())  # Registered once, no warning from pandas either
+        self.assertIsInstance(pandas.Series([], dtype=object).roman, RomanAccessor)
+
+    def test_to_arabic(self):
+        series = pandas.Series(["XIV", "xiv", None, "IIII", "MMM", "XIV"], index=list("abcdef"), name="numerals")
+        arabic_numerals = series.roman.to_arabic()
+        self.assertEqual(arabic_numerals.tolist(), [14, 14, -1, -1, 3000, 14])
+        self.assertEqual(arabic_numerals.index.tolist(), list("abcdef"))
+        self.assertEqual(arabic_numerals.name, "numerals")
+
+    def test_to_arabic_engine(self):
+        self.assertEqual(pandas.Series(["XIV", "IC"]).roman.to_arabic(engine="rules").tolist(), [14, -1])
+
+    def test_to_arabic_categorical(self):
+        self.assertEqual(pandas.Series(["XIV", "IV", "XIV"], dtype="category").roman.to_arabic().tolist(), [14, 4, 14])
+
+    def test_to_roman(self):
+        self.assertEqual(pandas.Series([14, 0, 3899, 14]).roman.to_roman().tolist(), ["XIV", "", "MMMDCCCXCIX", "XIV"])
+
+    def test_to_roman_missing(self):
+        self.assertEqual(pandas.Series([14, None], dtype="Int64").roman.to_roman().tolist(), ["XIV", ""])
+        self.assertEqual(pandas.Series([14.0, float("nan")]).roman.to_roman().tolist(), ["", ""])
+
+    def test_is_valid(self):
+        self.assertEqual(pandas.Series(["XIV", "VV", None]).roman.is_valid().tolist(), [True, False, False])
+
+    def test_empty(self):
+        self.assertEqual(pandas.Series([], dtype=object).roman.to_arabic().tolist(), [])
+        self.assertEqual(pandas.Series([], dtype=int).roman.to_roman().tolist(), [])
+
+    def test_matches_scalar(self):
+        roman_numerals = [arabic_to_roman(arabic_numeral) for arabic_numeral in range(1, 3900)] + ["", "ZZ", "iiii"]
+        self.assertEqual(pandas.Series(roman_numerals * 2).roman.to_arabic().tolist(),
+                         [roman_to_arabic(roman_numeral) for roman_numeral in roman_numerals * 2])
+
+
+class TestRomanToArabicBytes(unittest.TestCase):
+    """
+    roman_to_arabic_bytes(roman_numeral)
+    """
+    def test_bytes(self):
+        self.assertEqual(roman_to_arabic_bytes(b"MCMXCIX"), 1999)
+
+    def test_lower_case(self):
+        self.assertEqual(roman_to_arabic_bytes(b"mMmccCXXXviii"), 3338)
+
+    def test_bytearray(self):
+        self.assertEqual(roman_to_arabic_bytes(bytearray(b"xiv")), 14)
+
+    def test_memoryview_slice(self):
+        self.assertEqual(roman_to_arabic_bytes(memoryview(b"1 XIV 2")[2:5]), 14)
+
+    def test_invalid(self):
+        self.assertEqual(roman_to_arabic_bytes(b"IIII"), -1)
+
+    def test_empty(self):
+        self.assertEqual(roman_to_arabic_bytes(b""), -1)
+
+    def test_too_long(self):
+        self.assertEqual(roman_to_arabic_bytes(bytearray(b"M" * 15)), -1)
+
+    def test_not_ascii(self):
+        self.assertEqual(roman_to_arabic_bytes("Ⅻ".encode("utf-8")), -1)
+
+    def test_not_bytes(self):
+        for roman_numeral in ("XIV", 14, None, memoryview(bytes(4)).cast("I")):
+            self.assertEqual(roman_to_arabic_bytes(roman_numeral), -1)
+
+    def test_matches_table_engine(self):
+        for roman_numeral in itertools.product("IVXLCDMi ", repeat=3):
+            roman_numeral = "".join(roman_numeral)
+            self.assertEqual(roman_to_arabic_bytes(roman_numeral.encode("ascii")),
+                             roman_to_arabic_table(roman_numeral))
+
+    def test_every_entry_point(self):
+        for roman_numeral in (b"xiv", bytearray(b"XIV"), memoryview(b"1 XIV 2")[2:5]):
+            for engine, (roman_to_arabic_, _) in RomanNumeralsConverter.ENGINES.items():
+                self.assertEqual(roman_to_arabic_(roman_numeral), 14, engine)
+                self.assertEqual(roman_to_arabic(roman_numeral, engine), 14, engine)
+                self.assertEqual(roman_to_arabic_many([roman_numeral], engine=engine), [14], engine)
+            self.assertEqual(roman_sort_key(roman_numeral), 14)
+
+    def test_every_engine_invalid(self):
+        for roman_numeral in (b"IIII", bytearray(b"x" * 15), memoryview(bytes(4)).cast("I")):
+            for engine, (roman_to_arabic_, _) in RomanNumeralsConverter.ENGINES.items():
+                self.assertEqual(roman_to_arabic_(roman_numeral), -1, engine)
+
+
+class TestRomanToArabicBuffer(unittest.TestCase):
+    """
+    roman_to_arabic_buffer(buffer, delimiter)
+    """
+    def test_buffer(self):
+        arabic_numerals, errors = roman_to_arabic_buffer(b"I\nxiv\nIIII\n\nMCM")
+        self.assertEqual(arabic_numerals.typecode, "H")
+        self.assertEqual(list(arabic_numerals), [1, 14, 0, 0, 1900])
+        self.assertEqual(list(errors), [0, 0, 1, 1, 0])
+
+    def test_trailing_delimiter(self):
+        self.assertEqual(list(roman_to_arabic_buffer(b"I\nII\n")[0]), [1, 2])
+
+    def test_empty(self):
+        self.assertEqual(roman_to_arabic_buffer(b""), (array.array("H"), bytearray()))
+
+    def test_delimiter(self):
+        self.assertEqual(list(roman_to_arabic_buffer(bytearray(b"V,X"), b",")[0]), [5, 10])
+
+    def test_delimiter_not_a_byte(self):
+        self.assertRaises(ValueError, roman_to_arabic_buffer, b"V\r\nX", b"\r\n")
+
+    def test_numerals_across_chunks(self):
+        roman_numerals = "\n".join(arabic_to_roman(arabic_numeral) for arabic_numeral in range(1, 3900))
+        roman_numerals = (roman_numerals + "\n" + "X" * 100 + "\n") * 20
+        default_chunk = RomanNumeralsConverter.MAX_ROMAN_BYTES_CHUNK
+        try:
+            RomanNumeralsConverter.MAX_ROMAN_BYTES_CHUNK = 7
+            arabic_numerals, errors = roman_to_arabic_buffer(memoryview(roman_numerals.encode("ascii")))
+        finally:
+            RomanNumeralsConverter.MAX_ROMAN_BYTES_CHUNK = default_chunk
+        self.assertEqual(list(arabic_numerals), [max(roman_to_arabic_bytes(roman_numeral), 0)
+                                                 for roman_numeral in roman_numerals.encode("ascii").split()])
+        self.assertEqual(sum(errors), 40)  # 3888 (longer than 14 characters) and the X * 100
+
+    def test_mmap(self):
+        with tempfile.TemporaryFile() as numerals_file:
+            numerals_file.write(b"XIV\nmcm\nIC\n")
+            numerals_file.flush()
+            with mmap.mmap(numerals_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                arabic_numerals, errors = roman_to_arabic_buffer(buffer)
+        self.assertEqual(list(arabic_numerals), [14, 1900, 0])
+        self.assertEqual(list(errors), [0, 0, 1])
+
+
+class TestRomanColumn(unittest.TestCase):
+    """
+    RomanColumn(values)
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "column.rmn")
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.rmdir(self.directory)
+
+    def test_values(self):
+        column = RomanColumn([1, 14, 0, 3899, -1, 70000, "14"])
+        self.assertEqual(column.values, array.array("H", [1, 14, 0, 3899, 0, 0, 0]))
+        self.assertEqual(list(column), ["I", "XIV", "", "MMMDCCCXCIX", "", "", ""])
+
+    def test_matches_arabic_to_roman(self):
+        column = RomanColumn(range(4000))
+        self.assertEqual(list(column), [arabic_to_roman(arabic_numeral) for arabic_numeral in range(4000)])
+
+    def test_array_not_copied(self):
+        values = array.array("H", [1, 2])
+        self.assertIs(RomanColumn(values).values, values)
+
+    def test_from_roman(self):
+        column = RomanColumn.from_roman(["XIV", "IIII", "mcm"])
+        self.assertEqual(list(column.values), [14, 0, 1900])
+        self.assertEqual(list(column), ["XIV", "", "MCM"])
+
+    def test_getitem(self):
+        column = RomanColumn([1, 14, 1900])
+        self.assertEqual((column[1], column[-1], len(column)), ("XIV", "MCM", 3))
+        self.assertEqual(list(column[::2]), ["I", "MCM"])
+
+    def test_save_load(self):
+        RomanColumn(range(1, 3900)).save(self.path)
+        self.assertEqual(os.path.getsize(self.path), 16 + 2 * 3899)
+
+        for mmap_file in (True, False):
+            with RomanColumn.load(self.path, mmap=mmap_file) as column:
+                self.assertEqual(len(column), 3899)
+                self.assertEqual((column[0], column[3898]), ("I", "MMMDCCCXCIX"))
+                self.assertEqual(list(column[13:15]), ["XIV", "XV"])
+
+    def test_mmap(self):
+        RomanColumn([1, 14]).save(self.path)
+        column = RomanColumn.load(self.path)
+        self.assertIsInstance(column.values, memoryview)
+        column_slice = column[1:]
+        column.close()
+        self.assertRaises(ValueError, column.__getitem__, 0)
+        self.assertEqual(list(column_slice), ["XIV"])  # Slices are copied
+
+    def test_empty(self):
+        RomanColumn().save(self.path)
+        self.assertEqual(len(RomanColumn.load(self.path)), 0)
+
+    def test_not_a_column_file(self):
+        with open(self.path, "wb") as column_file:
+            column_file.write(b"XIV\nXV\n" * 4)
+        self.assertRaises(ValueError, RomanColumn.load, self.path)
+
+    def test_truncated(self):
+        RomanColumn(range(1, 100)).save(self.path)
+        with open(self.path, "r+b") as column_file:
+            column_file.truncate(100)
+        for mmap_file in (True, False):
+            self.assertRaises(ValueError, RomanColumn.load, self.path, mmap_file)
+
+
+class TestRomanSortKey(unittest.TestCase):
+    """
+    roman_sort_key(roman_numeral)
+    """
+    def test_sorted(self):
+        self.assertEqual(sorted(["XC", "iv", "IIII", "XL", "I", None], key=roman_sort_key),
+                         ["I", "iv", "XL", "XC", "IIII", None])
+
+    def test_value(self):
+        self.assertEqual(roman_sort_key("MCMXCIX"), 1999)
+
+
+class TestRomanIndex(unittest.TestCase):
+    """
+    RomanIndex(items, numeral)
+    """
+    def setUp(self):
+        self.index = RomanIndex([("Volume", arabic_to_roman(value)) for value in range(100, 0, -3)] +
+                                [("Volume", "IIII")], numeral=lambda item: item[1])
+
+    def test_sorted(self):
+        self.assertEqual([numeral for _, numeral in self.index][:3], ["I", "IV", "VII"])
+        self.assertEqual(list(self.index)[-1], ("Volume", "IIII"))  # Invalid, last
+        self.assertEqual(len(self.index), 35)
+
+    def test_range(self):
+        self.assertEqual([numeral for _, numeral in self.index.range("XL", "L")], ["XL", "XLIII", "XLVI", "XLIX"])
+
+    def test_arabic_bounds(self):
+        self.assertEqual(self.index.range(40, 50), self.index.range("xl", "l"))
+
+    def test_empty_range(self):
+        self.assertEqual(self.index.range("L", "XL"), [])
+
+    def test_invalid_items_out_of_range(self):
+        self.assertNotIn(("Volume", "IIII"), self.index.range(1, 10 ** 6))
+
+    def test_invalid_bound(self):
+        self.assertRaises(ValueError, self.index.range, "IIII", "X")
+
+    def test_insert(self):
+        self.index.insert(("Appendix", "xli"))
+        self.index.insert(("Volume", "IC"))
+        self.assertEqual(self.index.range("XL", "XLI"), [("Volume", "XL"), ("Appendix", "xli")])
+        self.assertEqual(list(self.index)[-2:], [("Volume", "IIII"), ("Volume", "IC")])
+
+    def test_insert_after_equal(self):
+        index = RomanIndex(["X", "V"])
+        index.insert("x")
+        self.assertEqual(list(index), ["V", "X", "x"])
+
+    def test_matches_sorted(self):
+        roman_numerals = [arabic_to_roman(value * 7919 % 3899 + 1) for value in range(1000)]
+        index = RomanIndex()
+        for roman_numeral in roman_numerals:
+            index.insert(roman_numeral)
+        self.assertEqual(list(index), sorted(roman_numerals, key=roman_to_arabic))
+
+
+class TestDetectNumeralType(unittest.TestCase):
+    """
+    detect_numeral_type(numeral)
+    """
+    def test_roman(self):
+        self.assertEqual(detect_numeral_type("XIV"), "roman")
+
+    def test_lower_case_roman(self):
+        self.assertEqual(detect_numeral_type("xiv"), "roman")
+
+    def test_arabic(self):
+        self.assertEqual(detect_numeral_type("14"), "arabic")
+
+    def test_negative_arabic(self):
+        self.assertEqual(detect_numeral_type("-14"), "arabic")
+
+    def test_empty_string(self):
+        self.assertEqual(detect_numeral_type(""), "roman")
+
+
+class TestReadNumerals(unittest.TestCase):
+    """
+    read_numerals(stream)
+    """
+    def test_lines(self):
+        self.assertEqual(list(read_numerals(io.StringIO("X\r\n 12 \n\nmcm"))), ["X", "12", "", "mcm"])
+
+    def test_empty(self):
+        self.assertEqual(list(read_numerals(io.StringIO(""))), [])
+
+    def test_lazy(self):
+        numerals = read_numerals(iter(["X\n", "Y\n"]))
+        self.assertEqual(next(numerals), "X")
+
+
+class TestConvertStream(unittest.TestCase):
+    """
+    convert_stream(numerals, numeral_type, engine)
+    """
+    def test_auto(self):
+        self.assertEqual(list(convert_stream(["X", "12", "", "0012", "IIII"])), ["10", "XII", "-1", "", "-1"])
+
+    def test_roman(self):
+        self.assertEqual(list(convert_stream(["X", "12"], "roman")), ["10", "-1"])
+
+    def test_arabic(self):
+        self.assertEqual(list(convert_stream(["X", "12"], "arabic")), ["", "XII"])
+
+    def test_engine(self):
+        self.assertEqual(list(convert_stream(["X", "12"], engine="table")), ["10", "XII"])
+
+
+class TestWriteLines(unittest.TestCase):
+    """
+    write_lines(lines, output, buffer_lines)
+    """
+    def test_lines(self):
+        output = io.StringIO()
+        write_lines(["10", "", "XII"], output)
+        self.assertEqual(output.getvalue(), "10\n\nXII\n")
+
+    def test_empty(self):
+        output = io.StringIO()
+        write_lines([], output)
+        self.assertEqual(output.getvalue(), "")
+
+    def test_buffered(self):
+        writes = []
+
+        class Output:
+            def write(self, string):
+                writes.append(string)
+
+        write_lines(["I", "II", "III", "IV", "V"], Output(), buffer_lines=2)
+        self.assertEqual(writes, ["I\nII\n", "III\nIV\n", "V\n"])
+
+
+class TestIncrementalRomanParser(unittest.TestCase):
+    """
+    IncrementalRomanParser().feed(char), .value, .reset()
+    Must agree with the rule-based engine on every prefix
+    """
+    def assertPrefixes(self, string):
+        parser = IncrementalRomanParser()
+        for end in range(1, len(string) + 1):
+            expected = roman_to_arabic_rules(string[:end])
+            self.assertEqual(parser.feed(string[end - 1]), expected != -1, string[:end])
+            self.assertEqual(parser.value, expected, string[:end])
+
+    def test_all_roman_numerals(self):
+        for arabic_numeral in range(1, 4000):
+            self.assertPrefixes(roman_digits(arabic_numeral))
+            self.assertPrefixes(roman_digits(arabic_numeral).lower())
+
+    def test_invalid_roman_numerals(self):
+        for chars in itertools.product("IVXLCDM", repeat=5):
+            self.assertPrefixes("".join(chars))
+
+    def test_roman_non_numerals(self):
+        for string in ("Z", "X Z", "\u0131V", "\u2160", "MMMMMMMMMMMMMM", "MMMDCCCLXXXVIII"):
+            self.assertPrefixes(string)
+
+    def test_rejects_for_good(self):
+        parser = IncrementalRomanParser()
+        self.assertTrue(parser.feed("X"))
+        self.assertFalse(parser.feed("Z"))
+        self.assertFalse(parser.feed("I"))
+        self.assertEqual(parser.value, -1)
+
+    def test_not_a_character(self):
+        for char in (None, 1, "XI", ""):
+            parser = IncrementalRomanParser()
+            self.assertFalse(parser.feed(char))
+            self.assertEqual(parser.value, -1)
+
+    def test_empty(self):
+        self.assertEqual(IncrementalRomanParser().value, -1)
+
+    def test_reset(self):
+        parser = IncrementalRomanParser()
+        for char in "IIII":
+            parser.feed(char)
+        parser.reset()
+        self.assertTrue(all(parser.feed(char) for char in "XIV"))
+        self.assertEqual(parser.value, 14)
+
+
+class TestTextSegments(unittest.TestCase):
+    """
+    text_segments(text)
+    """
+    def test_whole_text(self):
+        self.assertEqual(list(text_segments("Chapter XIV.")), [(0, "Chapter XIV.", 0)])
+
+    def test_word_split_between_chunks(self):
+        self.assertEqual(list(text_segments(["Chapter X", "IV, Part ", "ii"])),
+                         [(0, "Chapter ", 0), (7, " XIV, Part ", 1), (17, " ii", 1)])
+
+    def test_long_word_not_held_back(self):
+        self.assertEqual(list(text_segments(["a" * 20, "bc"])), [(0, "a" * 20, 0), (19, "abc", 1)])
+
+    def test_empty(self):
+        self.assertEqual(list(text_segments([])), [])
+
+
+class TestFindRomanNumerals(unittest.TestCase):
+    """
+    find_roman_numerals(text, engine, ignore_case, skip)
+    """
+    text = "Chapter XIV: Louis XVI, part iii (not XIIII, nor XIVth, nor éIV)."
+
+    def test_text(self):
+        self.assertEqual(list(find_roman_numerals(self.text)), [((8, 11), "XIV", 14), ((19, 22), "XVI", 16)])
+
+    def test_ignore_case(self):
+        self.assertEqual([numeral for _, numeral, _ in find_roman_numerals(self.text, ignore_case=True)],
+                         ["XIV", "XVI", "iii"])
+
+    def test_plain_english(self):
+        for text in ("I think I did it, and I would mix it, if I may.", "Did I? Civil, vivid and mild, I mimic Lilli.",
+                     "i think i did it."):
+            self.assertEqual(list(find_roman_numerals(text)), [], text)
+
+    def test_plain_english_ignore_case(self):
+        self.assertEqual([numeral for _, numeral, _ in find_roman_numerals("I did mix it, I mimic", ignore_case=True)],
+                         ["mix"])
+
+    def test_skip(self):
+        self.assertEqual([numeral for _, numeral, _ in find_roman_numerals("World War I, part V", skip=())], ["I", "V"])
+        self.assertEqual([numeral for _, numeral, _ in find_roman_numerals("Chapter V", skip={"V"})], [])
+
+    def test_engine(self):
+        self.assertEqual(list(find_roman_numerals("MMMDCCCLXXXVIII", engine="rules")), [])
+
+    def test_chunks(self):
+        for chunk_size in range(1, 20):
+            chunks = [self.text[i:i + chunk_size] for i in range(0, len(self.text), chunk_size)]
+            self.assertEqual(list(find_roman_numerals(chunks, ignore_case=True)),
+                             list(find_roman_numerals(self.text, ignore_case=True)))
+
+    def test_file(self):
+        self.assertEqual(list(find_roman_numerals(io.StringIO("Part\nIV\n"))), [((5, 7), "IV", 4)])
+
+    def test_long_word_split_between_chunks(self):
+        self.assertEqual(list(find_roman_numerals(["X" * 10, "X" * 10, " V"])), [((21, 22), "V", 5)])
+
+    def test_no_numerals(self):
+        self.assertEqual(list(find_roman_numerals("no numerals here")), [])
+
+
+class TestReplaceRomanNumerals(unittest.TestCase):
+    """
+    replace_roman_numerals(text, replacement, engine, ignore_case, skip)
+    """
+    def test_text(self):
+        self.assertEqual("".join(replace_roman_numerals("Chapter XIV: Louis XVI, part iii (not XIIII)")),
+                         "Chapter 14: Louis 16, part iii (not XIIII)")
+
+    def test_ignore_case(self):
+        self.assertEqual("".join(replace_roman_numerals("Chapter XIV, part iii", ignore_case=True)),
+                         "Chapter 14, part 3")
+
+    def test_plain_english(self):
+        text = "I think I would mix it, if I may. Did I? I mimic a vivid, civil Lilli."
+        self.assertEqual("".join(replace_roman_numerals(text)), text)
+        self.assertEqual("".join(replace_roman_numerals(text.lower())), text.lower())
+
+    def test_replacement(self):
+        self.assertEqual("".join(replace_roman_numerals("Louis XVI", lambda numeral, value: "%s (%d)" %
+                                                        (numeral, value))), "Louis XVI (16)")
+
+    def test_chunks(self):
+        text = "Chapter XIV: Louis XVI, part iii (not XIIII)\n" * 3
+        for chunk_size in range(1, 20):
+            chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+            self.assertEqual("".join(replace_roman_numerals(chunks, ignore_case=True)),
+                             text.replace("XIV", "14").replace("XVI", "16").replace("iii", "3"))
+
+
+class TestChunks(unittest.TestCase):
+    """
+    chunks(iterable, chunk_size)
+    """
+    def test_even(self):
+        self.assertEqual(list(chunks(range(4), 2)), [[0, 1], [2, 3]])
+
+    def test_uneven(self):
+        self.assertEqual(list(chunks(range(5), 2)), [[0, 1], [2, 3], [4]])
+
+    def test_empty(self):
+        self.assertEqual(list(chunks([], 2)), [])
+
+
+class TestConvertChunk(unittest.TestCase):
+    """
+    convert_chunk((numerals, numeral_type, engine))
+    """
+    def test_chunk(self):
+        self.assertEqual(convert_chunk((["X", "12"], "auto", "rules")), ["10", "XII"])
+
+
+def shared_table_type():
+    """
+    Type of the table of Roman numerals of a worker process.
+    """
+    return type(RomanNumeralsConverter._roman_numerals_table).__name__
+
+
+@unittest.skipUnless(sys.version_info >= (3, 8), "requires Python 3.8+ (multiprocessing.shared_memory)")
+class TestSharedRomanNumerals(unittest.TestCase):
+    """
+    publish_conversion_table(), SharedRomanNumerals(block), attach_conversion_table(name)
+    """
+    def setUp(self):
+        from multiprocessing import shared_memory
+
+        self.block = publish_conversion_table()
+        self.table = SharedRomanNumerals(shared_memory.SharedMemory(self.block.name))
+
+    def tearDown(self):
+        self.table.close()
+        self.block.close()
+        self.block.unlink()
+
+    def test_same_as_conversion_tables(self):
+        self.assertEqual([self.table[value] for value in range(len(self.table))], list(conversion_tables()[0]))
+
+    def test_out_of_range(self):
+        self.assertRaises(IndexError, self.table.__getitem__, 3900)
+        self.assertRaises(IndexError, self.table.__getitem__, -1)
+
+    def test_attach_in_worker(self):
+        import multiprocessing
+
+        with multiprocessing.Pool(1, attach_conversion_table, (self.block.name, )) as pool:
+            self.assertEqual(pool.apply(shared_table_type), "SharedRomanNumerals")
+            self.assertEqual(pool.apply(arabic_to_roman_table, (1994, )), "MCMXCIV")
+            self.assertEqual(pool.apply(roman_to_arabic_table, ("MCMXCIV", )), 1994)
+
+
+class TestConvertParallel(unittest.TestCase):
+    """
+    convert_parallel(numerals, numeral_type, engine, jobs, chunk_size, shared_table)
+    """
+    def test_keeps_order(self):
+        numerals = [str(arabic_numeral) for arabic_numeral in range(1, 3900)]
+        self.assertEqual(list(convert_parallel(numerals, "arabic", jobs=2, chunk_size=100)),
+                         list(convert_stream(numerals, "arabic")))
+
+    def test_auto(self):
+        self.assertEqual(list(convert_parallel(iter(["X", "12", "IIII"]), jobs=2, chunk_size=1)), ["10", "XII", "-1"])
+
+    def test_empty(self):
+        self.assertEqual(list(convert_parallel([], jobs=1)), [])
+
+    def test_unknown_engine(self):
+        self.assertRaises(ValueError, list, convert_parallel(["X"], engine="abacus", jobs=1))
+
+    @unittest.skipUnless(sys.version_info >= (3, 8), "requires Python 3.8+ (multiprocessing.shared_memory)")
+    def test_shared_table(self):
+        numerals = [str(arabic_numeral) for arabic_numeral in range(1, 3900)] + ["XIV", "IIII"]
+        self.assertEqual(list(convert_parallel(numerals, engine="table", jobs=2, chunk_size=100, shared_table=True)),
+                         list(convert_stream(numerals, engine="table")))
+
+
+class TestMain(unittest.TestCase):
+    """
+    main(arguments)
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.input = os.path.join(self.directory, "numerals.txt")
+        self.output = os.path.join(self.directory, "conversions.txt")
+        with open(self.input, "w") as input_file:
+            input_file.write("X\n12\n\nIIII\n")
+
+    def tearDown(self):
+        for path in (self.input, self.output):
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(self.directory)
+
+    def read_output(self):
+        with open(self.output) as output_file:
+            return output_file.read()
+
+    def assertExits(self, arguments):
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertRaises(SystemExit, main, arguments)
+
+    def test_numeral(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main(["roman", "xiv"])
+        self.assertEqual(output.getvalue(), "Arabic Numeral: 14\n")
+
+    def test_input(self):
+        main(["auto", "--input", self.input, "--output", self.output])
+        self.assertEqual(self.read_output(), "10\nXII\n-1\n-1\n")
+
+    def test_jobs(self):
+        main(["auto", "--input", self.input, "--output", self.output, "--jobs", "2", "--chunk-size", "1"])
+        self.assertEqual(self.read_output(), "10\nXII\n-1\n-1\n")
+
+    def test_invalid_jobs(self):
+        self.assertExits(["auto", "--input", self.input, "--output", self.output, "--jobs", "-1"])
+        self.assertExits(["text", "--input", self.input, "--output", self.output, "--jobs", "2"])
+
+    def test_invalid_chunk_size(self):
+        self.assertExits(["auto", "--input", self.input, "--output", self.output, "--jobs", "2", "--chunk-size", "0"])
+
+    def test_numeral_and_input(self):
+        self.assertExits(["auto", "X", "--input", self.input])
+
+
+class UnhashedString(str):
+    """
+    String that fails when hashed (read whole), to check that it is not cached.
+    """
+    def __hash__(self):
+        raise AssertionError("hash() called on %d characters" % len(self))
+
+
+class TestMemoize(unittest.TestCase):
+    """
+    memoize(function, maxsize)
+    """
+    def setUp(self):
+        self.calls = []
+
+        def convert(numeral):
+            self.calls.append(numeral)
+            return arabic_to_roman(numeral)
+
+        self.convert = convert
+
+    def test_converts(self):
+        cached = memoize(roman_to_arabic)
+        self.assertEqual([cached(numeral) for numeral in ("XIV", "xiv", "IIII", "XIV")], [14, 14, -1, 14])
+
+    def test_hits_and_misses(self):
+        cached = memoize(self.convert)
+        for numeral in (1, 2, 1, 1, "junk", "junk"):
+            cached(numeral)
+        self.assertEqual(self.calls, [1, 2, "junk"])
+        self.assertEqual(cached.cache_info(), {"hits": 3, "misses": 3, "evictions": 0, "size": 3, "maxsize": 1024})
+
+    def test_type_aware(self):
+        cached = memoize(self.convert)
+        self.assertEqual([cached(1), cached("1"), cached(True), cached(1.0)], ["I", "I", "", ""])
+        self.assertEqual(len(self.calls), 4)
+
+    def test_evicts_least_recently_used(self):
+        cached = memoize(self.convert, maxsize=2)
+        for numeral in (1, 2, 1, 3, 1, 2):  # 2 is evicted by 3 (1 was used more recently), then 3 by 2
+            cached(numeral)
+        self.assertEqual(self.calls, [1, 2, 3, 2])
+        self.assertEqual(cached.cache_info()["evictions"], 2)
+        self.assertEqual(cached.cache_info()["size"], 2)
+
+    def test_bounded(self):
+        cached = memoize(self.convert, maxsize=10)
+        for numeral in range(1000):
+            cached("junk%d" % numeral)
+        self.assertEqual(cached.cache_info()["size"], 10)
+        self.assertEqual(cached.cache_info()["evictions"], 990)
+
+    def test_long_numerals_not_cached(self):
+        cached = memoize(self.convert)
+        for numeral in ("M" * 1000000, "M" * 15, "1" * 5, b"M" * 15, memoryview(b"M" * 15), memoryview(b"1" * 5),
+                        UnhashedString("M" * 1000)):
+            self.assertEqual(cached(numeral), "")
+        self.assertEqual(len(self.calls), 7)
+        self.assertEqual(cached.cache_info(), {"hits": 0, "misses": 0, "evictions": 0, "size": 0, "maxsize": 1024})
+        self.assertEqual(memoize(roman_to_arabic)(memoryview(b"XXXXXXXX")), -1)
+
+    def test_no_cache(self):
+        cached = memoize(self.convert, maxsize=0)
+        cached(1)
+        cached(1)
+        self.assertEqual(self.calls, [1, 1])
+        self.assertEqual(cached.cache_info()["size"], 0)
+
+    def test_unhashable(self):
+        cached = memoize(roman_to_arabic)
+        self.assertEqual(cached(["X"]), -1)
+        self.assertEqual(cached.cache_info()["misses"], 1)
+        self.assertEqual(cached.cache_info()["size"], 0)
+
+    def test_cache_clear(self):
+        cached = memoize(self.convert)
+        cached(1)
+        cached(1)
+        cached.cache_clear()
+        self.assertEqual(cached.cache_info(), {"hits": 0, "misses": 0, "evictions": 0, "size": 0, "maxsize": 1024})
+        cached(1)
+        self.assertEqual(self.calls, [1, 1])
+
+    def test_resize(self):
+        cached = memoize(self.convert, maxsize=3)
+        for numeral in (1, 2, 3):
+            cached(numeral)
+        cached.resize(1)
+        self.assertEqual(cached.cache_info()["size"], 1)
+        self.assertEqual(cached.cache_info()["evictions"], 2)
+        cached(3)  # Most recently used, kept
+        self.assertEqual(self.calls, [1, 2, 3])
+
+
+class TestRoman(unittest.TestCase):
+    """
+    Roman(numeral)
+    """
+    def test_from_roman_numeral(self):
+        self.assertEqual(Roman("xiv").value, 14)
+
+    def test_from_int(self):
+        self.assertEqual(str(Roman(3899)), "MMMDCCCXCIX")
+
+    def test_from_roman(self):
+        self.assertEqual(Roman(Roman(14)).value, 14)
+
+    def test_invalid(self):
+        for numeral in ("IIII", "", None, 0, 3900, -1, 14.0):
+            self.assertRaises(ValueError, Roman, numeral)
+
+    def test_arithmetic(self):
+        self.assertEqual([str(result) for result in (Roman("XIV") + Roman("II"), Roman("XIV") - 2,
+                                                     Roman("XIV") * Roman("II"), 1 + Roman("XIV"),
+                                                     20 - Roman("XIV"), 2 * Roman("XIV"))],
+                         ["XVI", "XII", "XXVIII", "XV", "VI", "XXVIII"])
+
+    def test_out_of_range(self):
+        self.assertRaises(ValueError, lambda: Roman("XIV") - Roman("XIV"))
+        self.assertRaises(ValueError, lambda: Roman(3899) + 1)
+        self.assertRaises(ValueError, lambda: Roman(2000) * 2)
+
+    def test_unsupported_operand(self):
+        self.assertRaises(TypeError, lambda: Roman("XIV") + 1.5)
+        self.assertRaises(TypeError, lambda: Roman("XIV") + "I")
+
+    def test_comparison(self):
+        self.assertTrue(Roman("XIV") == 14 == Roman(14))
+        self.assertTrue(Roman("XIV") != Roman("XV"))
+        self.assertTrue(Roman("IX") < Roman("X") <= 10 < Roman("XI"))
+        self.assertFalse(Roman("XIV") == "XIV")
+        self.assertEqual(sorted([Roman(3), Roman(1), Roman(2)]), [1, 2, 3])
+
+    def test_hash(self):
+        self.assertEqual({Roman("XIV"): "a"}[14], "a")
+        self.assertEqual(len({Roman("XIV"), Roman(14), 14}), 1)
+
+    def test_int(self):
+        self.assertEqual(int(Roman("XIV")), 14)
+        self.assertEqual(list(range(20))[Roman("XIV")], 14)
+
+    def test_lazy_numeral(self):
+        roman = Roman("XIV") + 1
+        self.assertIsNone(roman._numeral)
+        self.assertEqual(repr(roman), "Roman('XV')")
+        self.assertEqual(roman._numeral, "XV")
+
+    def test_immutable(self):
+        roman = Roman("XIV")
+        with self.assertRaises(AttributeError):
+            roman.value = 15
+        with self.assertRaises(AttributeError):
+            roman.numeral = "XV"
+
+
+class TestInputClass(unittest.TestCase):
+    """
+    input_class(roman_numeral)
+    """
+    def test_classes(self):
+        for roman_numeral, numeral_class in (("XIV", "upper_case"), ("xiv", "lower_case"), ("xIv", "mixed_case"),
+                                             ("X1V", "not_roman"), ("M" * 15, "too_long"), ("", "empty"),
+                                             (b"XIV", "bytes"), (14, "not_a_string"), (None, "not_a_string")):
+            self.assertEqual(input_class(roman_numeral), numeral_class)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    enable_instrumentation(sample_every, max_samples), disable_instrumentation()
+    """
+    def tearDown(self):
+        disable_instrumentation()
+
+    def test_rejections_by_rule(self):
+        instrumentation = enable_instrumentation()
+        for roman_numeral in (None, "X1V", "VV", "IIII", "IVX", "IVI", "VIX", "XIV"):
+            roman_to_arabic(roman_numeral, engine="rules")
+        self.assertEqual(instrumentation.as_dict()["rejections_by_rule"],
+                         {"is_string": 1, "is_possible_roman_numeral": 1, "at_most_once_vld": 1,
+                          "at_most_3_in_row_ixcm": 1, "subtractive_combination_validity": 1,
+                          "descending_order": 2})
+
+    def test_rejections_through_engine_function(self):
+        instrumentation = enable_instrumentation()
+        roman_to_arabic_rules("VV")
+        self.assertEqual(instrumentation.rejections["at_most_once_vld"], 1)
+        self.assertEqual(sum(instrumentation.calls.values()), 0)  # Only roman_to_arabic() calls are counted
+
+    def test_calls_by_class(self):
+        instrumentation = enable_instrumentation()
+        for roman_numeral in ("XIV", "IIII", "xiv", b"XIV", ""):
+            roman_to_arabic(roman_numeral, engine="table")
+        metrics = instrumentation.as_dict()
+        self.assertEqual(metrics["calls_by_class"],
+                         {"upper_case": 2, "lower_case": 1, "mixed_case": 0, "not_roman": 0, "too_long": 0,
+                          "empty": 1, "bytes": 1, "not_a_string": 0})
+        self.assertEqual(metrics["rejections_by_class"]["upper_case"], 1)
+        self.assertEqual(metrics["rejections_by_class"]["empty"], 1)
+        self.assertEqual(sum(metrics["rejections_by_rule"].values()), 0)  # Not the rule-based engine
+
+    def test_latency_samples(self):
+        instrumentation = enable_instrumentation(sample_every=2, max_samples=3)
+        for _ in range(10):
+            self.assertEqual(roman_to_arabic("XIV"), 14)
+        latency = instrumentation.as_dict()["latency_seconds"]
+        self.assertEqual(instrumentation.sampled, 5)
+        self.assertEqual(latency["samples"], 3)
+        self.assertTrue(0 < latency["p50"] <= latency["p99"])
+
+    def test_no_samples(self):
+        latency = enable_instrumentation().as_dict()["latency_seconds"]
+        self.assertEqual((latency["samples"], latency["p50"], latency["p99"]), (0, None, None))
+
+    def test_prometheus(self):
+        instrumentation = enable_instrumentation(sample_every=1)
+        roman_to_arabic("VV", engine="rules")
+        lines = instrumentation.prometheus().splitlines()
+        self.assertIn("# TYPE roman_numerals_rejections_total counter", lines)
+        self.assertIn('roman_numerals_rejections_total{rule="at_most_once_vld"} 1', lines)
+        self.assertIn('roman_numerals_calls_total{input_class="upper_case"} 1', lines)
+        self.assertIn('roman_numerals_call_rejections_total{input_class="upper_case"} 1', lines)
+        self.assertIn("roman_numerals_latency_seconds_count 1", lines)
+
+    def test_disable(self):
+        instrumentation = enable_instrumentation()
+        self.assertIs(disable_instrumentation(), instrumentation)
+        roman_to_arabic("VV", engine="rules")
+        self.assertEqual(instrumentation.rejections["at_most_once_vld"], 0)
+        self.assertIsNone(disable_instrumentation())
+
+    def test_enable_resets(self):
+        enable_instrumentation()
+        roman_to_arabic("VV", engine="rules")
+        self.assertEqual(enable_instrumentation().rejections["at_most_once_vld"], 0)
+
+
+class TestRomanToArabicDiagnostic(unittest.TestCase):
+    """
+    roman_to_arabic_diagnostic(roman_numeral)
+    """
+    def test_valid(self):
+        self.assertEqual(tuple(roman_to_arabic_diagnostic("mcmXCIX")), (1999, RomanNumeralsConverter.ErrorCode.OK, -1))
+
+    def test_errors(self):
+        error_code = RomanNumeralsConverter.ErrorCode
+        for roman_numeral, error, index in ((None, error_code.NOT_A_STRING, -1),
+                                            ("", error_code.EMPTY, -1),
+                                            ("XIV!", error_code.BAD_CHARACTER, 3),
+                                            ("MMMDCCCLXXXVIII", error_code.TOO_LONG, 14),
+                                            ("XVIV", error_code.VLD_REPEATED, 3),
+                                            ("MXXXX", error_code.FOUR_IN_A_ROW, 4),
+                                            ("IL", error_code.BAD_SUBTRACTIVE_PAIR, 1),
+                                            ("XXC", error_code.BAD_SUBTRACTIVE_PAIR, 2),
+                                            ("VIX", error_code.OUT_OF_ORDER, 2),
+                                            ("XCX", error_code.OUT_OF_ORDER, 2),
+                                            ("IXC", error_code.OUT_OF_ORDER, 2),
+                                            ("IIIIV", error_code.FOUR_IN_A_ROW, 3)):
+            self.assertEqual(roman_to_arabic_diagnostic(roman_numeral), Diagnostic(-1, error, index))
+
+    def test_bytes(self):
+        error_code = RomanNumeralsConverter.ErrorCode
+        for roman_numeral in (b"xiv", bytearray(b"XIV"), memoryview(b"XIV")):
+            self.assertEqual(tuple(roman_to_arabic_diagnostic(roman_numeral)), (14, error_code.OK, -1))
+        for roman_numeral, error, index in ((b"", error_code.EMPTY, -1),
+                                            (b"X\xe2\x85\xa0", error_code.BAD_CHARACTER, 1),
+                                            (bytearray(b"M" * 15), error_code.TOO_LONG, 14),
+                                            (b"XVIV", error_code.VLD_REPEATED, 3)):
+            self.assertEqual(roman_to_arabic_diagnostic(roman_numeral), Diagnostic(-1, error, index))
+
+    def test_matches_table_engine(self):
+        for length in range(1, 5):
+            for roman_numeral in itertools.product("IVXLCDM", repeat=length):
+                roman_numeral = "".join(roman_numeral)
+                self.assertEqual(roman_to_arabic_diagnostic(roman_numeral).value,
+                                 roman_to_arabic_table(roman_numeral))
+
+    def test_canonical(self):
+        for arabic_numeral in range(1, 3900):
+            self.assertEqual(roman_to_arabic_diagnostic(arabic_to_roman(arabic_numeral)).value,
+                             roman_to_arabic(arabic_to_roman(arabic_numeral)))
+
+
+class TestArabicToRomanDiagnostic(unittest.TestCase):
+    """
+    arabic_to_roman_diagnostic(arabic_numeral)
+    """
+    def test_valid(self):
+        for arabic_numeral in (14, "14"):
+            self.assertEqual(arabic_to_roman_diagnostic(arabic_numeral),
+                             Diagnostic("XIV", RomanNumeralsConverter.ErrorCode.OK))
+
+    def test_errors(self):
+        error_code = RomanNumeralsConverter.ErrorCode
+        for arabic_numeral, error, index in (("", error_code.EMPTY, -1),
+                                             ("1.5", error_code.BAD_CHARACTER, 1),
+                                             ("-5", error_code.BAD_CHARACTER, 0),
+                                             (None, error_code.BAD_CHARACTER, 0),
+                                             (0, error_code.OUT_OF_RANGE, -1),
+                                             ("00", error_code.OUT_OF_RANGE, -1),
+                                             (3900, error_code.OUT_OF_RANGE, -1),
+                                             ("12345", error_code.OUT_OF_RANGE, 4),
+                                             ("0012", error_code.LEADING_ZEROES, 0)):
+            self.assertEqual(arabic_to_roman_diagnostic(arabic_numeral), Diagnostic("", error, index))
+
+    def test_matches_rules_engine(self):
+        for arabic_numeral in list(range(-5, 4000, 7)) + ["0%d" % arabic_numeral for arabic_numeral in range(20)]:
+            self.assertEqual(arabic_to_roman_diagnostic(arabic_numeral).value, arabic_to_roman_rules(arabic_numeral))
+
+
+class TestDiagnostic(unittest.TestCase):
+    """
+    Diagnostic(value, error, index)
+    """
+    def test_unpack(self):
+        value, error, index = Diagnostic(14, RomanNumeralsConverter.ErrorCode.OK)
+        self.assertEqual((value, error, index), (14, 0, -1))
+
+    def test_repr(self):
+        self.assertEqual(repr(Diagnostic(-1, RomanNumeralsConverter.ErrorCode.EMPTY)),
+                         "Diagnostic(value=-1, error=ErrorCode.EMPTY, index=-1)")
+
+    def test_slots(self):
+        self.assertRaises(AttributeError, setattr, Diagnostic(14, RomanNumeralsConverter.ErrorCode.OK), "other", 0)
+
+    def test_error_code(self):
+        self.assertIs(RomanNumeralsConverter.ErrorCode, RomanNumeralsConverter.error_codes())
+        self.assertEqual(RomanNumeralsConverter.ErrorCode(0).name, "OK")
+
+
+class TestRomanToArabicLenient(unittest.TestCase):
+    """
+    roman_to_arabic_lenient(roman_numeral)
+    """
+    def test_canonical(self):
+        self.assertEqual(roman_to_arabic_lenient("xiv"), (14, "XIV"))
+
+    def test_additive(self):
+        for roman_numeral, converted in (("IIII", (4, "IV")), ("VIIII", (9, "IX")), ("MDCCCCX", (1910, "MCMX")),
+                                         ("MMMDCCCCLXXXXVIIII", (3999, "MMMCMXCIX"))):
+            self.assertEqual(roman_to_arabic_lenient(roman_numeral), converted)
+
+    def test_irregular_subtractive(self):
+        for roman_numeral, converted in (("IIX", (8, "VIII")), ("IC", (99, "XCIX")), ("XIIX", (18, "XVIII"))):
+            self.assertEqual(roman_to_arabic_lenient(roman_numeral), converted)
+
+    def test_final_j(self):
+        self.assertEqual(roman_to_arabic_lenient("viij"), (8, "VIII"))
+        self.assertEqual(roman_to_arabic_lenient("ij"), (2, "II"))
+
+    def test_not_final_j(self):
+        for roman_numeral in ("JX", "JI", "IJI", "JJ", "VJV"):
+            self.assertEqual(roman_to_arabic_lenient(roman_numeral), (-1, ""), roman_numeral)
+
+    def test_subtraction_led_by_vld(self):
+        for roman_numeral in ("VX", "LC", "DM", "VL", "XVX", "MDM", "IVX"):
+            self.assertEqual(roman_to_arabic_lenient(roman_numeral), (-1, ""), roman_numeral)
+
+    def test_repeated_vld(self):
+        for roman_numeral in ("VV", "VVVV", "LL", "DDDD", "VIV", "LXL", "\u2164\u2164"):
+            self.assertEqual(roman_to_arabic_lenient(roman_numeral), (-1, ""), roman_numeral)
+
+    def test_unicode(self):
+        for roman_numeral, converted in (("\u216b", (12, "XII")),
+                                         ("\u217f\u217d\u217f\u2179\u217d\u2178", (1999, "MCMXCIX")),
+                                         ("\u2180\u2186\u2185", (1056, "MLVI"))):
+            self.assertEqual(roman_to_arabic_lenient(roman_numeral), converted)
+
+    def test_longer_than_strict(self):
+        self.assertEqual(roman_to_arabic_lenient("MMMDCCCLXXXVIII"), (3888, "MMMDCCCLXXXVIII"))
+
+    def test_bytes(self):
+        for roman_numeral in (b"XIV", bytearray(b"xiv"), memoryview(b"XIIII")):
+            self.assertEqual(roman_to_arabic_lenient(roman_numeral), (14, "XIV"))
+        for roman_numeral in (b"VX", b"\xe2\x85\xab", b"X" * 40):
+            self.assertEqual(roman_to_arabic_lenient(roman_numeral), (-1, ""), roman_numeral)
+
+    def test_invalid(self):
+        for roman_numeral in ("", "XIV!", "MMMM" + "M", "IIIIIIIIIIX", "X" * 40, "\u2182", None, 14):
+            self.assertEqual(roman_to_arabic_lenient(roman_numeral), (-1, ""))
+
+    def test_canonical_form(self):
+        for arabic_numeral in range(1, 3900):
+            roman_numeral = arabic_to_roman(arabic_numeral)
+            additive = roman_numeral.replace("CM", "DCCCC").replace("CD", "CCCC").replace("XC", "LXXXX").replace(
+                "XL", "XXXX").replace("IX", "VIIII").replace("IV", "IIII")
+            self.assertEqual(roman_to_arabic_lenient(additive), (arabic_numeral, roman_numeral))
+
+
+class TestRomanDigits(unittest.TestCase):
+    """
+    roman_digits(arabic_numeral)
+    """
+    def test_zero(self):
+        self.assertEqual(roman_digits(0), "")
+
+    def test_3999(self):
+        self.assertEqual(roman_digits(3999), "MMMCMXCIX")
+
+    def test_matches_arabic_to_roman(self):
+        for arabic_numeral in range(1, 3900):
+            self.assertEqual(roman_digits(arabic_numeral), arabic_to_roman(arabic_numeral))
+
+
+class TestCanonicalRomanValue(unittest.TestCase):
+    """
+    canonical_roman_value(roman_numeral)
+    """
+    def test_valid(self):
+        self.assertEqual(canonical_roman_value("MCMXCIX"), 1999)
+
+    def test_longest(self):
+        self.assertEqual(canonical_roman_value("MMMDCCCLXXXVIII"), 3888)
+
+    def test_empty_string(self):
+        self.assertEqual(canonical_roman_value(""), 0)
+
+    def test_invalid(self):
+        self.assertEqual(canonical_roman_value("IVI"), 0)
+
+    def test_lower_case(self):
+        self.assertEqual(canonical_roman_value("xiv"), 0)
+
+
+class TestArabicToRomanExtended(unittest.TestCase):
+    """
+    arabic_to_roman_extended(arabic_numeral, mark)
+    """
+    def test_1(self):
+        self.assertEqual(arabic_to_roman_extended(1), "I")
+
+    def test_3999(self):
+        self.assertEqual(arabic_to_roman_extended(3999), "MMMCMXCIX")
+
+    def test_4000(self):
+        self.assertEqual(arabic_to_roman_extended(4000), "I\u0305V\u0305")
+
+    def test_1234567(self):
+        self.assertEqual(arabic_to_roman_extended(1234567),
+                         "M\u0305C\u0305C\u0305X\u0305X\u0305X\u0305I\u0305V\u0305DLXVII")
+
+    def test_max(self):
+        self.assertEqual(arabic_to_roman_extended(3999999, ASCII_VINCULUM), "M_M_M_C_M_X_C_I_X_CMXCIX")
+
+    def test_ascii(self):
+        self.assertEqual(arabic_to_roman_extended(5010, ASCII_VINCULUM), "V_X")
+
+    def test_string(self):
+        self.assertEqual(arabic_to_roman_extended("10000", ASCII_VINCULUM), "X_")
+
+    def test_zero(self):
+        self.assertEqual(arabic_to_roman_extended(0), "")
+
+    def test_negative(self):
+        self.assertEqual(arabic_to_roman_extended(-4000), "")
+
+    def test_above_max(self):
+        self.assertEqual(arabic_to_roman_extended(4000000), "")
+        self.assertEqual(arabic_to_roman_extended("4000000"), "")
 
     def test_trailing_zeroes(self):
-        self.assertEquals(arabic_to_roman("00012"), "")
+        self.assertEqual(arabic_to_roman_extended("0004000"), "")
+
+    def test_not_a_number(self):
+        self.assertEqual(arabic_to_roman_extended("4000.0"), "")
+
+    def test_matches_arabic_to_roman(self):
+        for arabic_numeral in range(1, 3900):
+            self.assertEqual(arabic_to_roman_extended(arabic_numeral), arabic_to_roman(arabic_numeral))
+
+
+class TestRomanToArabicExtended(unittest.TestCase):
+    """
+    roman_to_arabic_extended(roman_numeral, mark)
+    """
+    def test_4000(self):
+        self.assertEqual(roman_to_arabic_extended("I\u0305V\u0305"), 4000)
+
+    def test_lower_case(self):
+        self.assertEqual(roman_to_arabic_extended("i\u0305v\u0305xiv"), 4014)
+
+    def test_ascii(self):
+        self.assertEqual(roman_to_arabic_extended("M_M_M_C_M_X_C_I_X_CMXCIX", ASCII_VINCULUM), 3999999)
+
+    def test_no_vinculum(self):
+        self.assertEqual(roman_to_arabic_extended("MMMDCCCLXXXVIII"), 3888)
+
+    def test_thousands_below_4(self):
+        self.assertEqual(roman_to_arabic_extended("I_II", ASCII_VINCULUM), -1)
+
+    def test_units_above_999(self):
+        self.assertEqual(roman_to_arabic_extended("V_M", ASCII_VINCULUM), -1)
+
+    def test_vinculum_after_units(self):
+        self.assertEqual(roman_to_arabic_extended("V_IX_", ASCII_VINCULUM), -1)
+
+    def test_invalid_thousands(self):
+        self.assertEqual(roman_to_arabic_extended("I_V_I_", ASCII_VINCULUM), -1)
+
+    def test_invalid_units(self):
+        self.assertEqual(roman_to_arabic_extended("V_IIII", ASCII_VINCULUM), -1)
+
+    def test_empty_string(self):
+        self.assertEqual(roman_to_arabic_extended(""), -1)
+
+    def test_only_vinculum(self):
+        self.assertEqual(roman_to_arabic_extended("__", ASCII_VINCULUM), -1)
+
+    def test_too_long(self):
+        self.assertEqual(roman_to_arabic_extended("M_" * 1000, ASCII_VINCULUM), -1)
+
+    def test_not_a_string(self):
+        for roman_numeral in (4000, None, b"X", bytearray(b"I_V_"), memoryview(b"X")):
+            self.assertEqual(roman_to_arabic_extended(roman_numeral), -1, roman_numeral)
+        self.assertEqual(roman_to_arabic_extended(b"I_V_", b"_"), -1)
+
+    def test_round_trip(self):
+        for mark in (VINCULUM, ASCII_VINCULUM):
+            for arabic_numeral in range(1, 4000000, 997):
+                self.assertEqual(roman_to_arabic_extended(arabic_to_roman_extended(arabic_numeral, mark), mark),
+                                 arabic_numeral)
+
+
+class TestImport(unittest.TestCase):
+    """
+    import RomanNumeralsConverter, in a fresh interpreter
+    """
+    def test_no_heavy_modules(self):
+        loaded = subprocess.check_output(
+            [sys.executable, "-c", "import sys, RomanNumeralsConverter; "
+                                   "print(sorted({'argparse', 're', 'numpy', 'pandas', 'multiprocessing'} & "
+                                   "set(sys.modules)))"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), universal_newlines=True)
+        self.assertEqual(loaded.strip(), "[]")
+
+    def test_lazy_tables(self):
+        loaded = subprocess.check_output(
+            [sys.executable, "-c", "import RomanNumeralsConverter as r; "
+                                   "print(r._roman_numerals_table, r._canonical_roman_numeral)"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), universal_newlines=True)
+        self.assertEqual(loaded.strip(), "None None")
@@ -0,0 +1,201 @@
+#!python3
+# coding: utf-8
+
+"""
+Tests for RomanNumeralsServer.py
+"""
+
+
+import json
+import sys
+import unittest
+
+if sys.version_info >= (3, 7):
+    import asyncio
+    from RomanNumeralsServer import handle_request, start_server, parse_address, MAX_HEADERS
+
+
+def request(method, path, body=None, engine=None):
+    """
+    handle_request() with a JSON body.
+    """
+    return handle_request(method, path, json.dumps(body).encode("utf-8") if body is not None else b"", engine)
+
+
+@unittest.skipUnless(sys.version_info >= (3, 7), "requires Python 3.7+")
+class TestHandleRequest(unittest.TestCase):
+    """
+    handle_request(method, path, body, engine)
+    """
+    def test_roman(self):
+        self.assertEqual(request("POST", "/convert", {"numeral": "xiv", "type": "roman"}), (200, {"result": 14}))
+
+    def test_arabic(self):
+        self.assertEqual(request("POST", "/convert", {"numeral": 14, "type": "arabic"}), (200, {"result": "XIV"}))
+
+    def test_auto(self):
+        self.assertEqual(request("POST", "/convert", {"numeral": "14"}), (200, {"result": "XIV"}))
+
+    def test_invalid_roman(self):
+        self.assertEqual(request("POST", "/convert", {"numeral": "IIII"}), (200, {"result": -1}))
+
+    def test_invalid_arabic(self):
+        self.assertEqual(request("POST", "/convert", {"numeral": 0, "type": "arabic"}), (200, {"result": ""}))
+
+    def test_batch(self):
+        self.assertEqual(request("POST", "/convert", {"numerals": ["XIV", "14", None, "IIII"]}),
+                         (200, {"results": [14, "XIV", -1, -1]}))
+
+    def test_engine(self):
+        self.assertEqual(request("POST", "/convert", {"numerals": ["XIV", 14]}, "table"),
+                         (200, {"results": [14, "XIV"]}))
+
+    def test_batch_too_large(self):
+        self.assertEqual(request("POST", "/convert", {"numerals": ["I"] * 10001})[0], 413)
+
+    def test_batch_not_a_list(self):
+        self.assertEqual(request("POST", "/convert", {"numerals": "XIV"})[0], 400)
+
+    def test_unknown_type(self):
+        self.assertEqual(request("POST", "/convert", {"numeral": "XIV", "type": "greek"})[0], 400)
+
+    def test_no_numeral(self):
+        self.assertEqual(request("POST", "/convert", {})[0], 400)
+
+    def test_not_an_object(self):
+        self.assertEqual(request("POST", "/convert", ["XIV"])[0], 400)
+
+    def test_invalid_json(self):
+        self.assertEqual(handle_request("POST", "/convert", b"{")[0], 400)
+
+    def test_wrong_method(self):
+        self.assertEqual(request("GET", "/convert")[0], 405)
+
+    def test_unknown_path(self):
+        self.assertEqual(request("POST", "/")[0], 404)
+
+    def test_health(self):
+        self.assertEqual(request("GET", "/health"), (200, {"status": "ok"}))
+
+
+@unittest.skipUnless(sys.version_info >= (3, 7), "requires Python 3.7+")
+class TestParseAddress(unittest.TestCase):
+    """
+    parse_address(address)
+    """
+    def test_address(self):
+        self.assertEqual(parse_address("127.0.0.1:8000"), ("127.0.0.1", 8000))
+
+    def test_no_port(self):
+        self.assertRaises(ValueError, parse_address, "127.0.0.1")
+
+    def test_no_host(self):
+        self.assertRaises(ValueError, parse_address, ":8000")
+
+
+@unittest.skipUnless(sys.version_info >= (3, 7), "requires Python 3.7+")
+class TestServer(unittest.TestCase):
+    """
+    start_server(host, port, engine), over a local connection
+    """
+    def test_concurrent_keep_alive_clients(self):
+        async def client(port, numerals):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            results = []
+            for numeral in numerals:
+                body = json.dumps({"numeral": numeral}).encode("utf-8")
+                writer.write(b"POST /convert HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+                await writer.drain()
+                self.assertEqual(await reader.readline(), b"HTTP/1.1 200 OK\r\n")
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header == b"\r\n":
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.lower()] = value.strip()
+                results.append(json.loads(await reader.readexactly(int(headers["content-length"])))["result"])
+            writer.close()
+            return results
+
+        async def run():
+            server = await start_server("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                return await asyncio.gather(*(client(port, ["XIV", str(i + 1), "IIII"]) for i in range(20)))
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        results = asyncio.run(run())
+        self.assertEqual(results, [[14, ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X", "XI", "XII",
+                                         "XIII", "XIV", "XV", "XVI", "XVII", "XVIII", "XIX", "XX"][i], -1]
+                                   for i in range(20)])
+
+    def test_connection_close(self):
+        async def run():
+            server = await start_server("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+                return await reader.read()  # Until the server closes the connection
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        response = asyncio.run(run())
+        self.assertTrue(response.startswith(b"HTTP/1.1 200 OK\r\n"))
+        self.assertTrue(response.endswith(b'{"status": "ok"}'))
+
+    def raw_request(self, request):
+        """
+        Sends a raw request to a new server, and returns everything it answers until it closes the connection.
+        """
+        async def run():
+            server = await start_server("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(request)
+                await writer.drain()
+                response = await reader.read()
+                writer.close()
+                return response
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        return asyncio.run(run())
+
+    def test_negative_content_length(self):
+        self.assertTrue(self.raw_request(b"POST /convert HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+                        .startswith(b"HTTP/1.1 400 Bad Request\r\n"))
+
+    def test_invalid_content_length(self):
+        self.assertTrue(self.raw_request(b"POST /convert HTTP/1.1\r\nContent-Length: five\r\n\r\n")
+                        .startswith(b"HTTP/1.1 400 Bad Request\r\n"))
+
+    def test_header_too_long(self):
+        self.assertTrue(self.raw_request(b"GET /health HTTP/1.1\r\nX-Junk: " + b"x" * 100000 + b"\r\n\r\n")
+                        .startswith(b"HTTP/1.1 400 Bad Request\r\n"))
+
+    def test_request_line_too_long(self):
+        self.assertTrue(self.raw_request(b"GET /" + b"x" * 100000 + b" HTTP/1.1\r\n\r\n")
+                        .startswith(b"HTTP/1.1 400 Bad Request\r\n"))
+
+    def test_too_many_headers(self):
+        headers = b"".join(b"X-Header-%d: 1\r\n" % i for i in range(MAX_HEADERS + 1))
+        self.assertTrue(self.raw_request(b"GET /health HTTP/1.1\r\n" + headers + b"\r\n")
+                        .startswith(b"HTTP/1.1 400 Bad Request\r\n"))
+
+    def test_malformed_request_line(self):
+        self.assertTrue(self.raw_request(b"GET\r\n\r\n").startswith(b"HTTP/1.1 400 Bad Request\r\n"))
+
+    def test_body_too_large(self):
+        self.assertTrue(self.raw_request(b"POST /convert HTTP/1.1\r\nContent-Length: 2000000\r\n\r\n")
+                        .startswith(b"HTTP/1.1 413 Payload Too Large\r\n"))
+
+    def test_unknown_engine(self):
+        self.assertRaises(ValueError, asyncio.run, start_server("127.0.0.1", 0, "abacus"))
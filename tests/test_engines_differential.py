@@ -0,0 +1,345 @@
+#!python3
+# coding: utf-8
+
+"""
+Differential tests of every engine and every other conversion function of RomanNumeralsConverter.py
+against the reference rules engine (roman_to_arabic_rules() and arabic_to_roman_rules()):
+
+- every Arabic numeral from -9 to 3909, as int and as str
+- every string of up to 4 characters over ROMAN_ALPHABET + NOISE, and over DIGITS + NOISE
+- random longer strings, and valid Roman numerals with a character inserted, removed or replaced
+
+Each sweep is shared out across a pool of processes, one task per first character (or seed).
+"""
+
+
+import itertools
+import multiprocessing
+import random
+import unittest
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from RomanNumeralsConverter import (ENGINES,
+                                    conversion_tables,
+                                    roman_to_arabic_rules,
+                                    arabic_to_roman_rules,
+                                    roman_to_arabic,
+                                    arabic_to_roman,
+                                    roman_to_arabic_many,
+                                    arabic_to_roman_many,
+                                    roman_to_arabic_diagnostic,
+                                    arabic_to_roman_diagnostic,
+                                    roman_to_arabic_lenient,
+                                    arabic_to_roman_extended,
+                                    roman_to_arabic_array,
+                                    arabic_to_roman_array,
+                                    roman_to_arabic_bytes,
+                                    roman_to_arabic_buffer,
+                                    RomanColumn,
+                                    roman_sort_key,
+                                    INVALID_SORT_KEY,
+                                    IncrementalRomanParser,
+                                    Roman)
+
+
+ROMAN_ALPHABET = "IVXLCDMivxlcdm"
+DIGITS = "0123456789"
+NOISE = "0 -ZıⅠ²١"  # Dotless i (upper cases to I), Unicode I, superscript 2, Arabic-Indic 1
+MAX_EXHAUSTIVE_LENGTH = 4
+RANDOM_TASKS = 8
+RANDOM_STRINGS = 5000  # Per task
+SEED = 3899
+MAX_MISMATCHES = 20  # Reported per task
+
+
+def roman_or_invalid(function):
+    """
+    Roman() of a numeral, -1 or "" when it raises ValueError, to compare with the reference.
+
+    PARAMETERS:
+        function : function
+            Roman -> int or str
+
+    RETURNS: function
+    """
+    def convert(numeral):
+        try:
+            return function(Roman(numeral))
+        except ValueError:
+            return -1 if isinstance(numeral, str) else ""
+    return convert
+
+
+def incremental(roman_numeral):
+    """
+    IncrementalRomanParser().value once fed every character of roman_numeral.
+
+    RETURNS: int
+    """
+    parser = IncrementalRomanParser()
+    for char in roman_numeral:
+        parser.feed(char)
+    return parser.value
+
+
+def lenient_canonical(roman_numeral):
+    """
+    roman_to_arabic_lenient() of roman_numeral, -1 unless it is already canonical (as the reference reads it).
+
+    RETURNS: int
+    """
+    value, canonical = roman_to_arabic_lenient(roman_numeral)
+    return value if canonical == roman_numeral.upper() else -1
+
+
+# name: (function, accepts(numeral, expected) or None), compared numeral by numeral to roman_to_arabic_rules()
+ROMAN_CANDIDATES = dict(
+    [("engine %s" % engine, (roman_to_arabic_, None)) for engine, (roman_to_arabic_, _) in ENGINES.items()] + [
+        ("roman_to_arabic", (roman_to_arabic, None)),
+        ("diagnostic", (lambda numeral: roman_to_arabic_diagnostic(numeral).value, None)),
+        ("incremental", (incremental, None)),
+        # Up to MAX_LENIENT_LENGTH characters, so it also reads MMMDCCCLXXXVIII (3888, longer than any other)
+        ("lenient", (lenient_canonical, lambda numeral, expected: len(numeral) <= 14)),
+        ("sort key", (lambda numeral: roman_sort_key(numeral) % INVALID_SORT_KEY or -1, None)),
+        # 1 to 3899, as arabic_to_roman()
+        ("Roman", (roman_or_invalid(int), lambda numeral, expected: expected <= 3899)),
+        # Bytes are read as ASCII, so other characters (even if they upper case to I) are invalid there
+        ("bytes", (lambda numeral: roman_to_arabic_bytes(numeral.encode("utf-8")),
+                   lambda numeral, expected: numeral.isascii())),
+        ("roman_to_arabic, bytearray", (lambda numeral: roman_to_arabic(bytearray(numeral.encode("utf-8"))),
+                                        lambda numeral, expected: numeral.isascii())),
+        ("sort key, bytes", (lambda numeral: roman_sort_key(numeral.encode("utf-8")) % INVALID_SORT_KEY or -1,
+                             lambda numeral, expected: numeral.isascii())),
+        ("diagnostic, bytes", (lambda numeral: roman_to_arabic_diagnostic(numeral.encode("utf-8")).value,
+                               lambda numeral, expected: numeral.isascii())),
+    ] + [("engine %s, bytes" % engine, (lambda numeral, convert=roman_to_arabic_: convert(numeral.encode("utf-8")),
+                                        lambda numeral, expected: numeral.isascii()))
+         for engine, (roman_to_arabic_, _) in ENGINES.items()])
+
+# name: (function, accepts(numeral, expected) or None), compared numeral by numeral to arabic_to_roman_rules()
+ARABIC_CANDIDATES = dict(
+    [("engine %s" % engine, (arabic_to_roman_, None)) for engine, (_, arabic_to_roman_) in ENGINES.items()] + [
+        ("arabic_to_roman", (arabic_to_roman, None)),
+        # Only ASCII digits are read, by design
+        ("diagnostic", (lambda numeral: arabic_to_roman_diagnostic(numeral).value,
+                        lambda numeral, expected: str(numeral).isascii())),
+        ("extended", (arabic_to_roman_extended, lambda numeral, expected: type(numeral) is int and expected)),
+        ("Roman", (roman_or_invalid(str), lambda numeral, expected: type(numeral) is int)),
+    ])
+
+
+def roman_batches(roman_numerals):
+    """
+    Conversions of a batch of Roman numerals by each batch function, as roman_to_arabic_rules() would return them.
+
+    PARAMETERS:
+        roman_numerals : [str, ...]
+
+    RETURNS: {str: ([str, ...], [int, ...])}
+        Numerals and their conversion
+    """
+    ascii_roman_numerals = [numeral for numeral in roman_numerals if numeral.isascii()]  # No delimiter in NOISE
+    buffer = b"".join(numeral.encode("ascii") + b"\n" for numeral in ascii_roman_numerals)
+    batches = {
+        "roman_to_arabic_many": (roman_numerals, roman_to_arabic_many(roman_numerals)),
+        "roman_to_arabic_many, bytes": (ascii_roman_numerals, roman_to_arabic_many(
+            [numeral.encode("ascii") for numeral in ascii_roman_numerals])),
+        "RomanColumn.from_roman": (roman_numerals,
+                                   [value or -1 for value in RomanColumn.from_roman(roman_numerals).values]),
+        "roman_to_arabic_buffer": (ascii_roman_numerals, [value or -1 for value in roman_to_arabic_buffer(buffer)[0]]),
+    }
+    if numpy is not None:
+        batches["roman_to_arabic_array"] = (roman_numerals, roman_to_arabic_array(roman_numerals).tolist())
+    return batches
+
+
+def arabic_batches(arabic_numerals):
+    """
+    Conversions of a batch of Arabic numerals by each batch function, as arabic_to_roman_rules() would return them.
+
+    PARAMETERS:
+        arabic_numerals : [int or str, ...]
+
+    RETURNS: {str: ([int or str, ...], [str, ...])}
+        Numerals and their conversion
+    """
+    in_range = [numeral for numeral in arabic_numerals if type(numeral) is int and 0 < numeral <= 3899]
+    batches = {
+        "arabic_to_roman_many": (arabic_numerals, arabic_to_roman_many(arabic_numerals)),
+        "RomanColumn": (in_range, list(RomanColumn(in_range))),
+    }
+    if numpy is not None:
+        integers = [numeral for numeral in arabic_numerals if type(numeral) is int]
+        batches["arabic_to_roman_array"] = (integers, arabic_to_roman_array(integers).tolist())
+    return batches
+
+
+def check(numerals, reference, candidates, batches):
+    """
+    Mismatches between the reference and each candidate, numeral by numeral, then batch by batch.
+    Exceptions raised by a candidate (or the reference) are mismatches too.
+
+    PARAMETERS:
+        numerals : [int or str, ...]
+        reference : function
+        candidates : {str: (function, function or None)}
+        batches : function
+            [int or str, ...] -> {str: ([int or str, ...], [int or str, ...])}
+
+    RETURNS: [(str, int or str, int or str, int or str), ...]
+        Candidate, numeral, expected and actual conversions (at most MAX_MISMATCHES)
+    """
+    mismatches = []
+    expected = {}
+
+    for numeral in numerals:
+        try:
+            expected[numeral] = reference(numeral)
+        except Exception as error:
+            mismatches.append(("reference", numeral, None, repr(error)))
+            continue
+
+        for name, (candidate, accepts) in candidates.items():
+            if accepts is not None and not accepts(numeral, expected[numeral]):
+                continue
+            try:
+                actual = candidate(numeral)
+            except Exception as error:
+                actual = repr(error)
+            if actual != expected[numeral]:
+                mismatches.append((name, numeral, expected[numeral], actual))
+
+        if len(mismatches) >= MAX_MISMATCHES:
+            return mismatches[:MAX_MISMATCHES]
+
+    try:
+        converted_batches = batches([numeral for numeral in numerals if numeral in expected])
+    except Exception as error:
+        return mismatches + [("batches", None, None, repr(error))]
+
+    for name, (batch, actual) in sorted(converted_batches.items()):
+        for numeral, value in zip(batch, actual):
+            if value != expected[numeral]:
+                mismatches.append((name, numeral, expected[numeral], value))
+        if len(batch) != len(actual):
+            mismatches.append((name, "length", len(batch), len(actual)))
+
+    return mismatches[:MAX_MISMATCHES]
+
+
+def exhaustive_strings(first_char, alphabet, max_length=MAX_EXHAUSTIVE_LENGTH):
+    """
+    Every string starting with first_char, of up to max_length characters of alphabet.
+
+    PARAMETERS:
+        first_char : str
+        alphabet : str
+        max_length : int
+
+    RETURNS: [str, ...]
+    """
+    return [first_char + "".join(chars) for length in range(max_length)
+            for chars in itertools.product(alphabet, repeat=length)]
+
+
+def random_strings(seed, count=RANDOM_STRINGS):
+    """
+    Random strings of 5 to 16 characters of ROMAN_ALPHABET + NOISE (half of them)
+    and valid Roman numerals with a random character inserted, removed or replaced (the other half).
+
+    PARAMETERS:
+        seed : int
+        count : int
+
+    RETURNS: [str, ...]
+    """
+    generator = random.Random(seed)
+    alphabet = ROMAN_ALPHABET + NOISE
+    roman_numerals = conversion_tables()[0]
+
+    strings = ["".join(generator.choice(alphabet) for _ in range(generator.randint(5, 16)))
+               for _ in range(count // 2)]
+
+    for _ in range(count - count // 2):
+        numeral = list(roman_numerals[generator.randint(1, 3899)])
+        position = generator.randrange(len(numeral) + 1)
+        edit = generator.randrange(3)
+        if edit == 0:
+            numeral.insert(position, generator.choice(alphabet))
+        elif position < len(numeral):
+            if edit == 1:
+                del numeral[position]
+            else:
+                numeral[position] = generator.choice(alphabet)
+        strings.append("".join(numeral))
+
+    return strings
+
+
+def check_roman_strings(first_char):
+    """
+    check() of every Roman-like string starting with first_char, up to MAX_EXHAUSTIVE_LENGTH characters.
+    """
+    return check(exhaustive_strings(first_char, ROMAN_ALPHABET + NOISE), roman_to_arabic_rules, ROMAN_CANDIDATES,
+                 roman_batches)
+
+
+def check_random_strings(seed):
+    """
+    check() of random_strings(seed).
+    """
+    return check(random_strings(seed), roman_to_arabic_rules, ROMAN_CANDIDATES, roman_batches)
+
+
+def check_arabic_strings(first_char):
+    """
+    check() of every digit-like string starting with first_char, up to MAX_EXHAUSTIVE_LENGTH characters.
+    """
+    return check(exhaustive_strings(first_char, DIGITS + NOISE), arabic_to_roman_rules, ARABIC_CANDIDATES,
+                 arabic_batches)
+
+
+def check_arabic_numerals(numerals):
+    """
+    check() of Arabic numerals (int and str).
+    """
+    return check(numerals + [str(numeral) for numeral in numerals], arabic_to_roman_rules, ARABIC_CANDIDATES,
+                 arabic_batches)
+
+
+class TestEnginesDifferential(unittest.TestCase):
+    """
+    Every engine and conversion function against roman_to_arabic_rules() and arabic_to_roman_rules()
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = multiprocessing.Pool()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.terminate()
+        cls.pool.join()
+
+    def assertNoMismatches(self, tasks):
+        mismatches = [mismatch for task in tasks for mismatch in task]
+        self.assertEqual(mismatches, [], "\n".join("%s(%r): expected %r, got %r" % mismatch
+                                                   for mismatch in mismatches[:MAX_MISMATCHES]))
+
+    def test_roman_strings(self):
+        self.assertNoMismatches(self.pool.map(check_roman_strings, ROMAN_ALPHABET + NOISE) +
+                                [check([""], roman_to_arabic_rules, ROMAN_CANDIDATES, roman_batches)])
+
+    def test_random_strings(self):
+        self.assertNoMismatches(self.pool.map(check_random_strings, range(SEED, SEED + RANDOM_TASKS)))
+
+    def test_arabic_numerals(self):
+        numerals = list(range(-9, 3910))
+        self.assertNoMismatches(self.pool.map(check_arabic_numerals,
+                                              [numerals[start::RANDOM_TASKS] for start in range(RANDOM_TASKS)]))
+
+    def test_arabic_strings(self):
+        self.assertNoMismatches(self.pool.map(check_arabic_strings, DIGITS + NOISE) +
+                                [check([""], arabic_to_roman_rules, ARABIC_CANDIDATES, arabic_batches)])
+